@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Board Agent Client
+Command line front end for the boardlink package: starts the resident agent
+(micropython_libraries/board_agent.py) and drives the board with small
+binary requests, so pin, ADC, I2C and OLED commands take about a
+millisecond each instead of a new mpremote process.
+
+Usage:
+  python agent.py <port> ping [count]            round-trip latency
+  python agent.py <port> pin <n> [0|1]           read or set a pin
+  python agent.py <port> adc <pin> [samples]     one reading or a burst
+  python agent.py <port> scan <sda> <scl>        I2C scan
+  python agent.py <port> text <sda> <scl> <msg>  show a message on the OLED
+
+Install the agent first: python library_manager.py install board_agent <port>
+"""
+
+import sys
+import time
+
+from boardlink import Board, BoardConnectionError, BoardError
+
+
+def benchmark_ping(client, count=100):
+    """(sequential ms per request, pipelined ms per request)"""
+    start = time.perf_counter()
+    for _ in range(count):
+        client.ping()
+    sequential = (time.perf_counter() - start) * 1000 / count
+
+    start = time.perf_counter()
+    for future in [client.submit("ping") for _ in range(count)]:
+        future.result()
+    pipelined = (time.perf_counter() - start) * 1000 / count
+    return sequential, pipelined
+
+
+def main():
+    if len(sys.argv) < 3:
+        print(__doc__)
+        return 1
+    port, command, args = sys.argv[1], sys.argv[2], sys.argv[3:]
+
+    try:
+        with Board(port) as board:
+            if command == "ping":
+                sequential, pipelined = benchmark_ping(board, int(args[0]) if args else 100)
+                print(f"🏓 Agent v{board.aio.version}: {sequential:.2f} ms per request, "
+                      f"{pipelined:.2f} ms pipelined")
+            elif command == "pin":
+                pin = int(args[0])
+                if len(args) > 1:
+                    board.pin_mode(pin, "out")
+                    board.pin_set(pin, int(args[1]))
+                    print(f"📍 Pin {pin} set to {int(args[1])}")
+                else:
+                    print(f"📍 Pin {pin} reads {board.pin_get(pin)}")
+            elif command == "adc":
+                pin = int(args[0])
+                if len(args) > 1:
+                    samples = board.adc_burst(pin, int(args[1]))
+                    print(f"📊 {len(samples)} samples on pin {pin}: min {min(samples)}, "
+                          f"max {max(samples)}, mean {sum(samples) // len(samples)}")
+                else:
+                    print(f"📊 Pin {pin}: {board.adc_read(pin)}")
+            elif command == "scan":
+                freq = board.i2c_config(int(args[0]), int(args[1]))
+                found = board.i2c_scan()
+                print(f"🔍 {len(found)} device(s) at {freq // 1000} kHz: {[hex(a) for a in found]}")
+            elif command == "text":
+                board.i2c_config(int(args[0]), int(args[1]))
+                board.oled_init()
+                board.oled_fill(0)
+                for row, line in enumerate(" ".join(args[2:]).split("\\n")[:8]):
+                    board.oled_text(line, 0, row * 8)
+                board.oled_show()
+                print("📺 Text shown on the OLED")
+            else:
+                print(f"❌ Unknown command: {command}")
+                return 1
+    except (BoardError, BoardConnectionError) as e:
+        print(f"❌ {e}")
+        return 1
+    except (IndexError, ValueError):
+        print(__doc__)
+        return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
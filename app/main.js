@@ -313,14 +313,84 @@ function createWindow() {
   });
 }
 
+// ---- Board Presence Monitor ----
+// board_monitor.py prints a JSON line whenever a board is attached or detached,
+// so check-board can answer from this cached state instead of scanning.
+let boardMonitor = null;
+let boardMonitorReady = false;
+const attachedBoards = new Map();
+
+function handleBoardEvent(line) {
+  let event;
+  try {
+    event = JSON.parse(line);
+  } catch (parseErr) {
+    return;
+  }
+
+  if (event.event === 'snapshot') {
+    attachedBoards.clear();
+    event.boards.forEach(board => attachedBoards.set(board.port, board));
+  } else if (event.event === 'attach') {
+    attachedBoards.set(event.port, event);
+    console.log(`🔌 Board attached: ${event.port} (${event.board})`);
+  } else if (event.event === 'detach') {
+    attachedBoards.delete(event.port);
+    console.log(`🔌 Board detached: ${event.port}`);
+  }
+
+  boardMonitorReady = true;
+  safeSend('board-status', {
+    status: attachedBoards.size > 0 ? 'connected' : 'disconnected',
+    boards: Array.from(attachedBoards.values())
+  });
+}
+
+async function startBoardMonitor() {
+  try {
+    const pythonPath = await findPythonPath();
+    const script = path.join(__dirname, '..', 'board_monitor.py');
+    boardMonitor = spawn(pythonPath, [script], { cwd: path.join(__dirname, '..') });
+
+    let pending = '';
+    boardMonitor.stdout.on('data', (chunk) => {
+      pending += chunk.toString();
+      const lines = pending.split('\n');
+      pending = lines.pop();
+      lines.forEach(handleBoardEvent);
+    });
+
+    boardMonitor.on('exit', (code) => {
+      console.log(`Board monitor exited (${code}), falling back to port scans`);
+      boardMonitor = null;
+      boardMonitorReady = false;
+    });
+
+    // e.g. the Python found earlier has gone: no 'exit' follows a failed spawn
+    boardMonitor.on('error', (err) => {
+      console.log(`Board monitor failed (${err.message}), falling back to port scans`);
+      boardMonitor = null;
+      boardMonitorReady = false;
+    });
+  } catch (err) {
+    console.log(`Board monitor unavailable: ${err.message}`);
+    boardMonitor = null;
+  }
+}
+
 app.whenReady().then(() => {
   createWindow();
+  startBoardMonitor();
 });
 
 app.on('window-all-closed', () => {
   if (process.platform !== 'darwin') app.quit();
 });
 
+app.on('will-quit', () => {
+  if (boardMonitor) boardMonitor.kill();
+});
+
 // ---- Serial Port Management ----
 ipcMain.handle('list-serial-ports', async () => {
   try {
@@ -474,7 +544,9 @@ ipcMain.handle('upload-python', async (_e, code, port) => {
         // Upload with simple error handling
         safeSend('terminal-output', '🚀 Uploading code to ESP32...');
         
-                 const uploadCommand = `"${pythonPath}" -m mpremote connect ${port} fs cp "${pyPath.replace(/\\/g, '/')}" :main.py`;
+        // Compressed, hash-verified transfer (falls back to raw bytes when compression doesn't pay off)
+        const transferScript = path.join(__dirname, '..', 'transfer.py');
+        const uploadCommand = `"${pythonPath}" "${transferScript}" ${port} "${pyPath.replace(/\\/g, '/')}" main.py`;
         console.log(`Executing: ${uploadCommand}`);
         
         const uploadResult = await captureSerialOutput(port, uploadCommand, 15000);
@@ -752,6 +824,11 @@ ipcMain.handle('load-code', async (_e, language = 'python') => {
 
 // ---- Board Status Check ----
 ipcMain.handle('check-board', async () => {
+  // Instant answer from the hotplug monitor when it is running
+  if (boardMonitor && boardMonitorReady) {
+    return attachedBoards.size > 0 ? 'connected' : 'disconnected';
+  }
+
   try {
     const ports = await SerialPort.list();
     const identifiers = [
@@ -60,6 +60,12 @@ contextBridge.exposeInMainWorld('electronAPI', {
     const listener = (event, port) => callback(port);
     ipcRenderer.on('reopen-port', listener);
     return () => ipcRenderer.removeListener('reopen-port', listener);
+  },
+  
+  onBoardStatus: (callback) => {
+    const listener = (event, status) => callback(status);
+    ipcRenderer.on('board-status', listener);
+    return () => ipcRenderer.removeListener('board-status', listener);
   }
 });
 
@@ -0,0 +1,180 @@
+#!/usr/bin/env python3
+"""
+Driver Benchmarks
+Runs tests/benchmarks/driver_benchmarks.py on a board (or in the simulator),
+stores the timings keyed by board id, firmware and driver hash in
+benchmark_history.json, and flags regressions against the previous run on
+the same board and firmware.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+from collect_results import parse_results as parse_test_records
+from raw_repl import RawREPL, RawREPLTimeout
+from run_tests import DEVICE_ROOT, TESTS_DIR, upload_changed
+
+MARKER = "@@BENCH "
+HISTORY_FILE = "benchmark_history.json"
+BENCH_FILES = ["result_log.py", "benchmarks/driver_benchmarks.py"]
+RUN_TIMEOUT = 120
+
+# A benchmark regresses when its median grows by more than this fraction
+# and by more than the previous run's own median-to-p95 spread (noise)
+REGRESSION_THRESHOLD = 0.10
+
+SESSION = """
+import sys
+if %(root)r not in sys.path:
+    sys.path.insert(0, %(root)r)
+import result_log
+record = {'event': 'start', 'suite': 'driver_benchmarks'}
+record.update(result_log.board_info())
+result_log.emit(record)
+from benchmarks import driver_benchmarks
+driver_benchmarks.run_all()
+"""
+
+
+def parse_benchmarks(text):
+    results = {}
+    for line in text.splitlines():
+        start = line.find(MARKER)
+        if start >= 0:
+            try:
+                record = json.loads(line[start + len(MARKER):])
+            except ValueError:
+                continue
+            results[record["bench"]] = record
+    return results
+
+
+def run_on_board(port, timeout=RUN_TIMEOUT):
+    with RawREPL(port) as repl:
+        upload_changed(repl, BENCH_FILES)
+        repl.send(SESSION % {"root": DEVICE_ROOT})
+        try:
+            stdout, stderr = repl.follow(timeout)
+        except RawREPLTimeout as e:
+            stdout, stderr = repl.interrupt()
+            stdout = e.partial.decode(errors="replace") + stdout
+    if stderr.strip():
+        print(stderr.strip())
+    return stdout
+
+
+def run_in_simulator(timeout=RUN_TIMEOUT):
+    with tempfile.NamedTemporaryFile("w", suffix=".py", delete=False) as f:
+        f.write(SESSION % {"root": TESTS_DIR.replace(os.sep, "/")})
+        script = f.name
+    try:
+        result = subprocess.run([sys.executable, "-m", "mpsim", "--virtual", script],
+                                capture_output=True, text=True, timeout=timeout,
+                                cwd=os.path.dirname(TESTS_DIR))
+        if result.returncode != 0:
+            print(result.stderr.strip())
+        return result.stdout
+    finally:
+        os.remove(script)
+
+
+def load_history(path=HISTORY_FILE):
+    if not os.path.exists(path):
+        return {"runs": []}
+    with open(path) as f:
+        return json.load(f)
+
+
+def save_history(history, path=HISTORY_FILE):
+    with open(path, "w") as f:
+        json.dump(history, f, indent=2)
+
+
+def previous_run(history, board, firmware):
+    for run in reversed(history["runs"]):
+        if run["board"] == board and run["firmware"] == firmware:
+            return run
+    return None
+
+
+def find_regressions(current, previous):
+    """[(bench, reason)] for benchmarks that got slower or started allocating more"""
+    regressions = []
+    for name, now in current.items():
+        before = previous.get(name)
+        if not before or "median_us" not in now or "median_us" not in before:
+            continue
+        noise = max(before["p95_us"] - before["median_us"], 0)
+        slower = now["median_us"] - before["median_us"]
+        if slower > before["median_us"] * REGRESSION_THRESHOLD and slower > noise:
+            regressions.append((name, f"median {before['median_us']} -> {now['median_us']} us"))
+        if now["alloc_per_call"] > before["alloc_per_call"]:
+            regressions.append((name, f"allocs {before['alloc_per_call']} -> {now['alloc_per_call']} B/call"))
+    return regressions
+
+
+def print_report(current, previous):
+    print(f"{'Benchmark':<22} {'Median':>9} {'p95':>9} {'Alloc':>8} {'Prev':>9}  Driver")
+    print("-" * 76)
+    for name, r in current.items():
+        if "error" in r:
+            print(f"{name:<22} {'skipped: ' + r['error']}")
+            continue
+        before = (previous or {}).get(name, {})
+        prev = f"{before['median_us']}us" if "median_us" in before else "-"
+        driver = r.get("library") or "-"
+        if before and before.get("lib_hash") != r.get("lib_hash"):
+            driver += " (changed)"
+        print(f"{name:<22} {r['median_us']:>7}us {r['p95_us']:>7}us {r['alloc_per_call']:>6}B {prev:>9}  {driver}")
+
+
+def main():
+    if len(sys.argv) < 2:
+        print("Usage: benchmark.py <port|sim> [--no-save]")
+        sys.exit(1)
+    target = sys.argv[1]
+    output = run_in_simulator() if target == "sim" else run_on_board(target)
+
+    current = parse_benchmarks(output)
+    if not current:
+        print("❌ No benchmark results in the output")
+        print(output)
+        sys.exit(1)
+    start = next((r for r in parse_test_records(output) if r.get("event") == "start"), {})
+    board = start.get("uid", target)
+    firmware = f"{start.get('release', '?')} {start.get('version', '')}".strip()
+
+    history = load_history()
+    previous = previous_run(history, board, firmware)
+    print(f"📟 Board {board}, firmware {firmware}")
+    print_report(current, previous["results"] if previous else None)
+
+    regressions = find_regressions(current, previous["results"]) if previous else []
+    if previous is None:
+        print("\n📌 First run on this board/firmware: stored as the baseline")
+    elif regressions:
+        print("\n⚠️ Regressions since", previous["when"])
+        for name, reason in regressions:
+            print(f"  🔺 {name}: {reason}")
+    else:
+        print(f"\n✅ No regressions since {previous['when']}")
+
+    if "--no-save" not in sys.argv:
+        history["runs"].append({
+            "board": board,
+            "firmware": firmware,
+            "source": target,
+            "when": time.strftime("%Y-%m-%dT%H:%M:%S"),
+            "results": current,
+        })
+        save_history(history)
+        print(f"📄 Saved to {HISTORY_FILE}")
+    sys.exit(1 if regressions else 0)
+
+
+if __name__ == "__main__":
+    main()
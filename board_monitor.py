@@ -0,0 +1,120 @@
+#!/usr/bin/env python3
+"""
+Board Presence Monitor
+Watches for boards being plugged in and unplugged and prints one JSON line per
+change, so callers get instant board status without scanning on every request.
+
+On Linux, udev events (via pyudev, if installed) wake the monitor only when a
+tty device appears or disappears. Elsewhere the serial port list is polled and
+compared against a cached snapshot; nothing is sent to the boards themselves.
+
+Boards behind a USB bridge not in status.KNOWN_USB_IDS (e.g. a CH343) are
+still reported, with "known": false, so the app does not show them as
+disconnected.
+"""
+
+import json
+import sys
+import time
+
+import serial.tools.list_ports
+
+from status import identify_port
+
+POLL_INTERVAL = 1.0  # seconds, when udev is not available
+
+
+def describe(port):
+    """Identity of a board on a port, keyed by USB VID/PID and serial number"""
+    name = identify_port(port)
+    return {
+        "port": port.device,
+        "board": name or f"USB serial device ({port.description})",
+        "known": name is not None,
+        "vid": f"{port.vid:04X}" if port.vid is not None else None,
+        "pid": f"{port.pid:04X}" if port.pid is not None else None,
+        "serial": port.serial_number,
+        "description": port.description,
+    }
+
+
+def snapshot():
+    """USB serial devices (known boards and unlisted bridges) currently attached, keyed by port"""
+    boards = {}
+    for port in serial.tools.list_ports.comports():
+        if port.vid is not None:
+            boards[port.device] = describe(port)
+    return boards
+
+
+def diff(old, new):
+    """Events turning snapshot `old` into `new`"""
+    events = []
+    for device, info in old.items():
+        # A different serial number on the same port means the board was swapped
+        if device not in new or new[device]["serial"] != info["serial"]:
+            events.append(dict(info, event="detach"))
+    for device, info in new.items():
+        if device not in old or old[device]["serial"] != info["serial"]:
+            events.append(dict(info, event="attach"))
+    return events
+
+
+def emit(event, out=sys.stdout):
+    """Write one JSON event line"""
+    out.write(json.dumps(event) + "\n")
+    out.flush()
+
+
+def _udev_changes():
+    """Iterator that yields whenever a tty device is added or removed (Linux with pyudev)"""
+    import pyudev
+
+    context = pyudev.Context()
+    monitor = pyudev.Monitor.from_netlink(context)
+    monitor.filter_by("tty")
+    # monitor.poll() blocks without a timeout, so the process sleeps until udev wakes it
+    return (device for device in iter(monitor.poll, None) if device.action in ("add", "remove"))
+
+
+def _polled_changes(interval):
+    """Yield at a fixed interval (fallback when udev is unavailable)"""
+    while True:
+        time.sleep(interval)
+        yield
+
+
+def watch(interval=POLL_INTERVAL, out=sys.stdout):
+    """Emit a snapshot, then attach/detach events until interrupted"""
+    boards = snapshot()
+    emit({"event": "snapshot", "boards": list(boards.values())}, out)
+
+    changes = None
+    if sys.platform.startswith("linux"):
+        try:
+            changes = _udev_changes()
+        except ImportError:
+            pass
+    if changes is None:
+        changes = _polled_changes(interval)
+
+    for _ in changes:
+        current = snapshot()
+        for event in diff(boards, current):
+            emit(event, out)
+        boards = current
+
+
+def main():
+    """Main function"""
+    if "--once" in sys.argv:
+        emit({"event": "snapshot", "boards": list(snapshot().values())})
+        return
+    try:
+        watch()
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
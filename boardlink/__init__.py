@@ -0,0 +1,18 @@
+# Python client for the resident board agent
+# Drives a board running micropython_libraries/board_agent.py over its USB
+# serial port with binary requests instead of mpremote shell commands.
+# Install the agent once with: python library_manager.py install board_agent
+#
+#     from boardlink import AsyncBoard, Board
+#
+#     async with AsyncBoard("COM6") as board:          # asyncio
+#         samples, _ = await asyncio.gather(board.adc_burst(35, n=4096),
+#                                           board.oled_blit(frame))
+#
+#     with Board("COM6") as board:                     # plain scripts
+#         board.i2c_config(21, 22)
+#         print(board.i2c_scan())
+
+from . import protocol
+from .aio import AsyncBoard, BoardConnectionError, BoardError, BoardTimeout
+from .sync import Board
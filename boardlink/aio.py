@@ -0,0 +1,333 @@
+# asyncio client for the board agent
+# Starts board_agent through the raw REPL, then keeps many requests in
+# flight: every request gets a sequence number and a future, and a reader
+# thread resolves the futures as replies arrive. Requests time out on their
+# own, and after a timeout or a lost port the next request reconnects.
+#
+#     async with AsyncBoard("COM6") as board:
+#         samples = await board.adc_burst(35, n=4096)
+#         await board.oled_blit(frame)
+
+import array
+import asyncio
+import struct
+import sys
+import threading
+import time
+
+from . import protocol as p
+from .raw_repl import RawREPL, RawREPLError
+
+
+class BoardError(Exception):
+    """The agent answered a request with an error status"""
+
+    def __init__(self, status, message):
+        super().__init__(f"{p.STATUS_NAMES.get(status, status)}: {message}")
+        self.status = status
+
+
+class BoardConnectionError(Exception):
+    """The agent could not be started, or the link to it was lost"""
+
+
+class BoardTimeout(BoardConnectionError):
+    """No reply within the request's timeout"""
+
+
+class AsyncBoard:
+    """A board running board_agent, driven from an asyncio event loop
+
+    max_in_flight caps the requests sent but not yet answered, and
+    max_bytes_in_flight caps their frame bytes, so queued frames fit in the
+    board's serial receive buffer (256 bytes on the ESP32 UART) while it is
+    busy. A bigger frame, such as an OLED blit, goes out only when nothing
+    else is outstanding.
+    """
+
+    def __init__(self, port, timeout=5, max_in_flight=8, max_bytes_in_flight=256, reconnect=True,
+                 retries=3, baudrate=115200, serial_factory=None):
+        self.port = port
+        self.timeout = timeout
+        self.reconnect = reconnect
+        self.retries = retries
+        self.baudrate = baudrate
+        self.serial_factory = serial_factory
+        self.version = None
+        self.max_in_flight = max_in_flight
+        self.max_bytes_in_flight = max_bytes_in_flight
+        self._admit = None  # first come, first sent: small frames don't overtake a blit
+        self._space = None
+        self._in_flight = 0
+        self._bytes_in_flight = 0
+        self._repl = None
+        self._reader = None
+        self._stop = threading.Event()
+        self._pending = {}  # seq -> future
+        self._seq = 0
+        self._loop = None
+        self._broken = False
+        self._lock = None
+
+    async def __aenter__(self):
+        await self.connect()
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    @property
+    def connected(self):
+        return self._repl is not None and not self._broken
+
+    # ---- connection ----
+
+    def _start_agent(self):
+        """Blocking: open the port, enter the raw REPL and start the agent"""
+        repl = RawREPL(self.port, self.baudrate, timeout=self.timeout, serial_factory=self.serial_factory)
+        try:
+            if self._broken:
+                # An agent may still be running: finish any half-sent frame
+                # (zeros are skipped between frames) and ask it to exit
+                repl.serial.write(bytes(p.HEADER.size + p.MAX_PAYLOAD))
+                repl.serial.write(p.encode_request(p.EXIT, 0))
+                time.sleep(0.2)
+            repl.enter()
+            repl.send(p.START_CODE)
+            line = b""
+            while not line.startswith(p.READY):
+                line = repl.read_until(b"\n").strip()
+                if line.startswith(b"\x04"):
+                    # The program ended before the agent started: the error is on stderr
+                    err = repl.read_until(b"\x04")[:-1].decode(errors="replace").strip()
+                    message = err.splitlines()[-1] if err else "agent exited"
+                    if "board_agent" in err:
+                        message += " (install it with: python library_manager.py install board_agent)"
+                    raise BoardConnectionError(message)
+        except (RawREPLError, OSError) as e:
+            repl.serial.close()
+            raise BoardConnectionError(f"could not start the agent on {self.port}: {e}") from e
+        except BaseException:
+            repl.serial.close()
+            raise
+        self.version = int(line.split()[-1])
+        return repl
+
+    async def connect(self):
+        """Start the agent (again, after a failure); retries with a growing delay"""
+        self._loop = asyncio.get_running_loop()
+        if self._lock is None:
+            self._lock = asyncio.Lock()
+            self._admit = asyncio.Lock()
+            self._space = asyncio.Condition()
+        async with self._lock:
+            if self.connected:
+                return self
+            if self._repl is not None:
+                self._lost(BoardConnectionError("reconnecting to the agent"))
+                self._shutdown_reader()
+            for attempt in range(self.retries):
+                try:
+                    self._repl = await self._loop.run_in_executor(None, self._start_agent)
+                    break
+                except BoardConnectionError:
+                    if attempt == self.retries - 1:
+                        raise
+                    await asyncio.sleep(0.5 * (attempt + 1))
+            self._broken = False
+            self._stop.clear()
+            self._reader = threading.Thread(target=self._read_loop, args=(self._repl.serial,), daemon=True)
+            self._reader.start()
+        return self
+
+    async def close(self):
+        """Stop the agent and return the board to the friendly REPL"""
+        if self._repl is None:
+            return
+        try:
+            if self.connected:
+                await self.request(p.EXIT, timeout=self.timeout)
+        except BoardConnectionError:
+            pass
+        finally:
+            self._shutdown_reader()
+            repl, self._repl = self._repl, None
+            if repl is not None:  # still open: the link was fine
+                await self._loop.run_in_executor(None, self._finish, repl)
+
+    def _finish(self, repl):
+        time.sleep(0.05)  # let the agent's program end before leaving the raw REPL
+        try:
+            repl.close()
+        except OSError:
+            pass
+
+    def _shutdown_reader(self):
+        self._stop.set()
+        if self._reader is not None:
+            self._reader.join()
+            self._reader = None
+        if self._repl is not None and self._broken:
+            try:
+                self._repl.serial.close()
+            except OSError:
+                pass
+            self._repl = None
+
+    # ---- replies ----
+
+    def _read_loop(self, serial):
+        parser = p.ReplyParser()
+        while not self._stop.is_set():
+            try:
+                data = serial.read(1)  # waits up to the port timeout, then take the rest
+                if data and serial.in_waiting:
+                    data += serial.read(serial.in_waiting)
+            except Exception as e:
+                self._loop.call_soon_threadsafe(self._lost, BoardConnectionError(f"{self.port}: {e}"))
+                return
+            if data:
+                for reply in parser.feed(data):
+                    self._loop.call_soon_threadsafe(self._deliver, *reply)
+
+    def _deliver(self, seq, status, data):
+        future = self._pending.pop(seq, None)
+        if future is None or future.done():
+            return  # its request already timed out
+        if status:
+            future.set_exception(BoardError(status, data.decode(errors="replace")))
+        else:
+            future.set_result(data)
+
+    def _lost(self, error):
+        self._broken = True
+        pending, self._pending = self._pending, {}
+        for future in pending.values():
+            if not future.done():
+                future.set_exception(error)
+
+    # ---- requests ----
+
+    def _next_seq(self):
+        while self._seq in self._pending:
+            self._seq = (self._seq + 1) & 0xFFFF
+        seq = self._seq
+        self._seq = (seq + 1) & 0xFFFF
+        return seq
+
+    def _fits(self, size):
+        if not self._in_flight:
+            return True
+        return (self._in_flight < self.max_in_flight
+                and self._bytes_in_flight + size <= self.max_bytes_in_flight)
+
+    async def request(self, opcode, payload=b"", timeout=None):
+        """Send one request and await its reply payload"""
+        if not self.connected:
+            if self._repl is not None and not self.reconnect:
+                raise BoardConnectionError("link to the agent was lost")
+            await self.connect()
+        frame_timeout = self.timeout if timeout is None else timeout
+        size = p.HEADER.size + len(payload)
+        async with self._admit:
+            async with self._space:
+                await self._space.wait_for(lambda: self._fits(size))
+                self._in_flight += 1
+                self._bytes_in_flight += size
+        try:
+            seq = self._next_seq()
+            future = self._loop.create_future()
+            self._pending[seq] = future
+            try:
+                self._repl.serial.write(p.encode_request(opcode, seq, payload))
+            except Exception as e:
+                self._pending.pop(seq, None)
+                self._lost(BoardConnectionError(f"{self.port}: {e}"))
+                raise BoardConnectionError(f"{self.port}: {e}") from e
+            try:
+                return await asyncio.wait_for(future, frame_timeout)
+            except asyncio.TimeoutError:
+                self._pending.pop(seq, None)
+                self._broken = True  # the stream may be out of step; reconnect next time
+                raise BoardTimeout(f"no reply to opcode 0x{opcode:02X} within {frame_timeout} s") from None
+        finally:
+            async with self._space:
+                self._in_flight -= 1
+                self._bytes_in_flight -= size
+                self._space.notify_all()
+
+    # ---- typed calls ----
+
+    async def ping(self, data=b""):
+        return (await self.request(p.PING, data))[1:]
+
+    async def pin_mode(self, pin, mode):
+        """mode: "in", "out", "pull_up", "pull_down" or "open_drain" """
+        await self.request(p.PIN_MODE, bytes([pin, p.PIN_MODES.get(mode, mode)]))
+
+    async def pin_set(self, pin, value):
+        await self.request(p.PIN_SET, bytes([pin, 1 if value else 0]))
+
+    async def pin_get(self, pin):
+        return (await self.request(p.PIN_GET, bytes([pin])))[0]
+
+    async def adc_read(self, pin):
+        return int.from_bytes(await self.request(p.ADC_READ, bytes([pin])), "little")
+
+    async def adc_burst(self, pin, n=1024, interval_us=0, timeout=None):
+        """array('H') of n read_u16 samples taken back to back (or interval_us apart)"""
+        data = await self.request(p.ADC_BURST, struct.pack("<BHI", pin, n, interval_us), timeout)
+        samples = array.array("H")
+        samples.frombytes(data)
+        if sys.byteorder == "big":
+            samples.byteswap()
+        return samples
+
+    async def i2c_config(self, sda, scl, freq=0):
+        """Open the agent's bus; freq 0 lets bus_factory pick the fastest stable clock"""
+        data = await self.request(p.I2C_CONFIG, struct.pack("<BBI", sda, scl, freq))
+        return int.from_bytes(data, "little")
+
+    async def i2c_scan(self):
+        return list(await self.request(p.I2C_SCAN))
+
+    async def i2c_write(self, addr, data):
+        await self.request(p.I2C_WRITE, bytes([addr]) + bytes(data))
+
+    async def i2c_read(self, addr, n):
+        return await self.request(p.I2C_READ, struct.pack("<BH", addr, n))
+
+    async def i2c_write_read(self, addr, data, n):
+        """Write (e.g. a register number), then read n bytes after a repeated start"""
+        return await self.request(p.I2C_WRITE_READ, struct.pack("<BH", addr, n) + bytes(data))
+
+    async def oled_init(self, width=128, height=64, addr=0x3C):
+        await self.request(p.OLED_INIT, bytes([width, height, addr]))
+
+    async def oled_fill(self, color=0):
+        await self.request(p.OLED_FILL, bytes([color]))
+
+    async def oled_pixel(self, x, y, color=1):
+        await self.request(p.OLED_PIXEL, struct.pack("<hhB", x, y, color))
+
+    async def oled_line(self, x1, y1, x2, y2, color=1):
+        await self.request(p.OLED_LINE, struct.pack("<hhhhB", x1, y1, x2, y2, color))
+
+    async def oled_rect(self, x, y, w, h, color=1, filled=False):
+        await self.request(p.OLED_RECT, struct.pack("<hhhhBB", x, y, w, h, color, 1 if filled else 0))
+
+    async def oled_text(self, text, x=0, y=0, color=1):
+        await self.request(p.OLED_TEXT, struct.pack("<hhB", x, y, color) + text.encode())
+
+    async def oled_blit(self, frame):
+        """Replace the whole frame buffer (SSD1306 page layout) and show it"""
+        await self.request(p.OLED_BLIT, frame)
+
+    async def oled_show(self):
+        await self.request(p.OLED_SHOW)
+
+    async def pwm_set(self, pin, freq, duty_u16):
+        await self.request(p.PWM_SET, struct.pack("<BIH", pin, freq, duty_u16))
+
+    async def pwm_stop(self, pin):
+        await self.request(p.PWM_STOP, bytes([pin]))
@@ -0,0 +1,81 @@
+# Board agent wire protocol
+# Frame layout and opcodes shared with micropython_libraries/board_agent.py,
+# which must be kept in step with this file. Frames in both directions are
+#     sync u8 | opcode or status u8 | seq u16 | length u32 | payload
+# little-endian; requests start with 0xA5 and replies with 0x5A.
+
+import struct
+
+VERSION = 1
+REQUEST_SYNC = 0xA5
+REPLY_SYNC = 0x5A
+HEADER = struct.Struct("<BBHI")
+MAX_PAYLOAD = 2048
+MAX_REPLY = 2 * 0xFFFF  # the longest reply: an ADC_BURST of 65535 samples
+READY = b"@@AGENT ready"
+START_CODE = "import board_agent\nboard_agent.run()"
+
+# Opcodes
+PING = 0x00
+PIN_MODE = 0x01
+PIN_SET = 0x02
+PIN_GET = 0x03
+ADC_READ = 0x10
+ADC_BURST = 0x11
+I2C_CONFIG = 0x20
+I2C_SCAN = 0x21
+I2C_WRITE = 0x22
+I2C_READ = 0x23
+I2C_WRITE_READ = 0x24
+OLED_INIT = 0x30
+OLED_FILL = 0x31
+OLED_PIXEL = 0x32
+OLED_LINE = 0x33
+OLED_RECT = 0x34
+OLED_TEXT = 0x35
+OLED_BLIT = 0x36
+OLED_SHOW = 0x37
+PWM_SET = 0x40
+PWM_STOP = 0x41
+EXIT = 0x7F
+
+# Reply status codes
+OK = 0
+STATUS_NAMES = {1: "unknown opcode", 2: "bad arguments", 3: "I/O error", 4: "not configured", 5: "payload too big"}
+
+PIN_MODES = {"in": 0, "out": 1, "pull_up": 2, "pull_down": 3, "open_drain": 4}
+
+
+def encode_request(opcode, seq, payload=b""):
+    """One request frame"""
+    if len(payload) > MAX_PAYLOAD:
+        raise ValueError(f"payload of {len(payload)} bytes is over {MAX_PAYLOAD}")
+    return HEADER.pack(REQUEST_SYNC, opcode, seq, len(payload)) + bytes(payload)
+
+
+class ReplyParser:
+    """Turns a byte stream into (seq, status, payload) replies"""
+
+    def __init__(self):
+        self.buffer = bytearray()
+
+    def feed(self, data):
+        """Add received bytes; returns the replies they complete"""
+        self.buffer += data
+        replies = []
+        while True:
+            start = self.buffer.find(REPLY_SYNC)
+            if start < 0:
+                self.buffer.clear()
+                return replies
+            del self.buffer[:start]  # anything before a sync byte is noise
+            if len(self.buffer) < HEADER.size:
+                return replies
+            _sync, status, seq, length = HEADER.unpack_from(self.buffer)
+            if length > MAX_REPLY:
+                del self.buffer[:1]  # a 0x5A inside noise, not a reply: look for the next one
+                continue
+            if len(self.buffer) < HEADER.size + length:
+                return replies
+            replies.append((seq, status, bytes(self.buffer[HEADER.size:HEADER.size + length])))
+            del self.buffer[:HEADER.size + length]
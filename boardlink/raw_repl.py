@@ -0,0 +1,147 @@
+# MicroPython raw REPL session
+# Keeps one serial connection open to the board and runs many code snippets
+# through the raw REPL (using raw-paste mode when the firmware supports it),
+# instead of starting a new mpremote process for every step. Part of
+# boardlink so the package imports on its own; the host scripts in the repo
+# root reach it through raw_repl.py there.
+
+import struct
+import time
+
+
+class RawREPLError(Exception):
+    """The board did not respond the way the raw REPL protocol expects"""
+
+
+class RawREPLTimeout(RawREPLError):
+    """The board did not finish within the allowed time"""
+
+
+class RawREPL:
+    """A raw REPL session on one serial port"""
+
+    def __init__(self, port, baudrate=115200, timeout=10, serial_factory=None):
+        if serial_factory is None:
+            import serial
+            serial_factory = serial.Serial
+        self.port = port
+        self.timeout = timeout
+        self.serial = serial_factory(port, baudrate, timeout=0.05)
+        self.use_raw_paste = True
+        self.in_raw_repl = False
+
+    def __enter__(self):
+        self.enter()
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def read_until(self, ending, timeout=None):
+        """Read until the data ends with `ending`, raising RawREPLTimeout on expiry"""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        data = b""
+        while not data.endswith(ending):
+            chunk = self.serial.read(1)
+            if chunk:
+                data += chunk
+            elif time.monotonic() > deadline:
+                error = RawREPLTimeout(f"timed out waiting for {ending!r}, got {data[-80:]!r}")
+                error.partial = data
+                raise error
+        return data
+
+    def read_exactly(self, n, timeout=None):
+        """Read exactly n bytes, raising RawREPLTimeout on expiry"""
+        deadline = time.monotonic() + (self.timeout if timeout is None else timeout)
+        data = b""
+        while len(data) < n:
+            chunk = self.serial.read(n - len(data))
+            if chunk:
+                data += chunk
+            elif time.monotonic() > deadline:
+                raise RawREPLTimeout(f"timed out waiting for {n} bytes, got {data!r}")
+        return data
+
+    def enter(self):
+        """Interrupt any running program and switch the board to the raw REPL"""
+        self.serial.write(b"\r\x03\x03")
+        time.sleep(0.1)
+        self.serial.reset_input_buffer()
+        self.serial.write(b"\r\x01")
+        self.read_until(b"raw REPL; CTRL-B to exit\r\n")
+        self.in_raw_repl = True
+
+    def exit(self):
+        """Return the board to the friendly REPL"""
+        if self.in_raw_repl:
+            self.serial.write(b"\r\x02")
+            self.in_raw_repl = False
+
+    def close(self):
+        try:
+            self.exit()
+        finally:
+            self.serial.close()
+
+    def _raw_paste_write(self, data):
+        """Send code with raw-paste flow control (the board grants window-sized credits)"""
+        window_size = struct.unpack("<H", self.read_exactly(2))[0]
+        window_remain = window_size
+        i = 0
+        while i < len(data):
+            while window_remain == 0 or self.serial.in_waiting:
+                flag = self.read_exactly(1)
+                if flag == b"\x01":
+                    window_remain += window_size
+                elif flag == b"\x04":
+                    # Board aborted the paste (e.g. out of memory)
+                    self.serial.write(b"\x04")
+                    return
+                else:
+                    raise RawREPLError(f"unexpected data during raw paste: {flag!r}")
+            chunk = data[i:i + window_remain]
+            self.serial.write(chunk)
+            window_remain -= len(chunk)
+            i += len(chunk)
+        self.serial.write(b"\x04")
+        self.read_until(b"\x04")
+
+    def send(self, code):
+        """Send code to run, without waiting for it to finish"""
+        data = code.encode() if isinstance(code, str) else code
+        self.read_until(b">")
+
+        if self.use_raw_paste:
+            self.serial.write(b"\x05A\x01")
+            reply = self.read_exactly(2)
+            if reply == b"R\x01":
+                self._raw_paste_write(data)
+                return
+            if reply != b"R\x00":
+                # Old firmware echoes the request; resync with the raw REPL prompt
+                self.read_until(b"w REPL; CTRL-B to exit\r\n>")
+            self.use_raw_paste = False
+
+        for i in range(0, len(data), 256):
+            self.serial.write(data[i:i + 256])
+            time.sleep(0.01)
+        self.serial.write(b"\x04")
+        if self.read_exactly(2) != b"OK":
+            raise RawREPLError("board did not accept the code")
+
+    def follow(self, timeout=None):
+        """Wait for the running code to finish and return (stdout, stderr)"""
+        out = self.read_until(b"\x04", timeout)[:-1]
+        err = self.read_until(b"\x04", timeout)[:-1]
+        return out.decode(errors="replace"), err.decode(errors="replace")
+
+    def interrupt(self, timeout=2):
+        """Stop running code with Ctrl-C and collect whatever it printed"""
+        self.serial.write(b"\x03")
+        return self.follow(timeout)
+
+    def exec(self, code, timeout=None):
+        """Run code and return (stdout, stderr)"""
+        self.send(code)
+        return self.follow(timeout)
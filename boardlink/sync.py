@@ -0,0 +1,69 @@
+# Blocking facade over AsyncBoard
+# Runs the asyncio client on its own event loop thread, so plain scripts and
+# notebooks (which may already have a running loop) can call it directly:
+#
+#     with Board("COM6") as board:
+#         board.pin_set(2, 1)
+#         samples = board.adc_burst(35, n=4096)
+#         pending = [board.submit("adc_read", pin) for pin in (32, 33, 34, 35)]
+#         readings = [f.result() for f in pending]     # four requests in flight
+
+import asyncio
+import threading
+
+from .aio import AsyncBoard
+
+
+class Board:
+    """AsyncBoard's calls, blocking until the reply arrives"""
+
+    def __init__(self, port, **options):
+        self._loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self._loop.run_forever, daemon=True)
+        self._thread.start()
+        self.aio = AsyncBoard(port, **options)
+
+    def __enter__(self):
+        return self.connect()
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def _run(self, coro):
+        return asyncio.run_coroutine_threadsafe(coro, self._loop).result()
+
+    def connect(self):
+        try:
+            self._run(self.aio.connect())
+        except BaseException:
+            self._stop_loop()
+            raise
+        return self
+
+    def close(self):
+        """Stop the agent and the event loop thread"""
+        try:
+            self._run(self.aio.close())
+        finally:
+            self._stop_loop()
+
+    def _stop_loop(self):
+        if self._loop.is_running():
+            self._loop.call_soon_threadsafe(self._loop.stop)
+            self._thread.join()
+        self._loop.close()
+
+    def submit(self, name, *args, **kwargs):
+        """Start a call without waiting; returns a concurrent.futures.Future"""
+        return asyncio.run_coroutine_threadsafe(getattr(self.aio, name)(*args, **kwargs), self._loop)
+
+    def __getattr__(self, name):
+        attr = getattr(self.aio, name)
+        if not asyncio.iscoroutinefunction(attr):
+            return attr
+
+        def call(*args, **kwargs):
+            return self._run(attr(*args, **kwargs))
+        call.__name__ = name
+        call.__doc__ = attr.__doc__
+        return call
@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Test Result Collector
+Runs a test suite (tests/main_test_runner.py, tests/comprehensive_test_suite.py)
+on a board or in the simulator, picks the JSON result lines written by
+tests/result_log.py out of the output and saves them as a .jsonl file, so runs
+can be compared across boards and firmware builds.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import time
+
+from raw_repl import RawREPL, RawREPLTimeout
+
+MARKER = "@@TEST "
+RUN_TIMEOUT = 300
+
+
+def parse_results(text):
+    """Extract result records from captured serial output"""
+    records = []
+    for line in text.splitlines():
+        start = line.find(MARKER)
+        if start < 0:
+            continue
+        try:
+            records.append(json.loads(line[start + len(MARKER):]))
+        except ValueError:
+            print(f"⚠️ Skipping garbled result line: {line.strip()[:80]}")
+    return records
+
+
+def run_on_board(port, script, timeout=RUN_TIMEOUT):
+    """Sync the test modules, run the suite in the raw REPL and return its output"""
+    from run_tests import DEVICE_ROOT, bundle_files, discover, upload_changed
+    with open(script) as f:
+        code = f.read()
+    with RawREPL(port) as repl:
+        upload_changed(repl, bundle_files(discover()))
+        repl.send(f"import sys\nsys.path.insert(0, {DEVICE_ROOT!r})\n" + code)
+        try:
+            stdout, stderr = repl.follow(timeout)
+        except RawREPLTimeout as e:
+            stdout, stderr = repl.interrupt()
+            stdout = e.partial.decode(errors="replace") + stdout
+            stderr += f"\nTimed out after {timeout}s"
+    if stderr.strip():
+        print(stderr.strip())
+    return stdout
+
+
+def run_in_simulator(script, timeout=RUN_TIMEOUT):
+    """Run the suite under mpsim with the virtual clock and return its output"""
+    result = subprocess.run(
+        [sys.executable, "-m", "mpsim", "--virtual", script],
+        capture_output=True, text=True, timeout=timeout,
+        cwd=os.path.dirname(os.path.abspath(__file__)),
+    )
+    if result.returncode != 0:
+        print(result.stderr.strip())
+    return result.stdout
+
+
+def write_results(records, path, source):
+    """Save records as JSON lines, tagging the start record with where they came from"""
+    with open(path, "w") as f:
+        for record in records:
+            if record.get("event") == "start":
+                record = dict(record, source=source, collected=time.strftime("%Y-%m-%dT%H:%M:%S"))
+            f.write(json.dumps(record) + "\n")
+
+
+def load_results(path):
+    with open(path) as f:
+        return [json.loads(line) for line in f if line.strip()]
+
+
+def tests_by_name(records):
+    return {r["test"]: r for r in records if r.get("event") == "test"}
+
+
+def print_summary(records):
+    tests = [r for r in records if r.get("event") == "test"]
+    if not tests:
+        print("❌ No test results found in the output")
+        return
+    for r in tests:
+        icon = "✅" if r["status"] == "pass" else "❌"
+        used = r["mem_before"] - r["mem_after"]
+        line = f"{icon} {r['test']:<28} {r['status']:<6} {r['us'] / 1000:10.1f} ms  heap {used:+7d} B"
+        if r.get("error"):
+            line += f"  {r['error']}"
+        print(line)
+    passed = sum(1 for r in tests if r["status"] == "pass")
+    print(f"📊 {passed}/{len(tests)} passed")
+
+
+def _describe(records):
+    start = next((r for r in records if r.get("event") == "start"), {})
+    return f"{start.get('machine', '?')} {start.get('release', '?')} ({start.get('source', '?')})"
+
+
+def compare(path_a, path_b):
+    """Print per-test status and duration differences between two runs"""
+    a_records, b_records = load_results(path_a), load_results(path_b)
+    a, b = tests_by_name(a_records), tests_by_name(b_records)
+    print(f"A: {_describe(a_records)}")
+    print(f"B: {_describe(b_records)}")
+    print(f"{'Test':<28} {'A':>10} {'B':>10} {'Change':>8}  Status")
+    print("-" * 72)
+    for name in list(a) + [k for k in b if k not in a]:
+        ra, rb = a.get(name), b.get(name)
+        if ra is None or rb is None:
+            print(f"{name:<28} {'only in ' + ('A' if rb is None else 'B'):>30}")
+            continue
+        ms_a, ms_b = ra["us"] / 1000, rb["us"] / 1000
+        change = f"{(ms_b - ms_a) / ms_a * 100:+.0f}%" if ms_a else "-"
+        status = ra["status"] if ra["status"] == rb["status"] else f"{ra['status']} -> {rb['status']}"
+        flag = "" if ra["status"] == rb["status"] else " ⚠️"
+        print(f"{name:<28} {ms_a:8.1f}ms {ms_b:8.1f}ms {change:>8}  {status}{flag}")
+
+
+def main():
+    if len(sys.argv) < 3:
+        print("Usage:")
+        print("  collect_results.py run <port|sim> <suite.py> [output.jsonl]")
+        print("  collect_results.py parse <serial_log.txt|-> [output.jsonl]")
+        print("  collect_results.py compare <a.jsonl> <b.jsonl>")
+        sys.exit(1)
+
+    command = sys.argv[1]
+    if command == "run" and len(sys.argv) >= 4:
+        target, script = sys.argv[2], sys.argv[3]
+        if target == "sim":
+            output = run_in_simulator(script)
+        else:
+            output = run_on_board(target, script)
+        records = parse_results(output)
+        safe_target = target.replace("/", "_").replace("\\", "_").strip("_")
+        suite = os.path.splitext(os.path.basename(script))[0]
+        out = sys.argv[4] if len(sys.argv) > 4 else f"test_results_{suite}_{safe_target}.jsonl"
+        print_summary(records)
+        if records:
+            write_results(records, out, target)
+            print(f"📄 Results written to {out}")
+        sys.exit(0 if records and all(r["status"] == "pass" for r in records if r.get("event") == "test") else 1)
+    elif command == "parse":
+        source = sys.argv[2]
+        text = sys.stdin.read() if source == "-" else open(source, errors="replace").read()
+        records = parse_results(text)
+        print_summary(records)
+        if len(sys.argv) > 3 and records:
+            write_results(records, sys.argv[3], source)
+            print(f"📄 Results written to {sys.argv[3]}")
+    elif command == "compare" and len(sys.argv) >= 4:
+        compare(sys.argv[2], sys.argv[3])
+    else:
+        print(f"❌ Unknown command: {' '.join(sys.argv[1:])}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,184 @@
+#!/usr/bin/env python3
+"""
+Fleet Provisioning for Multiple ESP32 Boards
+Finds every attached MicroPython board and runs install, sync or test on all
+of them at once (one worker per port), with live per-board progress and a
+consolidated result table at the end.
+"""
+
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+import library_manager
+from status import find_micropython_boards
+
+
+class BoardOutput:
+    """Stand-in for sys.stdout that tags each worker's output with its port"""
+
+    def __init__(self, stream):
+        self.stream = stream
+        self.lock = threading.Lock()
+        self.local = threading.local()
+        self.last_line = {}
+
+    def attach(self, port):
+        """Route the calling thread's output to the given port"""
+        self.local.port = port
+        self.local.pending = ""
+
+    def write(self, text):
+        port = getattr(self.local, "port", None)
+        if port is None:
+            with self.lock:
+                self.stream.write(text)
+            return len(text)
+
+        # Only emit complete lines so boards don't interleave mid-line
+        self.local.pending += text
+        *lines, self.local.pending = self.local.pending.split("\n")
+        with self.lock:
+            for line in lines:
+                if line.strip():
+                    self.last_line[port] = line.strip()
+                    self.stream.write(f"[{port:>12}] {line.rstrip()}\n")
+            self.stream.flush()
+        return len(text)
+
+    def flush(self):
+        with self.lock:
+            self.stream.flush()
+
+
+def run_action(action, names, port, manifest=None):
+    """Run one fleet action against one board, returning True on success"""
+    if action == "install":
+        return library_manager.install(names, port, manifest=manifest)
+    if action == "sync":
+        return library_manager.install_all_libraries(port, manifest=manifest)
+    if action == "test":
+        safe_port = "".join(c if c.isalnum() else "_" for c in port)
+        report = library_manager.run_all_tests(port, names or None,
+                                               report_path=f"library_test_report_{safe_port}.json")
+        return bool(report) and report["passed"] == report["total"]
+    raise ValueError(f"Unknown action: {action}")
+
+
+def run_fleet(action, names, boards):
+    """Run an action on all boards concurrently and return per-board results"""
+    output = BoardOutput(sys.stdout)
+    results = {}
+    # Built (and manifest.json written) once here: the workers only read it
+    manifest = library_manager.build_manifest() if action in ("install", "sync") else None
+
+    def worker(board):
+        port, description = board
+        output.attach(port)
+        start = time.time()
+        try:
+            ok = run_action(action, names, port, manifest)
+            error = None
+        except Exception as e:
+            ok, error = False, str(e)
+            print(f"❌ {e}")
+        results[port] = {
+            "board": description,
+            "ok": bool(ok),
+            "seconds": time.time() - start,
+            "detail": error or output.last_line.get(port, ""),
+        }
+
+    real_stdout = sys.stdout
+    sys.stdout = output
+    try:
+        with ThreadPoolExecutor(max_workers=len(boards)) as pool:
+            list(pool.map(worker, boards))
+    finally:
+        sys.stdout = real_stdout
+
+    return results
+
+
+def print_results(action, results):
+    """Print the consolidated result table"""
+    print("\n" + "=" * 78)
+    print(f"📊 FLEET {action.upper()} RESULTS")
+    print("=" * 78)
+    print(f"{'Port':<14} {'Board':<28} {'Result':<8} {'Time':>7}  Last message")
+    print("-" * 78)
+    for port in sorted(results):
+        r = results[port]
+        status = "✅ OK" if r["ok"] else "❌ FAIL"
+        print(f"{port:<14} {r['board'][:28]:<28} {status:<8} {r['seconds']:>6.1f}s  {r['detail'][:40]}")
+    passed = sum(1 for r in results.values() if r["ok"])
+    print("-" * 78)
+    print(f"{passed}/{len(results)} boards succeeded")
+
+
+def usage():
+    """Print the commands and options"""
+    print("Fleet Provisioning")
+    print("=" * 40)
+    print("Usage:")
+    print("  python fleet.py list                      - List attached MicroPython boards")
+    print("  python fleet.py install <library>...      - Install libraries on every board")
+    print("  python fleet.py sync                      - Bring every board up to date with all libraries")
+    print("  python fleet.py test [library...]         - Run library tests on every board (JSON report per board)")
+    print("Options:")
+    print("  --ports COM3,COM4   Use these ports instead of discovering boards")
+    print("  --no-verify         Trust USB IDs without checking for a MicroPython REPL")
+
+
+def main():
+    """Main function"""
+    args = sys.argv[1:]
+    if not args:
+        usage()
+        return
+
+    ports = None
+    if "--ports" in args:
+        i = args.index("--ports")
+        if i + 1 == len(args):
+            usage()
+            sys.exit(1)
+        ports = args[i + 1].split(",")
+        del args[i:i + 2]
+    verify = "--no-verify" not in args
+    args = [a for a in args if not a.startswith("--")]
+    if not args:  # options but no command
+        usage()
+        sys.exit(1)
+    action, names = args[0], args[1:]
+
+    if ports:
+        boards = [(p, "user selected") for p in ports]
+    else:
+        print("🔍 Looking for MicroPython boards...")
+        boards = find_micropython_boards(verify=verify)
+
+    if not boards:
+        print("❌ No MicroPython boards found")
+        sys.exit(1)
+
+    if action == "list":
+        for port, description in boards:
+            print(f"  {port:<14} {description}")
+        print(f"\nTotal: {len(boards)} board(s)")
+        return
+
+    if action not in ("install", "sync", "test"):
+        print(f"Unknown command: {action}")
+        sys.exit(2)
+
+    print(f"🚀 Running '{action}' on {len(boards)} board(s): {', '.join(p for p, _ in boards)}")
+    results = run_fleet(action, names, boards)
+    print_results(action, results)
+    if not all(r["ok"] for r in results.values()):
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
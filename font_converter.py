@@ -0,0 +1,268 @@
+#!/usr/bin/env python3
+"""
+OLED Font Converter
+Packs a font into the glyph atlas format read by oled_font.py on the board:
+every glyph pre-rendered as a MONO_VLSB bitmap (the SSD1306 layout), so the
+board only reads bytes from flash and blits them.
+
+Usage:
+  python font_converter.py builtin <out.fnt> [--scale N] [--proportional]
+  python font_converter.py bdf <font.bdf> <out.fnt>
+  python font_converter.py ttf <font.ttf> <out.fnt> --size PX     (needs Pillow)
+  python font_converter.py info <file.fnt>
+Options: --chars " ~"  first and last character to include (default: printable ASCII)
+
+builtin uses the 5x7 font the simulator draws framebuf.text() with, scaled
+and optionally trimmed to proportional widths. Copy the result to the board
+with mpremote cp or transfer.py.
+
+File layout (little-endian):
+  "MPF1" | height u8 | baseline u8 | first u8 | last u8 | default u8
+  per character first..last: width u8 | data offset u32
+  glyph data: width * ceil(height / 8) bytes each, page-major MONO_VLSB
+"""
+
+import os
+import struct
+import sys
+
+MAGIC = b"MPF1"
+HEADER = struct.Struct("<4sBBBBB")
+ENTRY = struct.Struct("<BI")
+FIRST, LAST = 0x20, 0x7E
+
+
+class Glyph:
+    """A bitmap as a list of rows of 0/1, plus the advance width"""
+
+    def __init__(self, width, height):
+        self.width = width
+        self.rows = [[0] * width for _ in range(height)]
+
+    def set(self, x, y):
+        if 0 <= x < self.width and 0 <= y < len(self.rows):
+            self.rows[y][x] = 1
+
+    def columns_used(self):
+        return [x for x in range(self.width) if any(row[x] for row in self.rows)]
+
+    def crop_columns(self, start, end):
+        self.rows = [row[start:end] for row in self.rows]
+        self.width = end - start
+
+    def pack(self):
+        """MONO_VLSB bytes: for each 8-row page, one byte per column, bit 0 on top"""
+        height = len(self.rows)
+        data = bytearray()
+        for page in range(0, height, 8):
+            for x in range(self.width):
+                byte = 0
+                for bit in range(8):
+                    y = page + bit
+                    if y < height and self.rows[y][x]:
+                        byte |= 1 << bit
+                data.append(byte)
+        return bytes(data)
+
+
+def pack_font(glyphs, height, baseline, first=FIRST, last=LAST, default="?"):
+    """File contents for {char: Glyph}; characters without a glyph are stored as zero-width"""
+    index = bytearray()
+    data = bytearray()
+    for code in range(first, last + 1):
+        glyph = glyphs.get(chr(code))
+        if glyph is None:
+            index += ENTRY.pack(0, 0)
+            continue
+        index += ENTRY.pack(glyph.width, len(data))
+        data += glyph.pack()
+    default_code = ord(default) if first <= ord(default) <= last else first
+    header = HEADER.pack(MAGIC, height, baseline, first, last, default_code)
+    # Offsets are relative to the glyph data, which follows the index
+    base = HEADER.size + len(index)
+    fixed = bytearray()
+    for i in range(0, len(index), ENTRY.size):
+        width, offset = ENTRY.unpack_from(index, i)
+        fixed += ENTRY.pack(width, base + offset if width else 0)
+    return header + bytes(fixed) + bytes(data)
+
+
+def read_info(blob):
+    """(height, baseline, first, last, default, {char: width}) from a packed font"""
+    magic, height, baseline, first, last, default = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("not a packed font file")
+    widths = {}
+    for i, code in enumerate(range(first, last + 1)):
+        width, _offset = ENTRY.unpack_from(blob, HEADER.size + i * ENTRY.size)
+        widths[chr(code)] = width
+    return height, baseline, first, last, default, widths
+
+
+# ---- sources ----
+
+def from_builtin(scale=1, proportional=False, first=FIRST, last=LAST):
+    """The simulator's 5x7 font in 8-pixel cells (like framebuf.text), scaled"""
+    sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+    from mpsim.font import GLYPHS
+
+    glyphs = {}
+    for code in range(max(first, 0x20), min(last, 0x7F) + 1):
+        columns = GLYPHS[(code - 0x20) * 5:(code - 0x20) * 5 + 5]
+        glyph = Glyph(8 * scale, 8 * scale)
+        for x, bits in enumerate(columns):
+            for y in range(8):
+                if bits >> y & 1:
+                    for dx in range(scale):
+                        for dy in range(scale):
+                            glyph.set(x * scale + dx, y * scale + dy)
+        if proportional:
+            used = glyph.columns_used()
+            if used:
+                glyph.crop_columns(used[0], used[-1] + 1 + scale)  # one scaled column of spacing
+            else:
+                glyph.crop_columns(0, 3 * scale)  # space
+        glyphs[chr(code)] = glyph
+    return glyphs, 8 * scale, 7 * scale
+
+
+def from_bdf(path, first=FIRST, last=LAST):
+    """Glyphs from an X11 BDF bitmap font"""
+    with open(path, encoding="latin-1") as f:
+        lines = [line.strip() for line in f]
+
+    ascent = descent = None
+    box_h = box_y = 0
+    for line in lines:
+        if line.startswith("FONTBOUNDINGBOX"):
+            _w, box_h, _x, box_y = (int(v) for v in line.split()[1:5])
+        elif line.startswith("FONT_ASCENT"):
+            ascent = int(line.split()[1])
+        elif line.startswith("FONT_DESCENT"):
+            descent = int(line.split()[1])
+    if ascent is None:
+        ascent = box_h + box_y
+    if descent is None:
+        descent = -box_y
+    height = ascent + descent
+
+    glyphs = {}
+    i = 0
+    while i < len(lines):
+        if not lines[i].startswith("STARTCHAR"):
+            i += 1
+            continue
+        code = advance = None
+        bbx = (0, 0, 0, 0)
+        i += 1
+        while not lines[i].startswith("BITMAP"):
+            key, *values = lines[i].split()
+            if key == "ENCODING":
+                code = int(values[0])
+            elif key == "DWIDTH":
+                advance = int(values[0])
+            elif key == "BBX":
+                bbx = tuple(int(v) for v in values[:4])
+            i += 1
+        i += 1
+        w, h, xoff, yoff = bbx
+        bitmap = lines[i:i + h]
+        i += h
+        if code is None or not first <= code <= last:
+            continue
+        glyph = Glyph(max(advance or w, xoff + w, 1), height)
+        top = ascent - (yoff + h)
+        for row, hexrow in enumerate(bitmap):
+            bits = int(hexrow, 16)
+            nbits = len(hexrow) * 4
+            for x in range(w):
+                if bits >> (nbits - 1 - x) & 1:
+                    glyph.set(xoff + x, top + row)
+        glyphs[chr(code)] = glyph
+    return glyphs, height, ascent
+
+
+def from_ttf(path, size, first=FIRST, last=LAST):
+    """Glyphs rendered from a TrueType/OpenType font with Pillow"""
+    try:
+        from PIL import Image, ImageDraw, ImageFont
+    except ImportError:
+        raise SystemExit("❌ TrueType fonts need Pillow: pip install pillow")
+    font = ImageFont.truetype(path, size)
+    ascent, descent = font.getmetrics()
+    height = ascent + descent
+    glyphs = {}
+    for code in range(first, last + 1):
+        ch = chr(code)
+        advance = max(int(round(font.getlength(ch))), 1)
+        image = Image.new("1", (advance + size, height), 0)
+        ImageDraw.Draw(image).text((0, 0), ch, font=font, fill=1)
+        glyph = Glyph(advance, height)
+        for y in range(height):
+            for x in range(advance):
+                if image.getpixel((x, y)):
+                    glyph.set(x, y)
+        glyphs[ch] = glyph
+    return glyphs, height, ascent
+
+
+# ---- command line ----
+
+def _option(args, name, default=None):
+    if name in args:
+        i = args.index(name)
+        value = args[i + 1]
+        del args[i:i + 2]
+        return value
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+    chars = _option(args, "--chars")
+    first, last = (ord(chars[0]), ord(chars[-1])) if chars else (FIRST, LAST)
+    scale = int(_option(args, "--scale", "1"))
+    size = _option(args, "--size")
+    proportional = "--proportional" in args
+    args = [a for a in args if a != "--proportional"]
+
+    if len(args) < 2:
+        print(__doc__)
+        return 1
+    command = args[0]
+
+    if command == "info":
+        with open(args[1], "rb") as f:
+            blob = f.read()
+        height, baseline, first, last, default, widths = read_info(blob)
+        print(f"🔤 {args[1]}: {height} px high (baseline {baseline}), "
+              f"chars {chr(first)!r}..{chr(last)!r}, {len(blob)} bytes")
+        print(f"   widths {min(widths.values())}..{max(widths.values())} px, "
+              f"'Hello World' is {sum(widths.get(c, 0) for c in 'Hello World')} px wide")
+        return 0
+
+    if command == "builtin":
+        glyphs, height, baseline = from_builtin(scale, proportional, first, last)
+        out = args[1]
+    elif command == "bdf" and len(args) >= 3:
+        glyphs, height, baseline = from_bdf(args[1], first, last)
+        out = args[2]
+    elif command == "ttf" and len(args) >= 3 and size:
+        glyphs, height, baseline = from_ttf(args[1], int(size), first, last)
+        out = args[2]
+    else:
+        print(__doc__)
+        return 1
+
+    if height > 255:
+        print(f"❌ Font is {height} px high; the format allows up to 255")
+        return 1
+    blob = pack_font(glyphs, height, baseline, first, last)
+    with open(out, "wb") as f:
+        f.write(blob)
+    print(f"✅ Wrote {out}: {len(glyphs)} glyphs, {height} px high, {len(blob)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
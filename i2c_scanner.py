@@ -1,43 +1,43 @@
 # Simple I2C Scanner - Quick Diagnostic
 # This will help you see if your OLED is connected
 
-from machine import Pin, SoftI2C, I2C
-import time
-
 print("🔍 I2C Scanner - Quick Diagnostic")
 print("=" * 40)
 
 def scan_i2c():
-    """Scan for I2C devices"""
+    """Find the bus your devices are on (probes likely pins first, saves the result)"""
     print("Scanning for I2C devices...")
-    
-    # Try different I2C configurations
-    configs = [
-        ("SoftI2C - Pins 13,15", SoftI2C(sda=Pin(13), scl=Pin(15))),
-        ("SoftI2C - Pins 21,22", SoftI2C(sda=Pin(21), scl=Pin(22))),
-        ("Hardware I2C - Pins 21,22", I2C(0, sda=Pin(21), scl=Pin(22)))
-    ]
-    
+    try:
+        import i2c_discovery
+    except ImportError:
+        print("❌ i2c_discovery library not found!")
+        print("💡 Upload micropython_libraries/i2c_discovery.py to your ESP32")
+        return []
+
+    # A scanner should look again rather than trust the saved bus
+    config, i2c = i2c_discovery.discover(use_cache=False, verbose=True)
+    if not config:
+        print("  ❌ No devices found on any common pin pair")
+        return []
+
+    name = f"SoftI2C - Pins {config['sda']},{config['scl']}"
+    print(f"\n🔍 {name}:")
+    print(f"  ✅ Found {len(config['devices'])} device(s):")
     found_devices = []
-    
-    for name, i2c in configs:
-        print(f"\n🔍 {name}:")
-        try:
-            devices = i2c.scan()
-            if devices:
-                print(f"  ✅ Found {len(devices)} device(s):")
-                for addr in devices:
-                    print(f"    Address: 0x{addr:02X} ({addr})")
-                    found_devices.append((name, addr))
-                    
-                    # Check if it's a common OLED address
-                    if addr in [0x3C, 0x3D, 0x78, 0x7A]:
-                        print(f"    ⭐ This looks like an OLED display!")
-            else:
-                print(f"  ❌ No devices found")
-        except Exception as e:
-            print(f"  ❌ Error: {e}")
-    
+    try:
+        import i2c_fingerprint
+        parts = {e["addr"]: e for e in i2c_fingerprint.identify(i2c, config["devices"])}
+    except ImportError:
+        parts = {}
+    for addr in config["devices"]:
+        print(f"    Address: 0x{addr:02X} ({addr})")
+        found_devices.append((name, addr))
+        part = parts.get(addr)
+        if part and part["part"] != "unknown":
+            print(f"    ⭐ {part['part']} - {part['description']}" + ("" if part["confirmed"] else " (probable)"))
+        elif addr in i2c_discovery.OLED_ADDRESSES:
+            print(f"    ⭐ This looks like an OLED display!")
+    print(f"  💾 Saved to {i2c_discovery.CACHE_FILE}: other scripts can reuse this bus")
     return found_devices
 
 def check_ssd1306_library():
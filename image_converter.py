@@ -0,0 +1,259 @@
+#!/usr/bin/env python3
+"""
+OLED Image Converter
+Turns PNG/GIF images (or PBM/PGM without any extra packages) into MONO_VLSB
+frames, dithered down to one bit per pixel, and packs them into a frame file
+that ssd1306.ImageFile streams straight from flash. An animated GIF keeps
+its frame delays.
+
+Usage:
+  python image_converter.py <image>... -o <out.img> [options]
+  python image_converter.py info <file.img>
+  python image_converter.py preview <file.img> [frame]
+Options:
+  --size WxH           scale to fit WxH (default 128x64 for images larger than that)
+  --dither floyd|bayer|none   (default floyd; bayer keeps animations from flickering)
+  --threshold N        0-255 cut-off for --dither none (default 128)
+  --invert             light pixels off, dark pixels lit
+  --delay MS           frame delay when the source has none (default 100)
+
+PNG and GIF need Pillow (pip install pillow). Copy the result to the board
+with mpremote cp or transfer.py.
+
+File layout (little-endian):
+  "MPI1" | width u16 | height u16 | frames u16
+  per frame: delay_ms u16
+  frame data: width * ceil(height / 8) bytes each, page-major MONO_VLSB
+"""
+
+import struct
+import sys
+
+MAGIC = b"MPI1"
+HEADER = struct.Struct("<4sHHH")
+DEFAULT_SIZE = (128, 64)
+BAYER_4X4 = (
+    (0, 8, 2, 10),
+    (12, 4, 14, 6),
+    (3, 11, 1, 9),
+    (15, 7, 13, 5),
+)
+
+
+# ---- loading (grayscale rows of 0-255) ----
+
+def _netpbm_tokens(data):
+    """Header and ASCII-body tokens, skipping # comments"""
+    tokens = []
+    i = 0
+    while i < len(data):
+        c = data[i:i + 1]
+        if c == b"#":
+            while i < len(data) and data[i:i + 1] not in (b"\n", b"\r"):
+                i += 1
+        elif c.isspace():
+            i += 1
+        else:
+            start = i
+            while i < len(data) and not data[i:i + 1].isspace():
+                i += 1
+            tokens.append((data[start:i], i))
+    return tokens
+
+
+def load_netpbm(path):
+    """(width, height, rows) from a P1/P2/P4/P5 file; PBM black is 0, white 255"""
+    with open(path, "rb") as f:
+        data = f.read()
+    kind = data[:2]
+    tokens = _netpbm_tokens(data)
+    width, height = int(tokens[1][0]), int(tokens[2][0])
+    if kind in (b"P1", b"P4"):
+        maxval, body_start, header_tokens = 1, tokens[2][1] + 1, 3
+    elif kind in (b"P2", b"P5"):
+        maxval, body_start, header_tokens = int(tokens[3][0]), tokens[3][1] + 1, 4
+    else:
+        raise ValueError(f"{path}: not a PBM/PGM file")
+
+    if kind == b"P1":
+        bits = b"".join(t for t, _ in tokens[header_tokens:])
+        values = [0 if b == ord("1") else 255 for b in bits[:width * height]]
+    elif kind == b"P2":
+        values = [int(t) * 255 // maxval for t, _ in tokens[header_tokens:header_tokens + width * height]]
+    elif kind == b"P4":
+        row_bytes = (width + 7) // 8
+        body = data[body_start:]
+        values = []
+        for y in range(height):
+            row = body[y * row_bytes:(y + 1) * row_bytes]
+            values += [0 if row[x >> 3] & (0x80 >> (x & 7)) else 255 for x in range(width)]
+    else:
+        body = data[body_start:]
+        values = [v * 255 // maxval for v in body[:width * height]]
+    rows = [values[y * width:(y + 1) * width] for y in range(height)]
+    return width, height, rows
+
+
+def load_frames(path, size=None, default_delay=100):
+    """[(width, height, rows, delay_ms)] for every frame in an image file"""
+    if path.lower().endswith((".pbm", ".pgm", ".pnm")):
+        width, height, rows = load_netpbm(path)
+        if size and (width, height) != size:
+            raise SystemExit("❌ Resizing needs Pillow: pip install pillow (or convert at the final size)")
+        return [(width, height, rows, default_delay)]
+
+    try:
+        from PIL import Image, ImageSequence
+    except ImportError:
+        raise SystemExit("❌ PNG/GIF images need Pillow: pip install pillow")
+    frames = []
+    with Image.open(path) as image:
+        for frame in ImageSequence.Iterator(image):
+            gray = frame.convert("L")
+            target = size or DEFAULT_SIZE
+            if size or gray.width > target[0] or gray.height > target[1]:
+                gray.thumbnail(target)
+            delay = frame.info.get("duration") or default_delay
+            pixels = list(gray.getdata())
+            rows = [pixels[y * gray.width:(y + 1) * gray.width] for y in range(gray.height)]
+            frames.append((gray.width, gray.height, rows, int(delay)))
+    return frames
+
+
+# ---- one bit per pixel ----
+
+def dither(rows, method="floyd", threshold=128, invert=False):
+    """1/0 rows: 1 where the pixel should be lit"""
+    height, width = len(rows), len(rows[0])
+    source = [[255 - v if invert else v for v in row] for row in rows]
+    out = [[0] * width for _ in range(height)]
+    if method == "floyd":
+        work = [list(map(float, row)) for row in source]
+        for y in range(height):
+            for x in range(width):
+                old = work[y][x]
+                new = 255 if old >= 128 else 0
+                out[y][x] = 1 if new else 0
+                err = old - new
+                if x + 1 < width:
+                    work[y][x + 1] += err * 7 / 16
+                if y + 1 < height:
+                    if x > 0:
+                        work[y + 1][x - 1] += err * 3 / 16
+                    work[y + 1][x] += err * 5 / 16
+                    if x + 1 < width:
+                        work[y + 1][x + 1] += err * 1 / 16
+    elif method == "bayer":
+        for y in range(height):
+            for x in range(width):
+                limit = (BAYER_4X4[y & 3][x & 3] * 16 + 8)
+                out[y][x] = 1 if source[y][x] >= limit else 0
+    else:
+        for y in range(height):
+            for x in range(width):
+                out[y][x] = 1 if source[y][x] >= threshold else 0
+    return out
+
+
+def pack_vlsb(bits):
+    """MONO_VLSB bytes for 1/0 rows: one byte per column per 8-row page, bit 0 on top"""
+    height, width = len(bits), len(bits[0])
+    data = bytearray()
+    for page in range(0, height, 8):
+        for x in range(width):
+            byte = 0
+            for bit in range(8):
+                y = page + bit
+                if y < height and bits[y][x]:
+                    byte |= 1 << bit
+            data.append(byte)
+    return bytes(data)
+
+
+def pack_file(frames, width, height):
+    """File contents for [(vlsb_bytes, delay_ms)]"""
+    header = HEADER.pack(MAGIC, width, height, len(frames))
+    delays = b"".join(struct.pack("<H", min(delay, 0xFFFF)) for _data, delay in frames)
+    return header + delays + b"".join(data for data, _delay in frames)
+
+
+def read_file(blob):
+    """(width, height, [(vlsb_bytes, delay_ms)]) from a packed frame file"""
+    magic, width, height, count = HEADER.unpack_from(blob)
+    if magic != MAGIC:
+        raise ValueError("not a packed frame file")
+    delays = struct.unpack_from(f"<{count}H", blob, HEADER.size)
+    start = HEADER.size + 2 * count
+    size = width * ((height + 7) // 8)
+    return width, height, [(blob[start + i * size:start + (i + 1) * size], delays[i]) for i in range(count)]
+
+
+def preview(data, width, height):
+    """Text rendering of one frame, for checking a conversion"""
+    lines = []
+    for y in range(height):
+        page, bit = divmod(y, 8)
+        lines.append("".join("#" if data[page * width + x] >> bit & 1 else "." for x in range(width)))
+    return "\n".join(lines)
+
+
+# ---- command line ----
+
+def _option(args, name, default=None):
+    if name in args:
+        i = args.index(name)
+        value = args[i + 1]
+        del args[i:i + 2]
+        return value
+    return default
+
+
+def main():
+    args = sys.argv[1:]
+    if len(args) >= 2 and args[0] in ("info", "preview"):
+        with open(args[1], "rb") as f:
+            width, height, frames = read_file(f.read())
+        if args[0] == "info":
+            total = sum(delay for _data, delay in frames)
+            print(f"🖼️  {args[1]}: {width}x{height}, {len(frames)} frame(s), "
+                  f"{len(frames[0][0])} bytes each, {total} ms per loop")
+        else:
+            index = int(args[2]) if len(args) > 2 else 0
+            print(preview(frames[index][0], width, height))
+        return 0
+
+    out = _option(args, "-o")
+    size = _option(args, "--size")
+    method = _option(args, "--dither", "floyd")
+    threshold = int(_option(args, "--threshold", "128"))
+    delay = int(_option(args, "--delay", "100"))
+    invert = "--invert" in args
+    inputs = [a for a in args if a != "--invert"]
+    if not out or not inputs or method not in ("floyd", "bayer", "none"):
+        print(__doc__)
+        return 1
+    if size:
+        size = tuple(int(v) for v in size.lower().split("x"))
+
+    packed = []
+    dims = None
+    for path in inputs:
+        for width, height, rows, frame_delay in load_frames(path, size, delay):
+            if dims and dims != (width, height):
+                print(f"❌ {path}: frame is {width}x{height}, earlier frames are {dims[0]}x{dims[1]}")
+                return 1
+            dims = (width, height)
+            packed.append((pack_vlsb(dither(rows, method, threshold, invert)), frame_delay))
+    if not packed:
+        print("❌ No frames found")
+        return 1
+
+    blob = pack_file(packed, *dims)
+    with open(out, "wb") as f:
+        f.write(blob)
+    print(f"✅ Wrote {out}: {len(packed)} frame(s) of {dims[0]}x{dims[1]}, {len(blob)} bytes")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
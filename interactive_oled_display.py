@@ -3,9 +3,7 @@
 
 from machine import Pin, SoftI2C, I2C
 import ssd1306
-import sys
 import time
-import uselect
 
 # ===== CONFIGURATION =====
 # Change these pins based on your setup
@@ -49,11 +47,19 @@ def setup_oled():
         print("💡 Try different pins or check connections")
         return None
 
-def display_text(oled, text, clear=True):
-    """Display text on OLED with word wrapping"""
+def display_text(oled, text, clear=True, font=None):
+    """Display text on OLED with word wrapping (font: an oled_font.Font, else 8x8)"""
     if clear:
         oled.fill(0)
     
+    if font:
+        # Wrap by measured pixel width; rows are as tall as the font
+        lines = font.wrap(" ".join(text.split()), oled.width)
+        for i, line in enumerate(lines[:oled.height // font.height]):
+            font.text(oled, line, 0, i * font.height)
+        oled.show()
+        return
+    
     # Word wrapping for OLED display
     words = text.split()
     lines = []
@@ -88,54 +94,45 @@ def main():
         print("❌ Cannot start without OLED")
         return
     
-    # Setup serial input
-    select = uselect.select
-    stdin = sys.stdin
+    try:
+        import oled_console
+    except ImportError:
+        print("❌ oled_console library not found!")
+        print("💡 Install it: python library_manager.py install oled_console")
+        return
     
     print("\n📺 OLED Display Active!")
     print("💻 Send text from Serial Monitor:")
     print("   - Type any text and press Enter")
-    print("   - Text will appear on OLED display")
+    print("   - Text appears on the OLED as you type")
     print("   - Type 'clear' to clear display")
     print("   - Type 'quit' to exit")
     print("=" * 40)
     
-    # Main loop
-    while True:
-        try:
-            # Check for serial input (non-blocking)
-            if select([stdin], [], [], 0)[0]:
-                msg = stdin.readline().strip()
-                
-                if not msg:
-                    continue
-                
-                print(f"📤 Received: '{msg}'")
-                
-                # Handle special commands
-                if msg.lower() == 'quit':
-                    print("👋 Goodbye!")
-                    oled.fill(0)
-                    oled.text("Goodbye!", 0, 0)
-                    oled.show()
-                    break
-                elif msg.lower() == 'clear':
-                    oled.fill(0)
-                    oled.show()
-                    print("🧹 Display cleared")
-                else:
-                    # Display the message
-                    display_text(oled, msg)
-                    print(f"✅ Displayed: '{msg}'")
-            
-            time.sleep(0.1)  # Small delay to prevent busy waiting
-            
-        except KeyboardInterrupt:
-            print("\n👋 Interrupted by user")
-            break
-        except Exception as e:
-            print(f"❌ Error: {e}")
-            time.sleep(1)
+    console = oled_console.OledConsole(oled, scrollback=32)
+    console.invalidate()  # setup_oled drew the welcome screen
+    console.print("Type below:")
+    
+    def handle(msg):
+        msg = msg.strip()
+        if not msg:
+            return True
+        print(f"📤 Received: '{msg}'")
+        if msg.lower() == 'quit':
+            print("👋 Goodbye!")
+            console.clear()
+            console.print("Goodbye!")
+            return False
+        if msg.lower() == 'clear':
+            console.clear()
+            print("🧹 Display cleared")
+        return True
+    
+    # Sleeps in uselect.poll until a key arrives; no busy loop
+    try:
+        oled_console.run(console, on_line=handle, idle_ms=-1)
+    except KeyboardInterrupt:
+        print("\n👋 Interrupted by user")
 
 # Alternative simple version without serial input
 def simple_demo():
@@ -4,21 +4,42 @@ Comprehensive MicroPython Library Manager
 Handles all library operations: install, test, manage
 """
 
+import hashlib
+import json
 import os
+import shutil
 import subprocess
 import sys
+import tempfile
 import urllib.request
 import time
 
+from raw_repl import RawREPL, RawREPLTimeout
+from transfer import send_file
+
 # Configuration
 LIBRARIES_FOLDER = "micropython_libraries"
 DEFAULT_PORT = "COM6"
+MANIFEST_FILE = os.path.join(LIBRARIES_FOLDER, "manifest.json")
+TEST_REPORT_FILE = "library_test_report.json"
+TEST_TIMEOUT = 15  # seconds per library test
+
+# Libraries worth shipping as .mpy with native code: their hot loops are
+# @micropython.native/@micropython.viper functions (ESP32 is xtensawin)
+NATIVE_LIBRARIES = ["fast_loops"]
+NATIVE_ARCH = "xtensawin"
+NATIVE_BUILD_FOLDER = os.path.join(LIBRARIES_FOLDER, "build")
 
-# Available libraries with their information
+# Available libraries with their information.
+# 'requires' lists other libraries from this folder that must be installed
+# first; 'firmware' lists modules that must already be built into the firmware.
+# Sizes and hashes are measured from the files (see build_manifest).
 LIBRARIES = {
     'ssd1306': {
         'description': 'OLED Display Driver',
-        'size': '4.8KB',
+        'version': '0.1.0',
+        'requires': [],
+        'firmware': ['framebuf'],
         'category': 'Display',
         'pins': 'I2C (SDA=4, SCL=5)',
         'test_code': '''
@@ -26,7 +47,11 @@ LIBRARIES = {
 from machine import Pin, SoftI2C
 import ssd1306
 
-i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
+try:
+    import bus_factory
+    i2c = bus_factory.get_i2c(4, 5)  # hardware I2C at the fastest stable clock
+except ImportError:
+    i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
 oled = ssd1306.SSD1306_I2C(128, 64, i2c)
 
 oled.fill(0)
@@ -34,11 +59,118 @@ oled.text("Hello World!", 0, 0)
 oled.text("OLED Working!", 0, 16)
 oled.show()
 print("OLED test successful!")
+'''
+    },
+    'oled_console': {
+        'description': 'Scrolling OLED Text Console',
+        'version': '1.0.0',
+        'requires': ['ssd1306'],
+        'firmware': ['framebuf', 'uselect'],
+        'category': 'Display',
+        'pins': 'I2C (SDA=4, SCL=5)',
+        'test_code': '''
+# Test OLED Console
+from machine import Pin, SoftI2C
+import ssd1306
+import oled_console
+
+oled = ssd1306.SSD1306_I2C(128, 64, SoftI2C(sda=Pin(4), scl=Pin(5)))
+console = oled_console.OledConsole(oled, scrollback=16)
+for i in range(12):
+    console.print(f"Line {i}")
+console.write("typing")
+console.autoshow = False
+console.write("!")
+print(f"Rows redrawn for one more key: {console.render()}")
+print("OLED console test complete!")
+'''
+    },
+    'oled_font': {
+        'description': 'Proportional/Large OLED Fonts with a Glyph Cache',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['framebuf', 'struct'],
+        'category': 'Display',
+        'pins': 'None (draws into any framebuf display)',
+        'test_code': '''
+# Test OLED Fonts (build one first: python font_converter.py builtin font.fnt --scale 2 --proportional)
+import framebuf
+import oled_font
+
+try:
+    font = oled_font.Font("font.fnt")
+except OSError:
+    font = None
+    print("No font.fnt on the board: copy one made by font_converter.py")
+if font:
+    fb = framebuf.FrameBuffer(bytearray(128 * 64 // 8), 128, 64, framebuf.MONO_VLSB)
+    end = font.text(fb, "Hello 123", 0, 0)
+    print(f"{font.height}px font: 'Hello 123' is {font.measure('Hello 123')} px, drawn to x={end}")
+    print(f"Cache: {font.stats()}")
+print("OLED font test complete!")
+'''
+    },
+    'oled_charts': {
+        'description': 'Strip Chart, Sparkline and Bar Meter Widgets for Live OLED Plots',
+        'version': '1.0.0',
+        'requires': ['ssd1306'],
+        'firmware': ['framebuf', 'array'],
+        'category': 'Display',
+        'pins': 'I2C (SDA=13, SCL=15)',
+        'test_code': '''
+# Test OLED Charts
+from machine import Pin, SoftI2C
+import math
+import ssd1306
+import oled_charts
+
+i2c = SoftI2C(sda=Pin(13), scl=Pin(15))
+oled = ssd1306.SSD1306_I2C(128, 64, i2c)
+oled.fill(0)
+oled.text("Charts", 0, 0)
+meter = oled_charts.BarMeter(oled, 0, 8, 128, 8, lo=0, hi=100)
+chart = oled_charts.StripChart(oled, 0, 16, 128, 48, lo=0, hi=100)
+oled.show()
+for i in range(128):
+    value = 50 + 45 * math.sin(i / 8)
+    meter.set(value)
+    chart.push(value)
+    oled.show(1, 7)
+print("OLED charts test complete!")
+'''
+    },
+    'display_manager': {
+        'description': 'Several OLEDs on One I2C Bus (0x3C/0x3D or a TCA9548A switch)',
+        'version': '1.0.0',
+        'requires': ['ssd1306'],
+        'firmware': ['machine'],
+        'category': 'Display',
+        'pins': 'I2C (SDA=13, SCL=15)',
+        'test_code': '''
+# Test Display Manager (uses every OLED it finds at 0x3C/0x3D)
+from machine import Pin, SoftI2C
+import display_manager
+
+i2c = SoftI2C(sda=Pin(13), scl=Pin(15), freq=400000)
+displays = display_manager.DisplayManager(i2c, budget_us=10000)
+for addr in [a for a in i2c.scan() if a in (0x3C, 0x3D)]:
+    displays.open(hex(addr), addr=addr)
+for n in range(30):
+    for panel in displays.panels:
+        panel.oled.fill_rect(0, 0, 128, 8, 0)
+        panel.oled.text(f"{panel.name} {n}", 0, 0)
+        displays.mark_rows(panel.name, 0, 8)
+    displays.tick()
+displays.flush()
+displays.report()
+print("Display manager test complete!")
 '''
     },
     'dht': {
         'description': 'DHT Temperature/Humidity Sensor',
-        'size': '1.1KB',
+        'version': '0.1.0',
+        'requires': [],
+        'firmware': ['machine'],
         'category': 'Sensor',
         'pins': 'Digital (Pin 4)',
         'test_code': '''
@@ -57,7 +189,9 @@ print(f"Humidity: {hum}%")
     },
     'ds18x20': {
         'description': 'DS18B20 Temperature Sensor',
-        'size': '1.4KB',
+        'version': '0.1.0',
+        'requires': ['onewire'],
+        'firmware': ['micropython'],
         'category': 'Sensor',
         'pins': 'OneWire (Pin 4)',
         'test_code': '''
@@ -81,7 +215,9 @@ for rom in roms:
     },
     'onewire': {
         'description': 'OneWire Protocol',
-        'size': '1.0KB',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['machine'],
         'category': 'Protocol',
         'pins': 'Digital (Pin 4)',
         'test_code': '''
@@ -96,7 +232,9 @@ print(f"OneWire devices found: {devices}")
     },
     'servo': {
         'description': 'Servo Motor Control',
-        'size': '778B',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['machine'],
         'category': 'Motor',
         'pins': 'PWM (Pin 2)',
         'test_code': '''
@@ -116,7 +254,9 @@ print("Servo test complete!")
     },
     'neopixel': {
         'description': 'NeoPixel LED Control',
-        'size': '923B',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['machine'],
         'category': 'Display',
         'pins': 'Digital (Pin 2)',
         'test_code': '''
@@ -135,7 +275,9 @@ print("NeoPixel test complete!")
     },
     'pca9685': {
         'description': 'PCA9685 PWM Controller',
-        'size': '1.8KB',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['ustruct'],
         'category': 'Motor',
         'pins': 'I2C (SDA=4, SCL=5)',
         'test_code': '''
@@ -143,15 +285,152 @@ print("NeoPixel test complete!")
 from machine import SoftI2C, Pin
 import pca9685
 
-i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
+try:
+    import bus_factory
+    i2c = bus_factory.get_i2c(4, 5)
+except ImportError:
+    i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
 pwm = pca9685.PCA9685(i2c)
-pwm.set_pwm(0, 0, 2048)  # 50% duty cycle
+pwm.duty(0, 2048)  # 50% duty cycle
 print("PCA9685 test complete!")
+'''
+    },
+    'i2c_discovery': {
+        'description': 'I2C Bus Discovery with Saved Pins',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['machine', 'json'],
+        'category': 'Utility',
+        'pins': 'I2C (found automatically)',
+        'test_code': '''
+# Test I2C Discovery
+import i2c_discovery
+
+config, i2c = i2c_discovery.discover(verbose=True)
+if config:
+    print(f"Bus: SDA={config['sda']} SCL={config['scl']}")
+    print(f"Devices: {[hex(a) for a in config['devices']]}")
+else:
+    print("No I2C devices found")
+'''
+    },
+    'i2c_fingerprint': {
+        'description': 'I2C Device Identification',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['machine'],
+        'category': 'Utility',
+        'pins': 'I2C (SDA=4, SCL=5)',
+        'test_code': '''
+# Test I2C Fingerprinting
+from machine import Pin, SoftI2C
+import i2c_fingerprint
+
+i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
+for line in i2c_fingerprint.describe(i2c_fingerprint.identify(i2c)):
+    print(line)
+print("Fingerprint test complete!")
+'''
+    },
+    'bus_factory': {
+        'description': 'Shared I2C Buses at the Fastest Stable Clock',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['machine'],
+        'category': 'Utility',
+        'pins': 'I2C (SDA=4, SCL=5)',
+        'test_code': '''
+# Test I2C Bus Factory
+import bus_factory
+
+i2c = bus_factory.get_i2c(4, 5)
+print(bus_factory.describe(4, 5))
+print("Bus factory test complete!")
+'''
+    },
+    'driver_pool': {
+        'description': 'Reused Bus, Display and Frame Buffer Objects (no heap churn on re-init)',
+        'version': '1.0.0',
+        'requires': ['ssd1306'],
+        'firmware': ['machine', 'gc'],
+        'category': 'Utility',
+        'pins': 'I2C (SDA=13, SCL=15)',
+        'test_code': '''
+# Test Driver Pool
+import driver_pool
+
+for attempt in range(3):
+    i2c = driver_pool.i2c(13, 15)
+    oled = driver_pool.display(128, 64, i2c)  # built once, re-initialised after
+oled.text("Pooled", 0, 0)
+oled.show()
+driver_pool.report()
+print("Driver pool test complete!")
+'''
+    },
+    'spi_characterise': {
+        'description': 'SPI Loopback Clock and Throughput Sweep',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['machine', 'json'],
+        'category': 'Utility',
+        'pins': 'SPI (SCK=14, MOSI=13 jumpered to MISO=12)',
+        'test_code': '''
+# Test SPI Characterisation (needs a jumper from GPIO13 to GPIO12)
+import spi_characterise
+
+if spi_characterise.jumper_present(sck=14, mosi=13, miso=12):
+    spi_characterise.characterise(hosts=(1,), verbose=False)
+    print(f"HSPI max clock: {spi_characterise.max_baudrate(1)} Hz")
+else:
+    print("No MOSI-MISO jumper: sweep skipped")
+print("SPI characterisation test complete!")
+'''
+    },
+    'board_agent': {
+        'description': 'Resident Binary Command Agent (host: boardlink package, agent.py)',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['machine', 'micropython', 'struct'],
+        'category': 'Utility',
+        'pins': 'Any (pins, ADC, I2C and PWM are chosen per request)',
+        'test_code': '''
+# Test Board Agent dispatch (the host drives it with: python agent.py <port> ping)
+import board_agent
+
+status, reply = board_agent.dispatch(board_agent.PING, b"hi")
+print(f"Ping: status {status}, reply {bytes(reply)}")
+status, reply = board_agent.dispatch(board_agent.I2C_SCAN, b"")
+print(f"Scan before I2C_CONFIG: status {status} ({bytes(reply).decode()})")
+print("Board agent test complete!")
+'''
+    },
+    'fast_loops': {
+        'description': 'Native/Viper Builds of the CRC, OneWire, NeoPixel, Chart Scroll and map_value Loops',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': ['micropython'],
+        'category': 'Utility',
+        'pins': 'None',
+        'test_code': '''
+# Test Fast Loops (onewire, neopixel, oled_charts and utils use them when installed)
+import fast_loops
+from array import array
+
+scratchpad = bytearray(b"\\x91\\x01\\x4b\\x46\\x7f\\xff\\x0f\\x10\\x00")
+print(f"CRC-8: 0x{fast_loops.crc8(scratchpad):02X}")
+pixels = bytearray(3 * 8)
+fast_loops.fill_grb(pixels, 8, 255, 0, 0)
+print(f"First pixel (GRB): {list(pixels[:3])}")
+print(f"Mapped: {list(fast_loops.map_values(array('H', (0, 2048, 4095)), array('H', (0, 0, 0)), 0, 4095, 0, 100))}")
+print("Fast loops test complete!")
 '''
     },
     'utils': {
         'description': 'Utility Functions',
-        'size': '3.3KB',
+        'version': '1.0.0',
+        'requires': [],
+        'firmware': [],
         'category': 'Utility',
         'pins': 'None',
         'test_code': '''
@@ -175,6 +454,257 @@ print(f"Constrained: {constrained}")
     }
 }
 
+def _sha256_file(path):
+    """Return the SHA-256 hex digest of a file"""
+    with open(path, "rb") as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _mpy_cross_command():
+    """Find mpy-cross as an executable or an installed Python module"""
+    exe = shutil.which("mpy-cross")
+    if exe:
+        return [exe]
+    try:
+        import mpy_cross  # noqa: F401
+        return [sys.executable, "-m", "mpy_cross"]
+    except ImportError:
+        return None
+
+def measure_mpy_size(file_path, mpy_cross=None):
+    """Compile a library with mpy-cross and return the .mpy size (None if unavailable)"""
+    mpy_cross = mpy_cross or _mpy_cross_command()
+    if not mpy_cross:
+        return None
+    
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        out_path = os.path.join(tmp_dir, "out.mpy")
+        result = subprocess.run(mpy_cross + ["-o", out_path, file_path],
+                                capture_output=True, text=True, timeout=30)
+        if result.returncode != 0 or not os.path.exists(out_path):
+            return None
+        return os.path.getsize(out_path)
+
+def build_native(names=NATIVE_LIBRARIES, arch=NATIVE_ARCH):
+    """Compile libraries to .mpy with machine code for their @native/@viper functions"""
+    mpy_cross = _mpy_cross_command()
+    if not mpy_cross:
+        print("❌ mpy-cross not found (pip install mpy-cross)")
+        return []
+    
+    os.makedirs(NATIVE_BUILD_FOLDER, exist_ok=True)
+    built = []
+    for name in names:
+        source = os.path.join(LIBRARIES_FOLDER, f"{name}.py")
+        target = os.path.join(NATIVE_BUILD_FOLDER, f"{name}.mpy")
+        result = subprocess.run(mpy_cross + [f"-march={arch}", "-O2", "-o", target, source],
+                                capture_output=True, text=True, timeout=30)
+        if result.returncode != 0:
+            print(f"❌ {name}: {result.stderr.strip() or 'mpy-cross failed'}")
+            continue
+        print(f"✅ {target} ({format_size(os.path.getsize(source))} source -> "
+              f"{format_size(os.path.getsize(target))}, {arch})")
+        built.append(target)
+    return built
+
+def install_native(port=DEFAULT_PORT, arch=NATIVE_ARCH):
+    """Build the native .mpy files and put them on the board in place of the .py files"""
+    built = build_native(arch=arch)
+    if not built:
+        return False
+    
+    failed = 0
+    for target in built:
+        name = os.path.splitext(os.path.basename(target))[0]
+        if not send_file(target, f"{name}.mpy", port):
+            failed += 1
+            continue
+        # The board imports a .py ahead of a .mpy of the same name
+        script = f"import os\ntry:\n    os.remove('{name}.py')\nexcept OSError:\n    pass\n"
+        subprocess.run([sys.executable, "-m", "mpremote", "connect", port, "exec", script],
+                       capture_output=True, text=True, timeout=30)
+        print(f"✅ {name}.mpy installed")
+    return failed == 0
+
+def load_manifest():
+    """Load the cached manifest (empty if it has not been built yet)"""
+    if not os.path.exists(MANIFEST_FILE):
+        return {}
+    try:
+        with open(MANIFEST_FILE) as f:
+            return json.load(f).get("libraries", {})
+    except (OSError, ValueError):
+        return {}
+
+def build_manifest(write=True):
+    """Measure every library and return the manifest, reusing cached .mpy sizes"""
+    cached = load_manifest()
+    mpy_cross = _mpy_cross_command()
+    manifest = {}
+    
+    for lib_name, lib_info in sorted(LIBRARIES.items()):
+        file_path = os.path.join(LIBRARIES_FOLDER, f"{lib_name}.py")
+        if not os.path.exists(file_path):
+            continue
+        
+        digest = _sha256_file(file_path)
+        previous = cached.get(lib_name, {})
+        if previous.get("sha256") == digest and previous.get("mpy_size") is not None:
+            mpy_size = previous["mpy_size"]
+        else:
+            mpy_size = measure_mpy_size(file_path, mpy_cross)
+        
+        manifest[lib_name] = {
+            "version": lib_info["version"],
+            "file": f"{lib_name}.py",
+            "sha256": digest,
+            "source_size": os.path.getsize(file_path),
+            "mpy_size": mpy_size,
+            "requires": list(lib_info["requires"]),
+            "firmware": list(lib_info["firmware"]),
+        }
+    
+    if write:
+        with open(MANIFEST_FILE, "w") as f:
+            json.dump({"libraries": manifest}, f, indent=2, sort_keys=True)
+            f.write("\n")
+    return manifest
+
+def resolve_dependencies(library_names):
+    """Return the libraries needed for library_names, dependencies first"""
+    ordered = []
+    visiting = set()
+    
+    def visit(name, chain):
+        if name in ordered:
+            return
+        if name not in LIBRARIES:
+            raise ValueError(f"Unknown library '{name}'" + (f" (required by {chain[-1]})" if chain else ""))
+        if name in visiting:
+            raise ValueError("Dependency cycle: " + " -> ".join(chain + [name]))
+        visiting.add(name)
+        for dep in LIBRARIES[name]["requires"]:
+            visit(dep, chain + [name])
+        visiting.discard(name)
+        ordered.append(name)
+    
+    for name in library_names:
+        visit(name, [])
+    return ordered
+
+def format_size(num_bytes):
+    """Human readable size like the README uses (e.g. 923B, 4.8KB)"""
+    if num_bytes is None:
+        return "n/a"
+    if num_bytes < 1024:
+        return f"{num_bytes}B"
+    return f"{num_bytes / 1024:.1f}KB"
+
+# Runs on the board: report the hash of each requested file and which
+# firmware modules are missing, in one round trip.
+BOARD_STATE_SCRIPT = """
+import hashlib, binascii, json
+def _state(files, modules):
+    hashes = {{}}
+    for name in files:
+        try:
+            h = hashlib.sha256()
+            buf = bytearray(512)
+            with open(name, 'rb') as f:
+                while True:
+                    n = f.readinto(buf)
+                    if not n:
+                        break
+                    h.update(memoryview(buf)[:n])
+            hashes[name] = binascii.hexlify(h.digest()).decode()
+        except OSError:
+            pass
+    missing = []
+    for mod in modules:
+        try:
+            __import__(mod)
+        except ImportError:
+            missing.append(mod)
+    print('STATE', json.dumps({{'files': hashes, 'missing': missing}}))
+_state({files!r}, {modules!r})
+del _state
+"""
+
+def query_board_state(files, modules, port=DEFAULT_PORT):
+    """Return (file hashes, missing firmware modules) from the board"""
+    script = BOARD_STATE_SCRIPT.format(files=list(files), modules=list(modules))
+    cmd = [sys.executable, "-m", "mpremote", "connect", port, "exec", script]
+    result = subprocess.run(cmd, capture_output=True, text=True, timeout=30)
+    if result.returncode != 0:
+        raise RuntimeError(result.stderr.strip() or "could not query board")
+    for line in result.stdout.splitlines():
+        if line.startswith("STATE "):
+            state = json.loads(line[6:])
+            return state["files"], state["missing"]
+    raise RuntimeError("no reply from board")
+
+def install(library_names, port=DEFAULT_PORT, force=False, manifest=None):
+    """Install libraries and their dependencies, skipping files already on the board
+
+    Pass a manifest from build_manifest() to skip rebuilding (and rewriting) it,
+    e.g. when several boards install at once.
+    """
+    try:
+        needed = resolve_dependencies(library_names)
+    except ValueError as e:
+        print(f"❌ {e}")
+        return False
+    
+    if manifest is None:
+        manifest = build_manifest()
+    absent = [name for name in needed if name not in manifest]
+    if absent:
+        print(f"❌ Not in {LIBRARIES_FOLDER}/: {', '.join(f'{name}.py' for name in absent)}")
+        return False
+    modules = sorted({mod for name in needed for mod in manifest[name]["firmware"]})
+    
+    print(f"Resolved: {', '.join(needed)}")
+    
+    try:
+        files = [manifest[n]["file"] for n in needed] + [f"{n}.mpy" for n in needed]
+        board_files, missing = query_board_state(files, modules, port)
+    except Exception as e:
+        print(f"❌ Could not read board state on {port}: {e}")
+        return False
+    
+    if missing:
+        print(f"⚠️ Firmware modules missing on board: {', '.join(missing)}")
+    
+    failed = 0
+    for name in needed:
+        entry = manifest[name]
+        if f"{name}.mpy" in board_files:
+            # The board imports a .py ahead of the .mpy, so uploading it would undo install_native
+            print(f"✔️ {name}.mpy on board (update it with: python library_manager.py native {port})")
+            continue
+        if not force and board_files.get(entry["file"]) == entry["sha256"]:
+            print(f"✔️ {name} {entry['version']} already on board")
+            continue
+        if not install_library(name, port):
+            failed += 1
+    
+    return failed == 0
+
+def _library_index(manifest):
+    """README section listing libraries by category with measured sizes"""
+    sections = {}
+    for lib_name, entry in manifest.items():
+        sections.setdefault(LIBRARIES[lib_name]['category'], []).append((lib_name, entry))
+    
+    lines = []
+    for category in sorted(sections):
+        lines.append(f"\n### {category} Libraries:")
+        for lib_name, entry in sections[category]:
+            line = f"- `{entry['file']}` - {LIBRARIES[lib_name]['description']} ({format_size(entry['source_size'])})"
+            if entry['requires']:
+                line += f" - requires {', '.join(entry['requires'])}"
+            lines.append(line)
+    return "\n".join(lines) + "\n"
+
 def setup_libraries_folder():
     """Create and setup the libraries folder"""
     if not os.path.exists(LIBRARIES_FOLDER):
@@ -187,25 +717,7 @@ def setup_libraries_folder():
 This folder contains all MicroPython libraries for ESP32.
 
 ## Available Libraries:
-
-### Display Libraries:
-- `ssd1306.py` - OLED Display Driver (4.8KB)
-- `neopixel.py` - NeoPixel LED Control (923B)
-
-### Sensor Libraries:
-- `dht.py` - DHT Temperature/Humidity Sensor (1.1KB)
-- `ds18x20.py` - DS18B20 Temperature Sensor (1.4KB)
-
-### Motor Control:
-- `servo.py` - Servo Motor Control (778B)
-- `pca9685.py` - PCA9685 PWM Controller (1.8KB)
-
-### Protocol Libraries:
-- `onewire.py` - OneWire Protocol (1.0KB)
-
-### Utility Libraries:
-- `utils.py` - Utility Functions (3.3KB)
-
+""" + _library_index(build_manifest()) + """
 ## Usage:
 
 ### Install Library:
@@ -249,7 +761,11 @@ python library_manager.py install-all
 from machine import Pin, SoftI2C
 import ssd1306
 
-i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
+try:
+    import bus_factory
+    i2c = bus_factory.get_i2c(4, 5)  # hardware I2C at the fastest stable clock
+except ImportError:
+    i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
 oled = ssd1306.SSD1306_I2C(128, 64, i2c)
 oled.text("Hello!", 0, 0)
 oled.show()
@@ -278,32 +794,30 @@ def list_libraries():
         print(f"Libraries folder '{LIBRARIES_FOLDER}' not found!")
         return
     
-    files = os.listdir(LIBRARIES_FOLDER)
-    py_files = [f.replace('.py', '') for f in files if f.endswith('.py')]
+    manifest = build_manifest()
     
     print(f"Available libraries in {LIBRARIES_FOLDER}:")
     print("-" * 50)
     
     categories = {}
-    for lib_name in sorted(py_files):
-        if lib_name in LIBRARIES:
-            lib_info = LIBRARIES[lib_name]
-            category = lib_info['category']
-            if category not in categories:
-                categories[category] = []
-            categories[category].append(lib_name)
+    for lib_name in manifest:
+        category = LIBRARIES[lib_name]['category']
+        if category not in categories:
+            categories[category] = []
+        categories[category].append(lib_name)
     
     for category in sorted(categories.keys()):
         print(f"\n{category} Libraries:")
         for lib_name in categories[category]:
             lib_info = LIBRARIES[lib_name]
-            file_path = os.path.join(LIBRARIES_FOLDER, f"{lib_name}.py")
-            if os.path.exists(file_path):
-                size = os.path.getsize(file_path)
-                print(f"  {lib_name:<15} ({size:>6} bytes) - {lib_info['description']}")
-                print(f"    Pins: {lib_info['pins']}")
+            entry = manifest[lib_name]
+            print(f"  {lib_name:<15} v{entry['version']:<7} "
+                  f"({entry['source_size']:>6} bytes, .mpy {format_size(entry['mpy_size'])}) - {lib_info['description']}")
+            print(f"    Pins: {lib_info['pins']}")
+            if entry['requires'] or entry['firmware']:
+                print(f"    Needs: {', '.join(entry['requires'] + entry['firmware'])}")
     
-    print(f"\nTotal: {len(py_files)} libraries")
+    print(f"\nTotal: {len(manifest)} libraries")
     print(f"Use: python library_manager.py install <library_name>")
 
 def install_library(library_name, port=DEFAULT_PORT):
@@ -315,16 +829,13 @@ def install_library(library_name, port=DEFAULT_PORT):
         return False
     
     try:
-        cmd = f'python -m mpremote connect {port} fs cp "{file_path}" :{library_name}.py'
         print(f"Installing {library_name} to ESP32 on {port}...")
         
-        result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
-        
-        if result.returncode == 0:
+        if send_file(file_path, f"{library_name}.py", port):
             print(f"✅ {library_name} installed successfully!")
             return True
         else:
-            print(f"❌ Failed to install {library_name}: {result.stderr}")
+            print(f"❌ Failed to install {library_name}")
             return False
             
     except Exception as e:
@@ -340,10 +851,10 @@ def test_library(library_name, port=DEFAULT_PORT):
     lib_info = LIBRARIES[library_name]
     test_code = lib_info['test_code'].strip()
     
-    # Create temporary test file
-    test_file = f"test_{library_name}.py"
+    # Create temporary test file (unique so several boards can be tested at once)
+    fd, test_file = tempfile.mkstemp(prefix=f"test_{library_name}_", suffix=".py")
     try:
-        with open(test_file, "w") as f:
+        with os.fdopen(fd, "w") as f:
             f.write(test_code)
         
         print(f"Testing {library_name}...")
@@ -354,6 +865,7 @@ def test_library(library_name, port=DEFAULT_PORT):
         # Upload and run test
         cmd = f'python -m mpremote connect {port} fs cp "{test_file}" :test.py'
         result = subprocess.run(cmd, shell=True, capture_output=True, text=True, timeout=30)
+        passed = False
         
         if result.returncode == 0:
             print("Test uploaded successfully!")
@@ -363,17 +875,20 @@ def test_library(library_name, port=DEFAULT_PORT):
             run_cmd = f'python -m mpremote connect {port} run test.py'
             run_result = subprocess.run(run_cmd, shell=True, capture_output=True, text=True, timeout=30)
             
-            if run_result.returncode == 0:
+            passed = run_result.returncode == 0
+            if passed:
                 print("Test output:")
                 print(run_result.stdout)
                 print("✅ Test completed!")
             else:
                 print("❌ Test failed:")
                 print(run_result.stderr)
+        else:
+            print(f"❌ Upload failed: {result.stderr}")
         
         # Clean up
         os.remove(test_file)
-        return True
+        return passed
         
     except Exception as e:
         print(f"❌ Error testing {library_name}: {e}")
@@ -381,32 +896,115 @@ def test_library(library_name, port=DEFAULT_PORT):
             os.remove(test_file)
         return False
 
-def install_all_libraries(port=DEFAULT_PORT):
+# Wraps each library's test code on the board: runs it in a fresh namespace
+# and reports the on-board run time even when the test raises.
+TEST_WRAPPER = """
+import gc, time
+gc.collect()
+_t0 = time.ticks_us()
+try:
+    exec({code!r}, {{'__name__': '__libtest__'}})
+finally:
+    print('\\n@@US', time.ticks_diff(time.ticks_us(), _t0))
+"""
+
+def _classify_test(stdout, stderr, timed_out):
+    """Turn raw REPL output into (status, device_us, output, error)"""
+    device_us = None
+    lines = []
+    for line in stdout.splitlines():
+        if line.startswith("@@US "):
+            device_us = int(line.split()[1])
+        elif line.strip():
+            lines.append(line.rstrip())
+    
+    error_lines = [l for l in stderr.strip().splitlines() if l.strip()]
+    error = error_lines[-1] if error_lines else None
+    if timed_out:
+        status = "timeout"
+    elif not error_lines:
+        status = "pass"
+    elif error.startswith("AssertionError"):
+        status = "fail"
+    else:
+        status = "exception"
+    return status, device_us, "\n".join(lines), error
+
+def run_all_tests(port=DEFAULT_PORT, library_names=None, timeout=TEST_TIMEOUT, report_path=TEST_REPORT_FILE):
+    """Run every library's test code in one raw REPL session and write a JSON report"""
+    library_names = library_names or sorted(LIBRARIES)
+    results = []
+    started = time.time()
+    
+    print(f"Testing {len(library_names)} libraries on {port} (one session)...")
+    print("-" * 50)
+    
+    try:
+        repl = RawREPL(port)
+    except Exception as e:
+        print(f"❌ Could not open {port}: {e}")
+        return None
+    
+    try:
+        repl.enter()
+        for name in library_names:
+            code = TEST_WRAPPER.format(code=LIBRARIES[name]['test_code'].strip())
+            t0 = time.perf_counter()
+            timed_out = False
+            repl.send(code)
+            try:
+                stdout, stderr = repl.follow(timeout)
+            except RawREPLTimeout as e:
+                timed_out = True
+                stdout, stderr = repl.interrupt()
+                stdout = e.partial.decode(errors="replace") + stdout
+            wall = time.perf_counter() - t0
+            
+            status, device_us, output, error = _classify_test(stdout, stderr, timed_out)
+            results.append({
+                "library": name,
+                "status": status,
+                "wall_s": round(wall, 4),
+                "device_us": device_us,
+                "output": output,
+                "error": error,
+            })
+            icon = "✅" if status == "pass" else "❌"
+            print(f"{icon} {name:<12} {status:<9} {wall * 1000:8.1f} ms" + (f"  {error}" if error else ""))
+    except Exception as e:
+        print(f"❌ Session error on {port}: {e}")
+    finally:
+        repl.close()
+    
+    report = {
+        "port": port,
+        "started": time.strftime("%Y-%m-%dT%H:%M:%S", time.localtime(started)),
+        "total_s": round(time.time() - started, 3),
+        "passed": sum(1 for r in results if r["status"] == "pass"),
+        "total": len(library_names),
+        "results": results,
+    }
+    
+    print("-" * 50)
+    print(f"📊 {report['passed']}/{report['total']} passed in {report['total_s']:.1f}s")
+    if report_path:
+        with open(report_path, "w") as f:
+            json.dump(report, f, indent=2)
+        print(f"📄 Report written to {report_path}")
+    return report
+
+def install_all_libraries(port=DEFAULT_PORT, manifest=None):
     """Install all libraries to ESP32"""
     print("Installing all libraries to ESP32...")
     print("=" * 50)
     
     if not os.path.exists(LIBRARIES_FOLDER):
         print(f"Libraries folder '{LIBRARIES_FOLDER}' not found!")
-        return
-    
-    files = os.listdir(LIBRARIES_FOLDER)
-    py_files = [f.replace('.py', '') for f in files if f.endswith('.py')]
-    
-    successful = 0
-    failed = 0
-    
-    for lib_name in sorted(py_files):
-        if install_library(lib_name, port):
-            successful += 1
-        else:
-            failed += 1
-        time.sleep(1)  # Small delay between installations
+        return False
     
-    print(f"\nInstallation Summary:")
-    print(f"✅ Successful: {successful}")
-    print(f"❌ Failed: {failed}")
-    print(f"📦 Total: {len(py_files)}")
+    if manifest is None:
+        manifest = build_manifest(write=False)
+    return install(sorted(manifest), port, manifest=manifest)
 
 def create_test_script():
     """Create a comprehensive test script"""
@@ -503,10 +1101,13 @@ def main():
         print("=" * 40)
         print("Usage:")
         print("  python library_manager.py list                    - List all libraries")
-        print("  python library_manager.py install <library>      - Install specific library")
+        print("  python library_manager.py install <library>...   - Install libraries and their dependencies")
         print("  python library_manager.py install-all            - Install all libraries")
+        print("  python library_manager.py manifest               - Rebuild manifest.json (sizes, hashes, deps)")
+        print("  python library_manager.py native [port]          - Build fast_loops.mpy for xtensawin (--arch=...); install if port given")
         print("  python library_manager.py test <library>         - Test specific library")
-        print("  python library_manager.py test-all               - Test all libraries")
+        print("  python library_manager.py test-all [port]        - Test all libraries in one session (JSON report)")
+        print("  python library_manager.py test-script            - Write comprehensive_test.py for manual runs")
         print("  python library_manager.py setup                  - Setup libraries folder")
         return
     
@@ -516,16 +1117,38 @@ def main():
         list_libraries()
     
     elif command == "install":
-        if len(sys.argv) < 3:
+        args = [a for a in sys.argv[2:] if not a.startswith("--")]
+        if not args:
             print("Please specify a library name")
             return
-        library_name = sys.argv[2]
-        port = sys.argv[3] if len(sys.argv) > 3 else DEFAULT_PORT
-        install_library(library_name, port)
+        # Anything that is not a library name is taken as the port
+        names = [a for a in args if a in LIBRARIES]
+        ports = [a for a in args if a not in LIBRARIES]
+        port = ports[0] if ports else DEFAULT_PORT
+        if not install(names or args[:1], port, force="--force" in sys.argv):
+            sys.exit(1)
+    
+    elif command == "manifest":
+        manifest = build_manifest()
+        print(json.dumps(manifest, indent=2, sort_keys=True))
+        print(f"✅ Wrote {MANIFEST_FILE}")
+    
+    elif command == "native":
+        args = [a for a in sys.argv[2:] if not a.startswith("--")]
+        arch = NATIVE_ARCH
+        for a in sys.argv[2:]:
+            if a.startswith("--arch="):
+                arch = a.split("=", 1)[1]
+        if args:
+            if not install_native(args[0], arch):
+                sys.exit(1)
+        elif not build_native(arch=arch):
+            sys.exit(1)
     
     elif command == "install-all":
         port = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PORT
-        install_all_libraries(port)
+        if not install_all_libraries(port):
+            sys.exit(1)
     
     elif command == "test":
         if len(sys.argv) < 3:
@@ -537,6 +1160,11 @@ def main():
     
     elif command == "test-all":
         port = sys.argv[2] if len(sys.argv) > 2 else DEFAULT_PORT
+        report = run_all_tests(port)
+        if not report or report["passed"] != report["total"]:
+            sys.exit(1)
+    
+    elif command == "test-script":
         create_test_script()
         print("Run: python -m mpremote connect COM6 run comprehensive_test.py")
     
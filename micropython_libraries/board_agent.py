@@ -0,0 +1,332 @@
+# Board Agent - Resident Binary Command Server
+# Answers compact binary requests on the USB serial port: pins, ADC reads
+# and bursts, I2C transfers, OLED drawing/blits and PWM. Nothing is compiled
+# per request, so a round trip takes about a millisecond instead of a fresh
+# `mpremote exec`. Requests carry a sequence number and can be pipelined:
+# the host may send many before reading the replies, which come back in order.
+#
+#     import board_agent
+#     board_agent.run()        # until the host sends EXIT
+#
+# Frames, both directions, little-endian:
+#     sync u8 | opcode or status u8 | seq u16 | length u32 | payload
+# Requests start with 0xA5 and carry an opcode. Replies start with 0x5A and
+# carry a status: 0 for success, otherwise an error code with the message as
+# the payload. The host side is the boardlink package (boardlink/protocol.py
+# must match the constants below).
+
+import struct
+import sys
+import time
+import micropython
+from machine import ADC, PWM, Pin, SoftI2C
+
+VERSION = 1
+REQUEST_SYNC = 0xA5
+REPLY_SYNC = 0x5A
+HEADER = "<BBHI"
+HEADER_SIZE = 8
+MAX_PAYLOAD = 2048
+READY = "@@AGENT ready"
+
+# Opcodes
+PING = 0x00
+PIN_MODE = 0x01
+PIN_SET = 0x02
+PIN_GET = 0x03
+ADC_READ = 0x10
+ADC_BURST = 0x11
+I2C_CONFIG = 0x20
+I2C_SCAN = 0x21
+I2C_WRITE = 0x22
+I2C_READ = 0x23
+I2C_WRITE_READ = 0x24
+OLED_INIT = 0x30
+OLED_FILL = 0x31
+OLED_PIXEL = 0x32
+OLED_LINE = 0x33
+OLED_RECT = 0x34
+OLED_TEXT = 0x35
+OLED_BLIT = 0x36
+OLED_SHOW = 0x37
+PWM_SET = 0x40
+PWM_STOP = 0x41
+EXIT = 0x7F
+
+# Reply status codes
+OK = 0
+E_UNKNOWN = 1  # no such opcode
+E_ARGS = 2     # payload too short or values out of range
+E_IO = 3       # OSError from the peripheral (e.g. no I2C ACK)
+E_STATE = 4    # needs I2C_CONFIG / OLED_INIT first
+E_TOO_BIG = 5  # payload larger than MAX_PAYLOAD
+
+PIN_MODES = {0: (Pin.IN, None), 1: (Pin.OUT, None), 2: (Pin.IN, Pin.PULL_UP),
+             3: (Pin.IN, Pin.PULL_DOWN), 4: (Pin.OPEN_DRAIN, None)}
+
+HANDLERS = {}
+
+_state = {"pins": {}, "adcs": {}, "pwms": {}, "i2c": None, "oled": None,
+          "burst": bytearray(0), "running": False}
+
+
+def handler(opcode):
+    """Register a function(payload) -> reply bytes (or None) for an opcode"""
+    def register(func):
+        HANDLERS[opcode] = func
+        return func
+    return register
+
+
+def _pin(number):
+    pin = _state["pins"].get(number)
+    if pin is None:
+        pin = _state["pins"][number] = Pin(number)
+    return pin
+
+
+def _adc(number):
+    adc = _state["adcs"].get(number)
+    if adc is None:
+        adc = _state["adcs"][number] = ADC(Pin(number), atten=ADC.ATTN_11DB)
+    return adc
+
+
+def _i2c():
+    if _state["i2c"] is None:
+        raise RuntimeError("no I2C bus: send I2C_CONFIG first")
+    return _state["i2c"]
+
+
+def _oled():
+    if _state["oled"] is None:
+        raise RuntimeError("no display: send OLED_INIT first")
+    return _state["oled"]
+
+
+# ---- handlers ----
+
+@handler(PING)
+def _ping(payload):
+    return struct.pack("<B", VERSION) + bytes(payload)
+
+
+@handler(PIN_MODE)
+def _pin_mode(payload):
+    number, mode = struct.unpack_from("<BB", payload)
+    direction, pull = PIN_MODES[mode]
+    _state["pins"][number] = Pin(number, direction, pull)
+
+
+@handler(PIN_SET)
+def _pin_set(payload):
+    number, value = struct.unpack_from("<BB", payload)
+    _pin(number).value(value)
+
+
+@handler(PIN_GET)
+def _pin_get(payload):
+    return struct.pack("<B", _pin(payload[0]).value())
+
+
+@handler(ADC_READ)
+def _adc_read(payload):
+    return struct.pack("<H", _adc(payload[0]).read_u16())
+
+
+@handler(ADC_BURST)
+def _adc_burst(payload):
+    number, count, interval_us = struct.unpack_from("<BHI", payload)
+    adc = _adc(number)
+    if len(_state["burst"]) < 2 * count:
+        _state["burst"] = bytearray(2 * count)  # grows once, then reused
+    samples = memoryview(_state["burst"])[:2 * count]
+    due = time.ticks_us()
+    for i in range(count):
+        if interval_us:
+            while time.ticks_diff(due, time.ticks_us()) > 0:
+                pass
+            due = time.ticks_add(due, interval_us)
+        struct.pack_into("<H", samples, 2 * i, adc.read_u16())
+    return samples
+
+
+@handler(I2C_CONFIG)
+def _i2c_config(payload):
+    sda, scl, freq = struct.unpack_from("<BBI", payload)
+    if freq:
+        _state["i2c"] = SoftI2C(sda=Pin(sda), scl=Pin(scl), freq=freq)
+        return struct.pack("<I", freq)
+    try:
+        import bus_factory
+    except ImportError:
+        _state["i2c"] = SoftI2C(sda=Pin(sda), scl=Pin(scl), freq=400000)
+        return struct.pack("<I", 400000)
+    _state["i2c"] = bus_factory.get_i2c(sda, scl)
+    return struct.pack("<I", bus_factory.info(sda, scl)["freq"])
+
+
+@handler(I2C_SCAN)
+def _i2c_scan(payload):
+    return bytes(_i2c().scan())
+
+
+@handler(I2C_WRITE)
+def _i2c_write(payload):
+    _i2c().writeto(payload[0], payload[1:])
+
+
+@handler(I2C_READ)
+def _i2c_read(payload):
+    addr, n = struct.unpack_from("<BH", payload)
+    return _i2c().readfrom(addr, n)
+
+
+@handler(I2C_WRITE_READ)
+def _i2c_write_read(payload):
+    addr, n = struct.unpack_from("<BH", payload)
+    i2c = _i2c()
+    i2c.writeto(addr, payload[3:], False)  # repeated start, e.g. a register pointer
+    return i2c.readfrom(addr, n)
+
+
+@handler(OLED_INIT)
+def _oled_init(payload):
+    import ssd1306
+    width, height, addr = struct.unpack_from("<BBB", payload)
+    _state["oled"] = ssd1306.SSD1306_I2C(width, height, _i2c(), addr)
+
+
+@handler(OLED_FILL)
+def _oled_fill(payload):
+    _oled().fill(payload[0])
+
+
+@handler(OLED_PIXEL)
+def _oled_pixel(payload):
+    x, y, color = struct.unpack_from("<hhB", payload)
+    _oled().pixel(x, y, color)
+
+
+@handler(OLED_LINE)
+def _oled_line(payload):
+    x1, y1, x2, y2, color = struct.unpack_from("<hhhhB", payload)
+    _oled().line(x1, y1, x2, y2, color)
+
+
+@handler(OLED_RECT)
+def _oled_rect(payload):
+    x, y, w, h, color, filled = struct.unpack_from("<hhhhBB", payload)
+    if filled:
+        _oled().fill_rect(x, y, w, h, color)
+    else:
+        _oled().rect(x, y, w, h, color)
+
+
+@handler(OLED_TEXT)
+def _oled_text(payload):
+    x, y, color = struct.unpack_from("<hhB", payload)
+    _oled().text(bytes(payload[5:]).decode(), x, y, color)
+
+
+@handler(OLED_BLIT)
+def _oled_blit(payload):
+    oled = _oled()
+    if len(payload) != len(oled.buffer):
+        raise ValueError("frame must be %d bytes" % len(oled.buffer))
+    oled.buffer[:] = payload
+    oled.show()
+
+
+@handler(OLED_SHOW)
+def _oled_show(payload):
+    _oled().show()
+
+
+@handler(PWM_SET)
+def _pwm_set(payload):
+    number, freq, duty = struct.unpack_from("<BIH", payload)
+    pwm = _state["pwms"].get(number)
+    if pwm is None:
+        pwm = _state["pwms"][number] = PWM(Pin(number), freq=freq, duty_u16=duty)
+    else:
+        pwm.freq(freq)
+        pwm.duty_u16(duty)
+
+
+@handler(PWM_STOP)
+def _pwm_stop(payload):
+    pwm = _state["pwms"].pop(payload[0], None)
+    if pwm:
+        pwm.deinit()
+
+
+@handler(EXIT)
+def _exit(payload):
+    _state["running"] = False
+
+
+# ---- serving ----
+
+def _read_into(stream, view):
+    got = 0
+    while got < len(view):
+        n = stream.readinto(view[got:])
+        if n:
+            got += n
+    return got
+
+
+def _reply(stream, header, status, seq, data):
+    length = len(data) if data else 0
+    struct.pack_into(HEADER, header, 0, REPLY_SYNC, status, seq, length)
+    stream.write(header)
+    if length:
+        stream.write(data)
+
+
+def dispatch(opcode, payload):
+    """(status, reply payload) for one request"""
+    func = HANDLERS.get(opcode)
+    if func is None:
+        return E_UNKNOWN, b"unknown opcode"
+    try:
+        return OK, func(payload)
+    except OSError as e:
+        return E_IO, str(e).encode()
+    except RuntimeError as e:
+        return E_STATE, str(e).encode()
+    except Exception as e:
+        return E_ARGS, str(e).encode()
+
+
+def run(stream_in=None, stream_out=None):
+    """Serve requests until EXIT"""
+    rx = stream_in or sys.stdin.buffer
+    tx = stream_out or sys.stdout.buffer
+    header = bytearray(HEADER_SIZE)
+    head = memoryview(header)
+    reply = bytearray(HEADER_SIZE)
+    payload = memoryview(bytearray(MAX_PAYLOAD))
+
+    micropython.kbd_intr(-1)  # a 0x03 byte in a payload must not raise KeyboardInterrupt
+    print(READY, VERSION)
+    _state["running"] = True
+    try:
+        while _state["running"]:
+            # Skip anything before the sync byte (e.g. a stray newline)
+            _read_into(rx, head[:1])
+            if header[0] != REQUEST_SYNC:
+                continue
+            _read_into(rx, head[1:])
+            _sync, opcode, seq, length = struct.unpack(HEADER, header)
+            if length > MAX_PAYLOAD:
+                while length:
+                    length -= _read_into(rx, payload[:min(length, MAX_PAYLOAD)])
+                _reply(tx, reply, E_TOO_BIG, seq, b"payload too big")
+                continue
+            _read_into(rx, payload[:length])
+            status, data = dispatch(opcode, payload[:length])
+            _reply(tx, reply, status, seq, data)
+    finally:
+        micropython.kbd_intr(3)
@@ -0,0 +1,165 @@
+# I2C Bus Factory
+# One shared bus object per SDA/SCL pair. Hardware I2C is preferred (the
+# ESP32 has two controllers) and runs at the fastest clock at which every
+# device's reads still match a 100 kHz reference read. SoftI2C is used when no controller is
+# free, the hardware bus can't be set up on those pins, or its reads never match while
+# SoftI2C's do.
+#
+#     import bus_factory
+#     i2c = bus_factory.get_i2c(21, 22)    # or get_i2c() for the discovered pins
+#     bus_factory.report()
+
+import time
+from machine import Pin, I2C, SoftI2C
+
+HARDWARE_IDS = (0, 1)
+FREQS = (1000000, 800000, 400000, 100000)  # fastest first
+REFERENCE_FREQ = 100000
+DEFAULT_FREQ = 400000  # when nothing on the bus can confirm a faster clock
+CHECK_BYTES = 8
+CHECK_READS = 3
+MEASURE_READS = 10
+
+_buses = {}  # (sda, scl) -> (i2c, info)
+
+
+def _make(hw_id, sda, scl, freq):
+    if hw_id is None:
+        return SoftI2C(sda=Pin(sda), scl=Pin(scl), freq=freq)
+    return I2C(hw_id, sda=Pin(sda), scl=Pin(scl), freq=freq)
+
+
+def _free_hardware_id():
+    used = [info["id"] for _i2c, info in _buses.values()]
+    for hw_id in HARDWARE_IDS:
+        if hw_id not in used:
+            return hw_id
+    return None
+
+
+def _read(i2c, addr):
+    return i2c.readfrom_mem(addr, 0x00, CHECK_BYTES)
+
+
+def _reference(i2c, addr):
+    """Bytes to compare against at higher clocks; None if the part's data keeps changing"""
+    first = _read(i2c, addr)
+    return first if _read(i2c, addr) == first else None
+
+
+def _stable(i2c, addr, reference):
+    try:
+        for _ in range(CHECK_READS):
+            if reference is None:
+                i2c.writeto(addr, b"")  # volatile registers: the ACK is all we can check
+            elif _read(i2c, addr) != reference:
+                return False
+        return True
+    except OSError:
+        return False
+
+
+def measure(i2c, addr):
+    """Read throughput in bytes/s (register reads of 32 bytes)"""
+    buf = bytearray(32)
+    start = time.ticks_us()
+    for _ in range(MEASURE_READS):
+        i2c.readfrom_mem_into(addr, 0x00, buf)
+    elapsed = max(time.ticks_diff(time.ticks_us(), start), 1)
+    return len(buf) * MEASURE_READS * 1000000 // elapsed
+
+
+def _tune(hw_id, sda, scl):
+    """(i2c, info) at the highest stable clock for this controller"""
+    i2c = _make(hw_id, sda, scl, REFERENCE_FREQ)
+    devices = i2c.scan()
+    info = {"type": "soft" if hw_id is None else "hardware", "id": hw_id, "sda": sda, "scl": scl,
+            "freq": DEFAULT_FREQ, "verified": False, "devices": devices, "bytes_per_s": None}
+    if not devices:
+        return _make(hw_id, sda, scl, DEFAULT_FREQ), info
+    # Every device on the bus has to keep up, so the slowest one sets the clock
+    references = {}
+    for addr in devices:
+        try:
+            references[addr] = _reference(i2c, addr)
+        except OSError:
+            references[addr] = None
+    for freq in FREQS:
+        candidate = _make(hw_id, sda, scl, freq)
+        if all(_stable(candidate, addr, references[addr]) for addr in devices):
+            info["freq"] = freq
+            info["verified"] = True
+            info["bytes_per_s"] = measure(candidate, devices[0])
+            return candidate, info
+    info["freq"] = REFERENCE_FREQ  # nothing faster held up: keep the reference bus
+    return i2c, info
+
+
+def _deinit(i2c):
+    try:
+        i2c.deinit()
+    except AttributeError:
+        pass
+
+
+def get_i2c(sda=None, scl=None):
+    """The shared bus for these pins (default: the pins i2c_discovery found)"""
+    if sda is None or scl is None:
+        import i2c_discovery
+        config, _i2c = i2c_discovery.discover()
+        if config is None:
+            raise OSError(19, "no I2C devices found on any candidate pins")
+        sda, scl = config["sda"], config["scl"]
+    key = (sda, scl)
+    if key in _buses:
+        return _buses[key][0]
+
+    hw_id = _free_hardware_id()
+    bus = None
+    if hw_id is not None:
+        try:
+            bus = _tune(hw_id, sda, scl)
+        except (ValueError, OSError):
+            bus = None
+    if bus is not None and bus[1]["devices"] and not bus[1]["verified"]:
+        # Devices answer but no clock read back cleanly on the controller:
+        # SoftI2C may still manage, so try it before settling
+        soft = _tune(None, sda, scl)
+        if soft[1]["verified"]:
+            _deinit(bus[0])
+            bus = soft
+    if bus is None:
+        bus = _tune(None, sda, scl)
+    _buses[key] = bus
+    return bus[0]
+
+
+def info(sda, scl):
+    """How the bus on these pins was set up (type, id, freq, verified, bytes_per_s...)"""
+    get_i2c(sda, scl)
+    return _buses[(sda, scl)][1]
+
+
+def release(sda, scl):
+    """Forget a bus and give its hardware controller back"""
+    bus = _buses.pop((sda, scl), None)
+    if bus and bus[1]["type"] == "hardware":
+        _deinit(bus[0])
+
+
+def describe(sda, scl):
+    bus = info(sda, scl)
+    kind = f"I2C({bus['id']})" if bus["type"] == "hardware" else "SoftI2C"
+    speed = f", {bus['bytes_per_s'] // 1000} KB/s" if bus["bytes_per_s"] else ""
+    if bus["verified"]:
+        check = ""
+    elif bus["devices"]:
+        check = " (unverified: reads did not match at any clock)"
+    else:
+        check = " (unverified: no device to check)"
+    return f"{kind} SDA={sda} SCL={scl} @ {bus['freq'] // 1000} kHz{speed}{check}"
+
+
+def report():
+    for sda, scl in _buses:
+        print(f"🚌 {describe(sda, scl)}")
@@ -37,6 +37,14 @@ class DHT11(DHTBase):
 
 
 class DHT22(DHTBase):
+    # The *_raw readings are ints in tenths (no float to allocate)
+    def humidity_raw(self):
+        return self.buf[0] << 8 | self.buf[1]
+
+    def temperature_raw(self):
+        t = (self.buf[2] & 0x7F) << 8 | self.buf[3]
+        return -t if self.buf[2] & 0x80 else t
+
     def humidity(self):
         return (self.buf[0] << 8 | self.buf[1]) * 0.1
 
@@ -0,0 +1,218 @@
+# Display Manager
+# Runs several SSD1306 panels on one I2C bus: two at 0x3C and 0x3D, or any
+# number behind a TCA9548A switch. Drawing code marks the pages it changed.
+# tick() sends the dirty pages round-robin, a few pages per panel per turn,
+# and stops once the per-tick bus-time budget is spent. A full-screen redraw
+# on one panel can't hold up the others, and the main loop gets the bus back
+# on time. Each panel keeps frame-rate and latency stats.
+#
+#     import display_manager
+#     displays = display_manager.DisplayManager(i2c, budget_us=10000)
+#     left = displays.open("left", addr=0x3C)
+#     right = displays.open("right", addr=0x3D)   # or channel=n behind a switch
+#     left.text("CPU 42%", 0, 0)
+#     displays.mark_rows("left", 0, 8)
+#     displays.tick()                             # once per pass of the main loop
+#     displays.report()
+#
+# Panels on the main bus stay reachable whichever switch channel is on, so
+# their addresses must differ from the ones behind the switch.
+
+import time
+
+MUX_ADDR = 0x70  # TCA9548A with A0-A2 low
+
+
+class Panel:
+    """One display and its flush state"""
+
+    def __init__(self, name, oled, channel):
+        self.name = name
+        self.oled = oled
+        self.channel = channel
+        self.dirty = 0          # bit n set: page n waits to be sent
+        self.marked_at = None   # ticks_us of the oldest change not yet on screen
+        self.reset_stats()
+
+    def reset_stats(self):
+        self.frames = 0
+        self.pages_sent = 0
+        self.busy_us = 0
+        self.latency_us = 0     # mark to on-screen time of the last frame
+        self.worst_us = 0
+        self.since = time.ticks_ms()
+
+
+class DisplayManager:
+    """Owns the bus and shares its time between the panels on it"""
+
+    def __init__(self, i2c, budget_us=8000, chunk=2, mux_addr=None):
+        self.i2c = i2c
+        self.budget_us = budget_us
+        self.chunk = chunk          # most pages one panel sends per turn
+        self.mux_addr = mux_addr
+        self.panels = []
+        self.by_name = {}
+        self.next = 0               # panel that goes first on the next tick
+        self.channel = None         # switch channel currently on
+        self.page_us = 0            # running estimate of one page's bus time
+        self._select_buf = bytearray(1)
+        self.ticks = 0
+        self.over_budget = 0
+
+    # ---- panels ----
+
+    def add(self, name, oled, channel=None):
+        """Manage a display that already exists; channel is its switch channel"""
+        if channel is not None and self.mux_addr is None:
+            self.mux_addr = MUX_ADDR
+        panel = Panel(name, oled, channel)
+        self.panels.append(panel)
+        self.by_name[name] = panel
+        return oled
+
+    def open(self, name, width=128, height=64, addr=0x3C, channel=None):
+        """Build an SSD1306_I2C on the bus (through switch channel if given) and add it"""
+        import ssd1306
+        if channel is not None and self.mux_addr is None:
+            self.mux_addr = MUX_ADDR
+        self._select(channel)  # the init sequence has to reach the panel
+        return self.add(name, ssd1306.SSD1306_I2C(width, height, self.i2c, addr), channel)
+
+    def __getitem__(self, name):
+        return self.by_name[name].oled
+
+    def _select(self, channel):
+        if channel is None or channel == self.channel:
+            return
+        self._select_buf[0] = 1 << channel
+        self.i2c.writeto(self.mux_addr, self._select_buf)
+        self.channel = channel
+
+    # ---- dirty regions ----
+
+    def mark(self, name, first_page=0, last_page=None):
+        """Queue pages first_page..last_page (default: all) of a panel for sending"""
+        panel = self.by_name[name]
+        if last_page is None:
+            last_page = panel.oled.pages - 1
+        for page in range(first_page, last_page + 1):
+            panel.dirty |= 1 << page
+        if panel.marked_at is None:
+            panel.marked_at = time.ticks_us()
+
+    def mark_rows(self, name, y, h):
+        """Queue the pages covering pixel rows y..y+h-1"""
+        self.mark(name, y // 8, (y + h - 1) // 8)
+
+    def pending(self):
+        """Pages still waiting across all panels"""
+        total = 0
+        for panel in self.panels:
+            dirty = panel.dirty
+            while dirty:
+                total += dirty & 1
+                dirty >>= 1
+        return total
+
+    # ---- flushing ----
+
+    def _flush(self, panel, limit):
+        """Send the lowest run of dirty pages (at most limit); returns the page count"""
+        dirty = panel.dirty
+        first = 0
+        while not dirty >> first & 1:
+            first += 1
+        last = first
+        while last - first + 1 < limit and dirty >> (last + 1) & 1:
+            last += 1
+        start = time.ticks_us()
+        self._select(panel.channel)
+        panel.oled.show(first, last)
+        now = time.ticks_us()
+        spent = time.ticks_diff(now, start)
+        pages = last - first + 1
+        for page in range(first, last + 1):
+            panel.dirty &= ~(1 << page)
+        panel.pages_sent += pages
+        panel.busy_us += spent
+        each = spent // pages
+        self.page_us = each if not self.page_us else (self.page_us * 3 + each) // 4
+        if not panel.dirty:
+            panel.frames += 1
+            panel.latency_us = time.ticks_diff(now, panel.marked_at)
+            if panel.latency_us > panel.worst_us:
+                panel.worst_us = panel.latency_us
+            panel.marked_at = None
+        return pages
+
+    def tick(self, budget_us=None):
+        """Send dirty pages round-robin until the budget is spent; returns pages sent
+
+        Each run is cut to the pages the remaining budget covers at the
+        measured time per page. At least one page goes out per call, so a
+        budget smaller than one page still makes progress.
+        """
+        budget = self.budget_us if budget_us is None else budget_us
+        count = len(self.panels)
+        start = time.ticks_us()
+        sent = 0
+        idle = 0   # panels in a row with nothing to send
+        i = self.next
+        while count and idle < count:
+            panel = self.panels[i % count]
+            if not panel.dirty:
+                idle += 1
+                i += 1
+                continue
+            limit = self.chunk
+            if self.page_us:
+                limit = min(limit, (budget - time.ticks_diff(time.ticks_us(), start)) // self.page_us)
+            if limit < 1:
+                if sent:
+                    break  # this panel goes first next tick
+                limit = 1
+            idle = 0
+            sent += self._flush(panel, limit)
+            i += 1
+        if count:
+            self.next = i % count
+        self.ticks += 1
+        if time.ticks_diff(time.ticks_us(), start) > budget:
+            self.over_budget += 1
+        return sent
+
+    def flush(self):
+        """Send everything now, ignoring the budget"""
+        while self.pending():
+            self.tick(1 << 30)
+
+    # ---- stats ----
+
+    def reset_stats(self):
+        for panel in self.panels:
+            panel.reset_stats()
+        self.ticks = 0
+        self.over_budget = 0
+
+    def stats(self, name=None):
+        """Per-panel fps, latency and bus time; one dict, or {name: dict} for all panels"""
+        if name is None:
+            return {panel.name: self.stats(panel.name) for panel in self.panels}
+        panel = self.by_name[name]
+        elapsed = max(time.ticks_diff(time.ticks_ms(), panel.since), 1)
+        return {
+            "fps": panel.frames * 1000 / elapsed,
+            "frames": panel.frames,
+            "pages": panel.pages_sent,
+            "bus_share": panel.busy_us / (elapsed * 10),  # percent of wall time
+            "latency_ms": panel.latency_us / 1000,
+            "worst_ms": panel.worst_us / 1000,
+            "pending": panel.dirty != 0,
+        }
+
+    def report(self):
+        for name, s in self.stats().items():
+            print(f"🖥️  {name}: {s['fps']:.1f} fps, {s['pages']} pages, {s['bus_share']:.0f}% of the bus, "
+                  f"latency {s['latency_ms']:.1f} ms (worst {s['worst_ms']:.1f} ms)")
+        print(f"   {self.ticks} ticks, {self.over_budget} over the {self.budget_us} us budget")
@@ -0,0 +1,157 @@
+# Driver Pool
+# Keeps bus, display and frame buffer objects alive for reuse instead of
+# building new ones each time a script probes or re-initialises hardware.
+# Asking again for the same display sends it the init sequence again but
+# allocates nothing. A display that fails to start hands its frame buffer
+# back to be reused by the next attempt. On a long-running board the heap
+# stops filling with dead 1 KB buffers that fragment it until an allocation
+# fails.
+#
+#     import driver_pool
+#     i2c = driver_pool.i2c(13, 15)
+#     oled = driver_pool.display(128, 64, i2c)             # same object next time
+#     left = driver_pool.display(128, 64, bus_a, shared=True)
+#     right = driver_pool.display(128, 64, bus_b, shared=True)  # one render buffer
+#     driver_pool.report()
+#
+# Shared panels draw into one buffer: draw and show one panel before
+# drawing the next. For a bus tuned to its fastest clock, use bus_factory.
+
+import gc
+from machine import Pin, I2C, SoftI2C
+
+DEFAULT_FREQ = 400000
+
+_buses = {}     # ("soft", sda, scl) or ("hw", id) -> (bus, (sda, scl, freq))
+_displays = {}  # (id(bus), addr, width, height, cls, shared) -> driver
+_shared = {}    # (size, name) -> bytearray drawn into by several displays
+_free = {}      # size -> [bytearray] waiting for a display
+_stats = {"allocated": 0, "allocated_bytes": 0, "reused": 0}
+
+
+def i2c(sda, scl, freq=DEFAULT_FREQ, hw_id=None):
+    """The bus on these pins: SoftI2C, or hardware controller hw_id"""
+    key = ("soft", sda, scl) if hw_id is None else ("hw", hw_id)
+    settings = (sda, scl, freq)
+    entry = _buses.get(key)
+    if entry and entry[1] == settings:
+        _stats["reused"] += 1
+        return entry[0]
+    # A hardware controller moved to other pins is set up again; on the ESP32
+    # I2C(n) hands back the same controller object, so nothing is allocated
+    if hw_id is None:
+        bus = SoftI2C(sda=Pin(sda), scl=Pin(scl), freq=freq)
+    else:
+        bus = I2C(hw_id, sda=Pin(sda), scl=Pin(scl), freq=freq)
+    _buses[key] = (bus, settings)
+    return bus
+
+
+def take(size):
+    """A bytearray of size bytes: a returned one if there is one, else a new one"""
+    spare = _free.get(size)
+    if spare:
+        _stats["reused"] += 1
+        return spare.pop()
+    _stats["allocated"] += 1
+    _stats["allocated_bytes"] += size
+    return bytearray(size)
+
+
+def give(buf):
+    """Hand a buffer from take() back for the next caller"""
+    _free.setdefault(len(buf), []).append(buf)
+
+
+def shared_buffer(size, name="render"):
+    """One bytearray per (size, name) for every caller that asks for it"""
+    key = (size, name)
+    buf = _shared.get(key)
+    if buf is None:
+        buf = _shared[key] = take(size)
+    else:
+        _stats["reused"] += 1
+    return buf
+
+
+def display(width, height, bus, addr=0x3C, shared=False, cls=None):
+    """The display driver at addr on this bus, built once and re-initialised after
+
+    shared=True draws into the render buffer shared by every shared display
+    of the same size. Asking for a pooled display with the other shared
+    setting rebuilds it on the right buffer. cls defaults to
+    ssd1306.SSD1306_I2C; it must take (width, height, i2c, addr, buffer=...).
+    """
+    if cls is None:
+        import ssd1306
+        cls = ssd1306.SSD1306_I2C
+    shared = bool(shared)
+    key = (id(bus), addr, width, height, cls, shared)
+    driver = _displays.get(key)
+    if driver is not None:
+        _stats["reused"] += 1
+        driver.init_display()
+        return driver
+    other = _displays.get(key[:-1] + (not shared,))
+    if other is not None:
+        release(other)  # its own buffer, if any, is reused below
+
+    size = width * ((height + 7) // 8)
+    buf = shared_buffer(size) if shared else take(size)
+    try:
+        driver = cls(width, height, bus, addr, buffer=buf)
+    except Exception:
+        if not shared:
+            give(buf)  # the next attempt (often on other pins) gets it
+        raise
+    _displays[key] = driver
+    return driver
+
+
+def release(driver):
+    """Drop a display from the pool; its own buffer goes back for reuse"""
+    for key, pooled in list(_displays.items()):
+        if pooled is driver:
+            del _displays[key]
+            if not any(buf is driver.buffer for buf in _shared.values()):
+                give(driver.buffer)
+
+
+def clear():
+    """Forget everything (the objects are freed once nothing else holds them)"""
+    _buses.clear()
+    _displays.clear()
+    _shared.clear()
+    _free.clear()
+    gc.collect()
+
+
+def stats():
+    """Counts and bytes held by the pool"""
+    held = [d.buffer for d in _displays.values()] + list(_shared.values())
+    for spare in _free.values():
+        held += spare
+    unique = []
+    for buf in held:
+        if not any(buf is seen for seen in unique):
+            unique.append(buf)
+    return {
+        "buses": len(_buses),
+        "displays": len(_displays),
+        "shared_buffers": len(_shared),
+        "free_buffers": sum(len(spare) for spare in _free.values()),
+        "buffer_bytes": sum(len(buf) for buf in unique),
+        "allocated": _stats["allocated"],
+        "allocated_bytes": _stats["allocated_bytes"],
+        "reused": _stats["reused"],
+        "mem_free": gc.mem_free(),
+    }
+
+
+def report():
+    s = stats()
+    print(f"🧰 Pool: {s['buses']} bus(es), {s['displays']} display(s), "
+          f"{s['buffer_bytes']} bytes of frame buffers "
+          f"({s['shared_buffers']} shared, {s['free_buffers']} spare)")
+    print(f"   {s['allocated']} buffer(s) allocated ({s['allocated_bytes']} bytes), "
+          f"{s['reused']} reuse(s), {s['mem_free']} bytes of heap free")
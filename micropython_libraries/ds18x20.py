@@ -37,6 +37,10 @@ class DS18X20:
         self.ow.write(buf)
 
     def read_temp(self, rom):
+        return self.read_temp_raw(rom) / 16
+
+    def read_temp_raw(self, rom):
+        # Whole number of 1/16 degC steps: an int, so nothing is allocated
         buf = self.read_scratch(rom)
         if rom[0] == 0x10:
             if buf[1]:
@@ -44,9 +48,9 @@ class DS18X20:
                 t = -((~t + 1) & 0xFF)
             else:
                 t = buf[0] >> 1
-            return t - 0.25 + (buf[7] - buf[6]) / buf[7]
+            return t * 16 - 4 + (buf[7] - buf[6]) * 16 // buf[7]
         else:
             t = buf[1] << 8 | buf[0]
             if t & 0x8000:  # sign bit set
                 t = -((t ^ 0xFFFF) + 1)
-            return t / 16
+            return t
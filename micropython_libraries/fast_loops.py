@@ -0,0 +1,111 @@
+# Fast Loops
+# Native-emitter builds of the bit- and byte-level loops the drivers run most:
+#   crc8           - Dallas/Maxim CRC-8 (1-Wire ROM codes and scratchpads)
+#   ow_writebyte   - bit-banged 1-Wire write and read slots
+#   ow_readbyte
+#   fill_grb       - one colour into every pixel of a NeoPixel buffer
+#   shift_columns  - moves a MONO_VLSB box one column left (strip chart scroll)
+#   map_values     - utils.map_value over a whole array of readings
+#
+# The libraries import this module when it is on the board and fall back to
+# their own pure-Python loops when it is missing or the firmware was built
+# without the native emitter (the decorators are then a SyntaxError):
+#
+#     try:
+#         import fast_loops as _fast
+#     except (ImportError, SyntaxError, ValueError):
+#         _fast = None
+#
+# Every function returns exactly what the pure-Python version does. For the
+# quickest import, build fast_loops.mpy with
+# `python library_manager.py native` (mpy-cross -march=xtensawin).
+
+import time
+import micropython
+
+
+@micropython.viper
+def crc8(data) -> int:
+    """CRC-8 of data; 0 when data ends with its own CRC byte"""
+    p = ptr8(data)
+    n = int(len(data))
+    crc = 0
+    i = 0
+    while i < n:
+        crc ^= p[i]
+        bit = 0
+        while bit < 8:
+            if crc & 1:
+                crc = (crc >> 1) ^ 0x8C  # x^8 + x^5 + x^4 + 1, bit-reversed
+            else:
+                crc >>= 1
+            bit += 1
+        i += 1
+    return crc
+
+
+@micropython.native
+def ow_writebyte(pin, data):
+    """Send one byte LSB first: a 60 us slot per bit"""
+    value = pin.value
+    sleep_us = time.sleep_us
+    for i in range(8):
+        value(0)
+        sleep_us(2)
+        value((data >> i) & 1)
+        sleep_us(60)
+        value(1)
+        sleep_us(2)
+
+
+@micropython.native
+def ow_readbyte(pin):
+    """Read one byte LSB first: sample 10 us into each slot"""
+    value = pin.value
+    sleep_us = time.sleep_us
+    data = 0
+    for i in range(8):
+        value(0)
+        sleep_us(2)
+        value(1)
+        sleep_us(8)
+        data |= value() << i
+        sleep_us(50)
+    return data
+
+
+@micropython.viper
+def fill_grb(buf, n: int, r: int, g: int, b: int):
+    """Write (r, g, b) to the first n pixels of a GRB byte buffer"""
+    p = ptr8(buf)
+    end = n * 3
+    i = 0
+    while i < end:
+        p[i] = g
+        p[i + 1] = r
+        p[i + 2] = b
+        i += 3
+
+
+@micropython.viper
+def shift_columns(buf, start: int, stride: int, w: int, pages: int):
+    """Move a w-column MONO_VLSB box one column left; the last column is left as it was"""
+    p = ptr8(buf)
+    page = 0
+    while page < pages:
+        i = start + page * stride
+        end = i + w - 1
+        while i < end:
+            p[i] = p[i + 1]
+            i += 1
+        page += 1
+
+
+@micropython.native
+def map_values(src, dst, in_min, in_max, out_min, out_max):
+    """dst[i] = utils.map_value(src[i], ...) for every i; returns dst"""
+    scale = out_max - out_min
+    span = in_max - in_min
+    for i in range(len(src)):
+        dst[i] = (src[i] - in_min) * scale // span + out_min
+    return dst
@@ -0,0 +1,148 @@
+# I2C Bus Discovery
+# Finds the SDA/SCL pair your I2C devices are wired to. Likely pairs are
+# probed first with a few single-address checks, and the search stops at the
+# first hit. The winning bus and its device list are saved to flash, so later
+# scripts reuse them at once instead of probing again.
+#
+#     import i2c_discovery
+#     config, i2c = i2c_discovery.discover(want=i2c_discovery.OLED_ADDRESSES)
+#     oled = ssd1306.SSD1306_I2C(128, 64, i2c)
+
+import json
+import os
+import time
+from machine import Pin, SoftI2C
+
+# Relative to the working directory, which is / on the board after boot
+CACHE_FILE = "i2c_bus.json"
+PROBE_FREQ = 100000
+
+# Most likely wiring first: the ESP32 default I2C pins, the lab kit's OLED
+# pins, then the other common breakout pairs, each followed by its swap
+CANDIDATES = [
+    (21, 22), (13, 15), (4, 5), (22, 21), (15, 13), (5, 4),
+    (18, 19), (19, 18), (25, 26), (26, 25), (32, 33), (33, 32),
+    (16, 17), (17, 16), (14, 27), (27, 14),
+]
+
+# OLEDs, PCA9685, IMUs, RTC/EEPROM, BME280, LCD backpacks, ADS1115, VL53L0X...
+COMMON_ADDRESSES = (0x3C, 0x3D, 0x40, 0x68, 0x69, 0x76, 0x77, 0x50, 0x57, 0x27, 0x3F, 0x48, 0x29, 0x53, 0x1E)
+
+OLED_ADDRESSES = (0x3C, 0x3D)
+
+
+def ack(i2c, addr):
+    """True if a device answers at addr (a single zero-length write)"""
+    try:
+        i2c.writeto(addr, b"")
+        return True
+    except OSError:
+        return False
+
+
+def probe(i2c, addresses):
+    """The addresses from the list that answer, in order"""
+    return [addr for addr in addresses if ack(i2c, addr)]
+
+
+def open_bus(config, freq=None):
+    """SoftI2C for a saved config"""
+    return SoftI2C(sda=Pin(config["sda"]), scl=Pin(config["scl"]), freq=freq or config.get("freq", PROBE_FREQ))
+
+
+def load_cache(path=CACHE_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def save_cache(config, path=CACHE_FILE):
+    """Write the config unless the same one is already on flash (saves wear)"""
+    if load_cache(path) == config:
+        return False
+    with open(path, "w") as f:
+        json.dump(config, f)
+    return True
+
+
+def clear_cache(path=CACHE_FILE):
+    try:
+        os.remove(path)
+    except OSError:
+        pass
+
+
+def _cached_bus(want, path):
+    """The saved bus, if every device recorded on it still answers"""
+    config = load_cache(path)
+    if not config:
+        return None, None
+    try:
+        i2c = open_bus(config)
+    except (ValueError, OSError):
+        return None, None
+    devices = config.get("devices", [])
+    if not devices or probe(i2c, devices) != devices:
+        return None, None
+    if want and not any(addr in devices for addr in want):
+        return None, None
+    return config, i2c
+
+
+def _pairs(candidates, first=None):
+    seen = []
+    for pair in ([first] if first else []) + list(candidates):
+        if pair not in seen:
+            seen.append(pair)
+    return seen
+
+
+def discover(want=None, candidates=CANDIDATES, use_cache=True, save=True, path=CACHE_FILE, verbose=False):
+    """Find a working bus; returns (config, i2c) or (None, None)
+
+    want: addresses you need (e.g. OLED_ADDRESSES). Without it any device
+    counts. Pass 1 probes only `want` (or COMMON_ADDRESSES) on each pair;
+    pass 2, only when looking for anything, does full scans.
+    """
+    start = time.ticks_ms()
+    if use_cache:
+        config, i2c = _cached_bus(want, path)
+        if config:
+            if verbose:
+                print(f"⚡ Cached bus SDA={config['sda']} SCL={config['scl']}: {[hex(a) for a in config['devices']]}")
+            return config, i2c
+
+    stale = load_cache(path) if use_cache else None
+    first = (stale["sda"], stale["scl"]) if stale else None
+    pairs = _pairs(candidates, first)
+    passes = [lambda i2c: probe(i2c, want or COMMON_ADDRESSES)]
+    if not want:
+        passes.append(lambda i2c: i2c.scan())
+
+    for find in passes:
+        for sda, scl in pairs:
+            try:
+                i2c = SoftI2C(sda=Pin(sda), scl=Pin(scl), freq=PROBE_FREQ)
+                hits = find(i2c)
+            except (ValueError, OSError):
+                continue
+            if verbose:
+                print(f"  {'✅' if hits else '·'} SDA={sda} SCL={scl}" + (f": {[hex(a) for a in hits]}" if hits else ""))
+            if hits:
+                config = {"sda": sda, "scl": scl, "freq": PROBE_FREQ, "devices": i2c.scan()}
+                if save:
+                    save_cache(config, path)
+                if verbose:
+                    print(f"🎯 Found in {time.ticks_diff(time.ticks_ms(), start)} ms")
+                return config, i2c
+    return None, None
+
+
+def get_bus(want=None):
+    """The I2C bus with your devices on it; raises OSError if nothing answers"""
+    config, i2c = discover(want)
+    if i2c is None:
+        raise OSError(19, "no I2C devices found on any candidate pins")
+    return i2c
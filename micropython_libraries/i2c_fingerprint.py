@@ -0,0 +1,136 @@
+# I2C Device Fingerprints
+# Names the parts on an I2C bus from one or two cheap register reads (chip
+# ID, status or reset-value registers) instead of initialising drivers by
+# trial. Only addresses that answered the scan are probed.
+#
+#     import i2c_fingerprint
+#     for found in i2c_fingerprint.identify(i2c):
+#         print(hex(found["addr"]), found["part"], found["confirmed"])
+#     oled = i2c_fingerprint.bind(i2c, "SSD1306")      # no trial init needed
+
+def _reg(i2c, addr, reg, n=1):
+    return i2c.readfrom_mem(addr, reg, n)
+
+
+def _ssd1306(i2c, addr):
+    # A read returns the status byte: bit 6 = display off, bit 7 = busy
+    # (never set on these parts). SH1106 controllers read 0x_8 instead.
+    status = i2c.readfrom(addr, 1)[0]
+    return not status & 0x80 and status & 0x0F != 0x08
+
+
+def _sh1106(i2c, addr):
+    return i2c.readfrom(addr, 1)[0] & 0x0F == 0x08
+
+
+def _pca9685(i2c, addr):
+    # PRE_SCALE can't be below 3; MODE2's top three bits always read 0
+    return _reg(i2c, addr, 0xFE)[0] >= 3 and not _reg(i2c, addr, 0x01)[0] & 0xE0
+
+
+def _ina219(i2c, addr):
+    return _reg(i2c, addr, 0x00, 2) == b"\x39\x9f"  # configuration reset value
+
+
+def _who_am_i(value, reg=0x75):
+    return lambda i2c, addr: _reg(i2c, addr, reg)[0] == value
+
+
+def _ds3231(i2c, addr):
+    # Valid BCD seconds, and the temperature register's unused low bits are 0
+    seconds = _reg(i2c, addr, 0x00)[0]
+    return seconds & 0x0F < 10 and seconds >> 4 < 6 and not _reg(i2c, addr, 0x12)[0] & 0x3F
+
+
+def _hmc5883l(i2c, addr):
+    return _reg(i2c, addr, 0x0A, 3) == b"H43"
+
+
+def _ads1115(i2c, addr):
+    return _reg(i2c, addr, 0x01, 2)[1] & 0x1F == 0x03  # comparator queue bits reset to 0b11
+
+
+def _readable(i2c, addr):
+    i2c.readfrom(addr, 1)
+    return True
+
+
+# (part, driver module, driver class, addresses, check, description)
+# Entries sharing an address are tried in order, chip-ID checks before the
+# looser ones (PCA9685 can sit anywhere from 0x40 to 0x7F). A check of
+# _readable only proves something answers, so it is reported unconfirmed.
+FINGERPRINTS = (
+    ("SSD1306", "ssd1306", "SSD1306_I2C", (0x3C, 0x3D), _ssd1306, "128x64/128x32 OLED"),
+    ("SH1106", "sh1106", "SH1106_I2C", (0x3C, 0x3D), _sh1106, "132x64 OLED"),
+    ("INA219", "ina219", "INA219", (0x40, 0x41, 0x44, 0x45), _ina219, "current/power monitor"),
+    ("MPU6050", "mpu6050", "MPU6050", (0x68, 0x69), _who_am_i(0x68), "accelerometer/gyro"),
+    ("MPU6500", "mpu6500", "MPU6500", (0x68, 0x69), _who_am_i(0x70), "accelerometer/gyro"),
+    ("MPU9250", "mpu9250", "MPU9250", (0x68, 0x69), _who_am_i(0x71), "9-axis IMU"),
+    ("ICM20948", "icm20948", "ICM20948", (0x68, 0x69), _who_am_i(0xEA, 0x00), "9-axis IMU"),
+    ("DS3231", "ds3231", "DS3231", (0x68,), _ds3231, "real-time clock"),
+    ("BMP280", "bmp280", "BMP280", (0x76, 0x77), _who_am_i(0x58, 0xD0), "pressure/temperature"),
+    ("BME280", "bme280", "BME280", (0x76, 0x77), _who_am_i(0x60, 0xD0), "pressure/temp/humidity"),
+    ("BME680", "bme680", "BME680", (0x76, 0x77), _who_am_i(0x61, 0xD0), "gas/pressure/temp/humidity"),
+    ("ADXL345", "adxl345", "ADXL345", (0x1D, 0x53), _who_am_i(0xE5, 0x00), "accelerometer"),
+    ("VL53L0X", "vl53l0x", "VL53L0X", (0x29,), _who_am_i(0xEE, 0xC0), "distance sensor"),
+    ("HMC5883L", "hmc5883l", "HMC5883L", (0x1E,), _hmc5883l, "magnetometer"),
+    ("QMC5883L", "qmc5883l", "QMC5883L", (0x0D,), _who_am_i(0xFF, 0x0D), "magnetometer"),
+    ("ADS1115", "ads1x15", "ADS1115", (0x48, 0x49, 0x4A, 0x4B), _ads1115, "16-bit ADC"),
+    ("PCA9685", "pca9685", "PCA9685", tuple(range(0x40, 0x80)), _pca9685, "16-channel PWM"),
+    ("AT24Cxx", "at24c", "AT24C", tuple(range(0x50, 0x58)), _readable, "EEPROM"),
+    ("PCF8574", "lcd1602", "I2cLcd", tuple(range(0x20, 0x28)) + tuple(range(0x38, 0x40)), _readable, "I/O expander / LCD backpack"),
+)
+
+
+def candidates(addr):
+    """Fingerprints that can live at this address, in probe order"""
+    return [fp for fp in FINGERPRINTS if addr in fp[3]]
+
+
+def identify(i2c, addresses=None):
+    """[{addr, part, driver, cls, description, confirmed}] for each device that answers"""
+    if addresses is None:
+        addresses = i2c.scan()
+    results = []
+    for addr in addresses:
+        found = {"addr": addr, "part": "unknown", "driver": None, "cls": None,
+                 "description": "", "confirmed": False}
+        for part, driver, cls, _addrs, check, description in candidates(addr):
+            try:
+                if not check(i2c, addr):
+                    continue
+            except OSError:
+                continue
+            found.update(part=part, driver=driver, cls=cls, description=description,
+                         confirmed=check is not _readable)
+            break
+        results.append(found)
+    return results
+
+
+def bind(i2c, part, *args, found=None, **kwargs):
+    """Construct the driver for the first device of this part; None if absent
+
+    Pass identify()'s result as found= to skip probing again. For displays,
+    extra arguments are the size and go before the bus:
+    bind(i2c, "SSD1306", 128, 32). The driver module must be installed.
+    """
+    for entry in found or identify(i2c):
+        if entry["part"] == part:
+            driver = getattr(__import__(entry["driver"]), entry["cls"])
+            if part in ("SSD1306", "SH1106"):
+                return driver(*((args or (128, 64)) + (i2c, entry["addr"])), **kwargs)
+            return driver(*((i2c, entry["addr"]) + args), **kwargs)
+    return None
+
+
+def describe(found):
+    """One line per device, for printing"""
+    lines = []
+    for entry in found:
+        if entry["part"] == "unknown":
+            lines.append(f"0x{entry['addr']:02X}: unknown device")
+        else:
+            mark = "" if entry["confirmed"] else " (probable)"
+            lines.append(f"0x{entry['addr']:02X}: {entry['part']} - {entry['description']}{mark}")
+    return lines
@@ -1,9 +1,15 @@
 # NeoPixel Library for MicroPython
 # Simple RGB LED control
+# fill() uses the viper loop in fast_loops.py when it is installed
 
 from machine import Pin
 import time
 
+try:
+    import fast_loops as _fast
+except (ImportError, SyntaxError, ValueError):
+    _fast = None  # not installed, or firmware without the native emitter
+
 class NeoPixel:
     def __init__(self, pin, n):
         self.pin = Pin(pin, Pin.OUT)
@@ -18,6 +24,9 @@ class NeoPixel:
         self.buf[index * 3 + 2] = val[2]  # Blue
     
     def fill(self, color):
+        if _fast:
+            _fast.fill_grb(self.buf, self.n, color[0], color[1], color[2])
+            return
         for i in range(self.n):
             self[i] = color
     
@@ -0,0 +1,203 @@
+# OLED Chart Widgets
+# Live plots for framebuf displays such as the SSD1306:
+#   StripChart - rolling plot; each sample scrolls the plot one column left
+#                and draws one new column (history kept in a ring buffer)
+#   Sparkline  - small autoscaled line of the last few values
+#   BarMeter   - horizontal bar; only the part that changed is redrawn
+#
+#     import oled_charts
+#     chart = oled_charts.StripChart(oled, 0, 16, 128, 48, lo=0, hi=4095)
+#     chart.push(adc.read())
+#     chart.show()                 # sends only the pages the chart covers
+#
+# A chart that starts and ends on 8-pixel page boundaries of an SSD1306 draws
+# straight into the display buffer; otherwise it keeps its own small buffer
+# and is blitted into place. The one-column scroll uses the viper loop in
+# fast_loops.py when it is installed, and FrameBuffer.scroll otherwise.
+
+from array import array
+import framebuf
+
+try:
+    import fast_loops as _fast
+except (ImportError, SyntaxError, ValueError):
+    _fast = None  # not installed, or firmware without the native emitter
+
+
+def _view(fb, x, y, w, h):
+    """A FrameBuffer over the display's own buffer for this box, or None"""
+    buf = getattr(fb, "buffer", None)
+    if buf is None or not hasattr(fb, "pages") or y % 8 or h % 8:
+        return None
+    stride = fb.width
+    start = y // 8 * stride + x
+    if len(buf) - start < h // 8 * stride:
+        return None  # the last page would run off the end of the buffer
+    return framebuf.FrameBuffer(memoryview(buf)[start:], w, h, framebuf.MONO_VLSB, stride)
+
+
+def _show(fb, y, h):
+    """Send the pages covering rows y..y+h-1 (the whole display if the driver can't)"""
+    try:
+        fb.show(y // 8, (y + h - 1) // 8)
+    except TypeError:
+        fb.show()
+
+
+class StripChart:
+    """Rolling plot of the last w samples, newest at the right edge"""
+
+    def __init__(self, fb, x, y, w, h, lo=0, hi=4095, style="line", autoscale=False):
+        self.fb = fb
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.lo, self.hi = lo, hi
+        self.style = style  # "line" or "bar"
+        self.autoscale = autoscale
+        self.values = array("f", bytes(4 * w))  # ring buffer of samples
+        self.head = 0       # where the next sample goes
+        self.count = 0
+        self.last_y = None
+        self.view = _view(fb, x, y, w, h)
+        self.shared = self.view is not None
+        if self.shared:
+            # where the box starts in the display buffer, for shift_columns
+            self.buf, self.start, self.stride = fb.buffer, y // 8 * fb.width + x, fb.width
+        else:
+            self.buf, self.start, self.stride = bytearray(w * ((h + 7) // 8)), 0, w
+            self.view = framebuf.FrameBuffer(self.buf, w, h, framebuf.MONO_VLSB)
+        self.view.fill(0)
+        self._place()
+
+    def _place(self):
+        if not self.shared:
+            self.fb.blit(self.view, self.x, self.y)
+
+    def _row(self, value):
+        # Floor division keeps int samples (ADC readings) in ints: no float to allocate
+        span = self.hi - self.lo or 1
+        row = self.h - 1 - int((value - self.lo) * (self.h - 1) // span)
+        return 0 if row < 0 else self.h - 1 if row >= self.h else row
+
+    def _column(self, col, row, previous):
+        view = self.view
+        view.vline(col, 0, self.h, 0)
+        if self.style == "bar":
+            view.vline(col, row, self.h - row, 1)
+        elif previous is None:
+            view.pixel(col, row, 1)
+        else:
+            top = row if row < previous else previous
+            view.vline(col, top, abs(row - previous) + 1, 1)
+
+    def push(self, value):
+        """Add a sample: one scroll and one new column"""
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.w
+        if self.count < self.w:
+            self.count += 1
+        if self.autoscale and (value < self.lo or value > self.hi):
+            self.lo = min(self.lo, value)
+            self.hi = max(self.hi, value)
+            self.redraw()  # the scale changed, so every column moves
+            return
+        row = self._row(value)
+        if _fast:
+            _fast.shift_columns(self.buf, self.start, self.stride, self.w, (self.h + 7) // 8)
+        else:
+            self.view.scroll(-1, 0)
+        self._column(self.w - 1, row, self.last_y)
+        self.last_y = row
+        self._place()
+
+    def redraw(self):
+        """Draw every stored sample again (after a scale change or a cleared display)"""
+        self.view.fill(0)
+        previous = None
+        start = self.w - self.count
+        for i in range(self.count):
+            value = self.values[(self.head - self.count + i) % self.w]
+            row = self._row(value)
+            self._column(start + i, row, previous)
+            previous = row
+        self.last_y = previous
+        self._place()
+
+    def latest(self):
+        return self.values[(self.head - 1) % self.w] if self.count else None
+
+    def show(self):
+        _show(self.fb, self.y, self.h)
+
+
+class Sparkline:
+    """A small line of the last w values, scaled to their own min..max"""
+
+    def __init__(self, fb, x, y, w, h):
+        self.fb = fb
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.values = array("f", bytes(4 * w))
+        self.head = 0
+        self.count = 0
+
+    def push(self, value, draw=True):
+        self.values[self.head] = value
+        self.head = (self.head + 1) % self.w
+        if self.count < self.w:
+            self.count += 1
+        if draw:
+            self.draw()
+
+    def draw(self):
+        fb, n = self.fb, self.count
+        fb.fill_rect(self.x, self.y, self.w, self.h, 0)
+        if not n:
+            return
+        first = self.head - n
+        lo = hi = self.values[first % self.w]
+        for i in range(1, n):
+            v = self.values[(first + i) % self.w]
+            lo = v if v < lo else lo
+            hi = v if v > hi else hi
+        span = hi - lo or 1
+        bottom = self.y + self.h - 1
+        left = self.x + self.w - n
+        px = py = None
+        for i in range(n):
+            cx = left + i
+            cy = bottom - int((self.values[(first + i) % self.w] - lo) * (self.h - 1) / span)
+            if px is None:
+                fb.pixel(cx, cy, 1)
+            else:
+                fb.line(px, py, cx, cy, 1)
+            px, py = cx, cy
+
+    def show(self):
+        _show(self.fb, self.y, self.h)
+
+
+class BarMeter:
+    """A framed horizontal bar between lo and hi"""
+
+    def __init__(self, fb, x, y, w, h, lo=0, hi=4095):
+        self.fb = fb
+        self.x, self.y, self.w, self.h = x, y, w, h
+        self.lo, self.hi = lo, hi
+        self.length = 0  # filled pixels inside the frame
+        fb.fill_rect(x, y, w, h, 0)
+        fb.rect(x, y, w, h, 1)
+
+    def set(self, value):
+        """Move the bar; draws only the span between the old and new ends"""
+        inner = self.w - 2
+        span = self.hi - self.lo or 1
+        length = int((value - self.lo) * inner // span)
+        length = 0 if length < 0 else inner if length > inner else length
+        old = self.length
+        if length > old:
+            self.fb.fill_rect(self.x + 1 + old, self.y + 1, length - old, self.h - 2, 1)
+        elif length < old:
+            self.fb.fill_rect(self.x + 1 + length, self.y + 1, old - length, self.h - 2, 0)
+        self.length = length
+
+    def show(self):
+        _show(self.fb, self.y, self.h)
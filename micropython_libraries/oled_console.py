@@ -0,0 +1,233 @@
+# OLED Console
+# A scrolling text terminal on an SSD1306. Text goes into a fixed ring of
+# wrapped lines (the scrollback), and each render redraws only the text rows
+# whose contents changed and sends only those pages to the display. run()
+# sleeps in uselect.poll until a key arrives, so typed characters show up at
+# once and the CPU idles between messages.
+#
+#     import oled_console
+#     console = oled_console.OledConsole(oled)
+#     console.print("Hello from the ESP32")
+#     oled_console.run(console, on_line=lambda line: print("Got", line))
+#
+# Pass font=oled_font.Font(...) for proportional or larger text; each row is
+# then as many 8-pixel pages as the font needs.
+
+import sys
+import time
+import uselect
+
+ROW_HEIGHT = 8  # built-in 8x8 font
+CHAR_WIDTH = 8
+
+
+def wrap(text, width):
+    """Word-wrap one line of text; words longer than a row are split"""
+    lines = []
+    current = ""
+    for word in text.split(" "):
+        while len(word) > width:
+            if current:
+                lines.append(current)
+                current = ""
+            lines.append(word[:width])
+            word = word[width:]
+        if not current:
+            current = word
+        elif len(current) + 1 + len(word) <= width:
+            current += " " + word
+        else:
+            lines.append(current)
+            current = word
+    lines.append(current)
+    return lines
+
+
+class OledConsole:
+    """A scrollback ring of text lines, drawn one screen row per line"""
+
+    def __init__(self, oled, scrollback=32, status_row=False, font=None):
+        self.oled = oled
+        self.font = font
+        self.cols = oled.width // CHAR_WIDTH
+        self.row_height = (font.height + 7) // 8 * 8 if font else ROW_HEIGHT
+        self.rows = oled.height // self.row_height
+        self.first_row = 1 if status_row else 0  # row 0 can hold a status line
+        self.view_rows = self.rows - self.first_row
+        self.size = max(scrollback, self.view_rows)
+        self.ring = [""] * self.size
+        self.total = 0      # number of the newest line; it lives at ring[total % size]
+        self.offset = 0     # lines scrolled back from the newest
+        self.status = ""
+        self.shown = [None] * self.rows  # text currently drawn on each row
+        self.autoshow = True
+
+    # ---- writing ----
+
+    def write(self, text):
+        """Add text as it arrives: wraps at the row width, handles \\n, \\r and backspace"""
+        line = self.ring[self.total % self.size]
+        for ch in text:
+            if ch == "\n" or ch == "\r":
+                self.ring[self.total % self.size] = line
+                self._newline()
+                line = ""
+            elif ch == "\b" or ch == "\x7f":
+                line = line[:-1]
+            elif ch >= " ":
+                if not self._fits(line + ch):
+                    self.ring[self.total % self.size] = line
+                    self._newline()
+                    line = ""
+                line += ch
+        self.ring[self.total % self.size] = line
+        self.offset = 0  # new text brings the view back to the bottom
+        if self.autoshow:
+            self.render()
+
+    def print(self, text=""):
+        """Add whole lines, word-wrapped"""
+        autoshow = self.autoshow
+        self.autoshow = False
+        try:
+            for paragraph in str(text).split("\n"):
+                lines = self.font.wrap(paragraph, self.oled.width) if self.font else wrap(paragraph, self.cols)
+                for line in lines:
+                    self.write(line + "\n")
+        finally:
+            self.autoshow = autoshow
+        if autoshow:
+            self.render()
+
+    def _fits(self, line):
+        if self.font:
+            return self.font.measure(line) <= self.oled.width
+        return len(line) <= self.cols
+
+    def _newline(self):
+        self.total += 1
+        self.ring[self.total % self.size] = ""
+
+    def set_status(self, text):
+        """Text for the status row (when created with status_row=True)"""
+        while text and not self._fits(text):
+            text = text[:-1]
+        self.status = text
+        if self.autoshow:
+            self.render()
+
+    def clear(self):
+        self.ring = [""] * self.size
+        self.total = 0
+        self.offset = 0
+        if self.autoshow:
+            self.render()
+
+    def scroll(self, lines):
+        """Look back (positive) or forward through the scrollback; 0 follows new text"""
+        oldest = max(self.total - self.size + 1, 0)
+        most = max(self.total - oldest - self.view_rows + 1, 0)
+        self.offset = max(0, min(most, self.offset + lines)) if lines else 0
+        if self.autoshow:
+            self.render()
+
+    # ---- drawing ----
+
+    def invalidate(self):
+        """Redraw every row next time (after drawing on the display directly)"""
+        self.shown = [None] * self.rows
+
+    def visible(self):
+        """The text each screen row should show"""
+        rows = [self.status] if self.first_row else []
+        newest = self.total - self.offset
+        oldest = max(self.total - self.size + 1, 0)
+        for n in range(newest - self.view_rows + 1, newest + 1):
+            rows.append(self.ring[n % self.size] if n >= oldest else "")
+        return rows
+
+    def render(self):
+        """Redraw the rows that changed; returns how many were sent"""
+        oled = self.oled
+        first = last = None
+        for row, text in enumerate(self.visible()):
+            if self.shown[row] == text:
+                continue
+            y = row * self.row_height
+            oled.fill_rect(0, y, oled.width, self.row_height, 0)
+            if self.font:
+                self.font.text(oled, text, 0, y, 1)
+            else:
+                oled.text(text, 0, y, 1)
+            self.shown[row] = text
+            if first is None:
+                first = row
+            last = row
+        if first is None:
+            return 0
+        # Rows are whole display pages (8 pixel rows each)
+        pages = self.row_height // 8
+        try:
+            oled.show(first * pages, (last + 1) * pages - 1)
+        except TypeError:
+            oled.show()  # driver without partial updates
+        return last - first + 1
+
+
+def run(console, on_line=None, duration_ms=None, idle_ms=1000, on_idle=None, stream=None, echo=True):
+    """Echo typed text onto the console until on_line returns False, input ends or time runs out
+
+    on_line(line) gets each completed line. on_idle() is called after idle_ms
+    without input (e.g. to update a status row); idle_ms=-1 waits for input
+    indefinitely. Everything already waiting
+    (a pasted line) is taken in before the display is updated once.
+    """
+    stream = stream or sys.stdin
+    poller = uselect.poll()
+    poller.register(stream, uselect.POLLIN)
+    start = time.ticks_ms()
+    state = {"typed": "", "cr": False}
+    autoshow = console.autoshow
+    console.autoshow = False
+    try:
+        while True:
+            wait = idle_ms
+            if duration_ms is not None:
+                left = duration_ms - time.ticks_diff(time.ticks_ms(), start)
+                if left <= 0:
+                    return
+                wait = left if wait < 0 else min(wait, left)
+            if not poller.poll(wait):
+                if on_idle:
+                    on_idle()
+                    console.render()
+                continue
+            while True:
+                ch = stream.read(1)
+                if not ch or _key(console, ch, state, on_line, echo) is False:
+                    return  # input closed, or on_line asked to stop
+                if not poller.poll(0):
+                    break
+            console.render()
+    finally:
+        console.autoshow = autoshow
+        console.render()
+
+
+def _key(console, ch, state, on_line, echo):
+    if ch == "\n" and state["cr"]:
+        state["cr"] = False
+        return True  # second half of \r\n
+    state["cr"] = ch == "\r"
+    if echo:
+        console.write(ch)
+    if ch == "\r" or ch == "\n":
+        line = state["typed"]
+        state["typed"] = ""
+        if on_line and on_line(line) is False:
+            return False
+    elif ch == "\b" or ch == "\x7f":
+        state["typed"] = state["typed"][:-1]
+    else:
+        state["typed"] += ch
+    return True
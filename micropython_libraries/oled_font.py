@@ -0,0 +1,150 @@
+# OLED Fonts
+# Proportional and large fonts for framebuf displays such as the SSD1306.
+# Glyphs come pre-packed as MONO_VLSB bitmaps in a font file on flash (built
+# on the host with font_converter.py). Only the character widths stay in RAM.
+# Bitmaps are read on first use into a small least-recently-used cache and
+# drawn with FrameBuffer.blit, so repeated text costs no file access and no
+# allocation.
+#
+#     import oled_font
+#     big = oled_font.Font("big16.fnt")
+#     x = big.text(oled, "21.5", 0, 0)       # returns where the text ended
+#     width = big.measure("21.5 C")          # pixels, nothing drawn
+
+import struct
+from array import array
+import framebuf
+
+MAGIC = b"MPF1"
+HEADER = "<4sBBBBB"
+HEADER_SIZE = 9
+ENTRY = "<BI"
+ENTRY_SIZE = 5
+
+
+class Font:
+    """A packed font file with a glyph cache of cache_size bitmaps"""
+
+    def __init__(self, path, cache_size=24):
+        self.path = path
+        self.file = open(path, "rb")
+        magic, self.height, self.baseline, self.first, self.last, default = struct.unpack(
+            HEADER, self.file.read(HEADER_SIZE))
+        if magic != MAGIC:
+            self.file.close()
+            raise ValueError("not a packed font: %s" % path)
+        count = self.last - self.first + 1
+        index = self.file.read(count * ENTRY_SIZE)
+        self.widths = bytearray(count)
+        self.offsets = array("I", bytes(4 * count))
+        for i in range(count):
+            self.widths[i], self.offsets[i] = struct.unpack_from(ENTRY, index, i * ENTRY_SIZE)
+        self.default = default - self.first
+        self.pages = (self.height + 7) // 8
+
+        # Fixed slots, each big enough for the widest glyph
+        size = max(self.widths) * self.pages
+        self.cache_size = cache_size
+        self._buffers = [bytearray(size) for _ in range(cache_size)]
+        self._glyphs = [None] * cache_size   # FrameBuffer per slot
+        self._codes = [-1] * cache_size      # glyph index held by each slot
+        self._used = array("I", bytes(4 * cache_size))
+        self._slot_of = {}                   # glyph index -> slot
+        self._clock = 0
+        self.hits = 0
+        self.misses = 0
+
+        # blit palette for color 0: glyph ink -> 0, background -> 1 (transparent key)
+        self._invert = framebuf.FrameBuffer(bytearray(1), 2, 1, framebuf.MONO_HLSB)
+        self._invert.pixel(0, 0, 1)
+
+    def close(self):
+        self.file.close()
+
+    def _index(self, ch):
+        i = ord(ch) - self.first
+        if i < 0 or i >= len(self.widths) or not self.widths[i]:
+            return self.default
+        return i
+
+    def glyph(self, ch):
+        """(FrameBuffer or None, advance width) for a character"""
+        i = self._index(ch)
+        width = self.widths[i]
+        if not width:
+            return None, 0
+        return self._glyph(i), width
+
+    def _glyph(self, i):
+        """FrameBuffer for glyph index i (which has a width); no tuple, so a hit allocates nothing"""
+        width = self.widths[i]
+        self._clock += 1
+        slot = self._slot_of.get(i)
+        if slot is not None:
+            self.hits += 1
+            self._used[slot] = self._clock
+            return self._glyphs[slot]
+
+        # Miss: take a free slot, or the one unused for longest
+        self.misses += 1
+        if len(self._slot_of) < self.cache_size:
+            slot = len(self._slot_of)
+        else:
+            slot = 0
+            oldest = self._used[0]
+            for s in range(1, self.cache_size):
+                if self._used[s] < oldest:
+                    slot, oldest = s, self._used[s]
+            del self._slot_of[self._codes[slot]]
+        buf = self._buffers[slot]
+        self.file.seek(self.offsets[i])
+        self.file.readinto(memoryview(buf)[:width * self.pages])
+        fb = framebuf.FrameBuffer(buf, width, self.height, framebuf.MONO_VLSB)
+        self._glyphs[slot] = fb
+        self._codes[slot] = i
+        self._used[slot] = self._clock
+        self._slot_of[i] = slot
+        return fb
+
+    def measure(self, text):
+        """Width of text in pixels, from the width table only"""
+        total = 0
+        for ch in text:
+            total += self.widths[self._index(ch)]
+        return total
+
+    def text(self, fb, text, x, y, color=1):
+        """Draw text with its top-left corner at (x, y); returns the x after it"""
+        palette = self._invert if color == 0 else None
+        key = 1 if color == 0 else 0
+        right = fb.width if hasattr(fb, "width") else 1 << 15
+        for ch in text:
+            if x >= right:
+                break
+            i = self._index(ch)
+            width = self.widths[i]
+            if width:
+                if palette is None:
+                    fb.blit(self._glyph(i), x, y, key)
+                else:
+                    fb.blit(self._glyph(i), x, y, key, palette)
+            x += width
+        return x
+
+    def wrap(self, text, width):
+        """Word-wrap text into lines no wider than width pixels"""
+        lines = []
+        for paragraph in text.split("\n"):
+            current = ""
+            for word in paragraph.split(" "):
+                candidate = current + " " + word if current else word
+                if not current or self.measure(candidate) <= width:
+                    current = candidate
+                else:
+                    lines.append(current)
+                    current = word
+            lines.append(current)
+        return lines
+
+    def stats(self):
+        return {"hits": self.hits, "misses": self.misses, "cached": len(self._slot_of)}
@@ -1,39 +1,167 @@
 # OneWire Library for MicroPython
-# Simplified version for DS18B20 temperature sensors
+# Bit-banged 1-Wire bus for DS18B20 temperature sensors. Same API as the
+# firmware's onewire module (scan, select_rom, readinto, ...), which this file
+# replaces once it is copied to the board, so ds18x20.py works with either.
+# The byte slots and the CRC use the native builds in fast_loops.py when it
+# is installed, and the loops below when it is not.
 
 import time
 
+try:
+    import fast_loops as _fast
+except (ImportError, SyntaxError, ValueError):
+    _fast = None  # not installed, or firmware without the native emitter
+
+
+def _writebyte_py(pin, data):
+    for i in range(8):
+        pin.value(0)
+        time.sleep_us(2)
+        pin.value((data >> i) & 1)
+        time.sleep_us(60)
+        pin.value(1)
+        time.sleep_us(2)
+
+
+def _readbyte_py(pin):
+    data = 0
+    for i in range(8):
+        pin.value(0)
+        time.sleep_us(2)
+        pin.value(1)
+        time.sleep_us(8)
+        data |= (pin.value() << i)
+        time.sleep_us(50)
+    return data
+
+
+def _crc8_py(data):
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            if crc & 1:
+                crc = (crc >> 1) ^ 0x8C
+            else:
+                crc >>= 1
+    return crc
+
+
+class OneWireError(Exception):
+    pass
+
+
+_writebyte = _fast.ow_writebyte if _fast else _writebyte_py
+_readbyte = _fast.ow_readbyte if _fast else _readbyte_py
+_crc8 = _fast.crc8 if _fast else _crc8_py
+
+
 class OneWire:
+    SEARCH_ROM = 0xF0
+    MATCH_ROM = 0x55
+    SKIP_ROM = 0xCC
+    
     def __init__(self, pin):
         self.pin = pin
         self.pin.init(pin.OPEN_DRAIN, pin.PULL_UP)
     
-    def reset(self):
-        """Reset the bus"""
+    def reset(self, required=False):
+        """Reset the bus; True if a device answered with a presence pulse"""
         self.pin.value(0)
         time.sleep_us(480)
         self.pin.value(1)
         time.sleep_us(70)
-        return self.pin.value() == 0
+        present = self.pin.value() == 0
+        time.sleep_us(410)  # let the presence pulse finish
+        if required and not present:
+            raise OneWireError
+        return present
     
-    def writebyte(self, data):
-        """Write a byte"""
-        for i in range(8):
-            self.pin.value(0)
-            time.sleep_us(2)
-            self.pin.value((data >> i) & 1)
-            time.sleep_us(60)
-            self.pin.value(1)
-            time.sleep_us(2)
+    def readbit(self):
+        """Read one bit"""
+        self.pin.value(0)
+        time.sleep_us(2)
+        self.pin.value(1)
+        time.sleep_us(8)
+        value = self.pin.value()
+        time.sleep_us(50)
+        return value
     
     def readbyte(self):
         """Read a byte"""
-        data = 0
-        for i in range(8):
-            self.pin.value(0)
-            time.sleep_us(2)
-            self.pin.value(1)
-            time.sleep_us(8)
-            data |= (self.pin.value() << i)
-            time.sleep_us(50)
-        return data
+        return _readbyte(self.pin)
+    
+    def readinto(self, buf):
+        """Fill buf with bytes read from the bus"""
+        for i in range(len(buf)):
+            buf[i] = _readbyte(self.pin)
+    
+    def writebit(self, value):
+        """Write one bit"""
+        self.pin.value(0)
+        time.sleep_us(2)
+        self.pin.value(value)
+        time.sleep_us(60)
+        self.pin.value(1)
+        time.sleep_us(2)
+    
+    def writebyte(self, data):
+        """Write a byte"""
+        _writebyte(self.pin, data)
+    
+    def write(self, buf):
+        """Write every byte of buf"""
+        for b in buf:
+            _writebyte(self.pin, b)
+    
+    def select_rom(self, rom):
+        """Address one device by its 8-byte ROM code"""
+        self.reset()
+        self.writebyte(self.MATCH_ROM)
+        self.write(rom)
+    
+    def scan(self):
+        """ROM codes of every device on the bus"""
+        devices = []
+        diff = 65
+        rom = False
+        for _ in range(0xFF):
+            rom, diff = self._search_rom(rom, diff)
+            if rom:
+                devices.append(rom)
+            if diff == 0:
+                break
+        return devices
+    
+    def _search_rom(self, l_rom, diff):
+        # One pass of the ROM search; diff is the bit where the last pass
+        # took the 1 branch at a collision
+        if not self.reset():
+            return None, 0
+        self.writebyte(self.SEARCH_ROM)
+        if not l_rom:
+            l_rom = bytearray(8)
+        rom = bytearray(8)
+        next_diff = 0
+        i = 64
+        for byte in range(8):
+            r_b = 0
+            for bit in range(8):
+                b = self.readbit()
+                if self.readbit():
+                    if b:  # no device answered, or the bus is faulty
+                        return None, 0
+                elif not b:  # collision: devices differ at this bit
+                    if diff > i or ((l_rom[byte] & (1 << bit)) and diff != i):
+                        b = 1
+                        next_diff = i
+                self.writebit(b)
+                if b:
+                    r_b |= 1 << bit
+                i -= 1
+            rom[byte] = r_b
+        return rom, next_diff
+    
+    def crc8(self, data):
+        """Dallas/Maxim CRC-8; 0 when data ends with its own CRC byte"""
+        return _crc8(data)
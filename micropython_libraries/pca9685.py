@@ -6,13 +6,18 @@ class PCA9685:
     def __init__(self, i2c, address=0x40):
         self.i2c = i2c
         self.address = address
+        # Preallocated so register access allocates nothing (safe with the heap locked)
+        self._reg = bytearray(1)
+        self._pwm = bytearray(4)
         self.reset()
 
     def _write(self, address, value):
-        self.i2c.writeto_mem(self.address, address, bytearray([value]))
+        self._reg[0] = value
+        self.i2c.writeto_mem(self.address, address, self._reg)
 
     def _read(self, address):
-        return self.i2c.readfrom_mem(self.address, address, 1)[0]
+        self.i2c.readfrom_mem_into(self.address, address, self._reg)
+        return self._reg[0]
 
     def reset(self):
         self._write(0x00, 0x00) # Mode1
@@ -30,19 +35,24 @@ class PCA9685:
 
     def pwm(self, index, on=None, off=None):
         if on is None or off is None:
-            data = self.i2c.readfrom_mem(self.address, 0x06 + 4 * index, 4)
-            return ustruct.unpack('<HH', data)
-        data = ustruct.pack('<HH', on, off)
-        self.i2c.writeto_mem(self.address, 0x06 + 4 * index,  data)
+            self.i2c.readfrom_mem_into(self.address, 0x06 + 4 * index, self._pwm)
+            return ustruct.unpack('<HH', self._pwm)
+        ustruct.pack_into('<HH', self._pwm, 0, on, off)
+        self.i2c.writeto_mem(self.address, 0x06 + 4 * index, self._pwm)
 
     def duty(self, index, value=None, invert=False):
         if value is None:
-            pwm = self.pwm(index)
-            if pwm == (0, 4096):
+            # Read back without building a tuple
+            buf = self._pwm
+            self.i2c.readfrom_mem_into(self.address, 0x06 + 4 * index, buf)
+            on = buf[0] | buf[1] << 8
+            off = buf[2] | buf[3] << 8
+            if off == 4096:
                 value = 0
-            elif pwm == (4096, 0):
+            elif on == 4096:
                 value = 4095
-            value = pwm[1]
+            else:
+                value = off
             if invert:
                 value = 4095 - value
             return value
@@ -16,13 +16,13 @@ class Servo:
         elif angle > 180:
             angle = 180
         
-        # Convert angle to duty cycle
-        duty = int((angle / 180) * 1023)
+        # Convert angle to duty cycle (integer maths: no float objects)
+        duty = int(angle * 1023) // 180
         self.pwm.duty(duty)
     
     def writeMicroseconds(self, us):
         """Set servo position in microseconds"""
-        duty = int((us / 20000) * 1023)
+        duty = int(us * 1023) // 20000
         self.pwm.duty(duty)
     
     def detach(self):
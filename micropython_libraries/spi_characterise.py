@@ -0,0 +1,146 @@
+# SPI Loopback Characterisation
+# With a jumper from MOSI to MISO, sweeps each SPI host through its clock
+# rates and modes using large write_readinto transfers from preallocated
+# buffers. Every byte is checked, and the throughput and highest error-free
+# clock are recorded and saved so display/flash drivers can use them:
+#
+#     import spi_characterise
+#     spi_characterise.characterise(sck=14, mosi=13, miso=12)   # jumper 13 -> 12
+#     baud = spi_characterise.max_baudrate(1, default=10000000)
+
+import json
+import time
+from machine import Pin, SPI, SoftSPI
+
+HOSTS = {1: "SPI(1) HSPI", 2: "SPI(2) VSPI", -1: "SoftSPI"}
+BAUDRATES = (1000000, 2000000, 5000000, 10000000, 20000000, 26666666, 40000000, 80000000)
+SOFT_BAUDRATES = (100000, 250000, 500000, 1000000, 2000000, 5000000)
+MODES = ((0, 0), (0, 1), (1, 0), (1, 1))  # (polarity, phase)
+BUFFER_SIZE = 4096
+PASSES = 4
+# Relative to the working directory, which is / on the board after boot
+LIMITS_FILE = "spi_limits.json"
+
+
+def make_pattern(n=BUFFER_SIZE):
+    """Every byte value, with neighbours differing in many bits"""
+    return bytearray((i * 0x9D + (i >> 8)) & 0xFF for i in range(n))
+
+
+def _bus(host, baud, polarity, phase, sck, mosi, miso):
+    if host == -1:
+        return SoftSPI(baudrate=baud, polarity=polarity, phase=phase, sck=Pin(sck), mosi=Pin(mosi), miso=Pin(miso))
+    return SPI(host, baudrate=baud, polarity=polarity, phase=phase, sck=Pin(sck), mosi=Pin(mosi), miso=Pin(miso))
+
+
+def errors(tx, rx):
+    """Number of bytes that came back different"""
+    if rx == tx:
+        return 0
+    count = 0
+    for i in range(len(tx)):
+        if tx[i] != rx[i]:
+            count += 1
+    return count
+
+
+def jumper_present(sck=14, mosi=13, miso=12):
+    """True if what goes out on MOSI comes back on MISO at a slow clock"""
+    tx = make_pattern(64)
+    rx = bytearray(64)
+    _bus(-1, SOFT_BAUDRATES[0], 0, 0, sck, mosi, miso).write_readinto(tx, rx)
+    return rx == tx
+
+
+def measure(spi, tx, rx, passes=PASSES):
+    """(bad bytes, bytes/s) for `passes` full-buffer transfers"""
+    bad = 0
+    start = time.ticks_us()
+    for _ in range(passes):
+        spi.write_readinto(tx, rx)
+        bad += errors(tx, rx)
+    elapsed = max(time.ticks_diff(time.ticks_us(), start), 1)
+    return bad, len(tx) * passes * 1000000 // elapsed
+
+
+def sweep(host, sck=14, mosi=13, miso=12, baudrates=None, modes=MODES, tx=None, rx=None, verbose=True):
+    """Per-mode results for one host; each mode stops at its first failing clock"""
+    baudrates = baudrates or (SOFT_BAUDRATES if host == -1 else BAUDRATES)
+    if tx is None:
+        tx = make_pattern()
+    if rx is None:
+        rx = bytearray(len(tx))
+    results = []
+    for polarity, phase in modes:
+        for baud in baudrates:
+            try:
+                spi = _bus(host, baud, polarity, phase, sck, mosi, miso)
+            except (ValueError, OSError):
+                break
+            bad, rate = measure(spi, tx, rx)
+            spi.deinit()
+            results.append({"host": host, "mode": (polarity, phase), "baud": baud,
+                            "errors": bad, "bytes_per_s": rate})
+            if verbose:
+                mark = "✅" if not bad else "❌"
+                print(f"  {mark} {HOSTS[host]:<12} mode {polarity}{phase} {baud / 1e6:6.2f} MHz "
+                      f"{rate / 1024:8.1f} KB/s" + (f"  {bad} bad bytes" if bad else ""))
+            if bad:
+                break
+    return results
+
+
+def limits(results):
+    """{'max_baud', 'bytes_per_s', 'modes'} from a sweep: the slowest mode sets max_baud"""
+    modes = {}
+    best_rate = 0
+    for r in results:
+        key = f"{r['mode'][0]}{r['mode'][1]}"
+        modes.setdefault(key, 0)
+        if not r["errors"]:
+            modes[key] = max(modes[key], r["baud"])
+            best_rate = max(best_rate, r["bytes_per_s"])
+    return {"max_baud": min(modes.values()) if modes else 0, "bytes_per_s": best_rate, "modes": modes}
+
+
+def characterise(sck=14, mosi=13, miso=12, hosts=(1, 2, -1), save=True, verbose=True):
+    """Sweep every host on the jumpered pins; returns (and saves) the limits"""
+    tx = make_pattern()
+    rx = bytearray(len(tx))
+    found = {"pins": [sck, mosi, miso], "hosts": {}}
+    for host in hosts:
+        if verbose:
+            print(f"🔁 {HOSTS[host]} (SCK={sck} MOSI={mosi} MISO={miso})")
+        found["hosts"][str(host)] = limits(sweep(host, sck, mosi, miso, tx=tx, rx=rx, verbose=verbose))
+    if verbose:
+        for host in hosts:
+            entry = found["hosts"][str(host)]
+            print(f"📈 {HOSTS[host]:<12} max {entry['max_baud'] / 1e6:.2f} MHz, "
+                  f"{entry['bytes_per_s'] / 1024:.1f} KB/s")
+    if save:
+        save_limits(found)
+    return found
+
+
+def save_limits(found, path=LIMITS_FILE):
+    with open(path, "w") as f:
+        json.dump(found, f)
+
+
+def load_limits(path=LIMITS_FILE):
+    try:
+        with open(path) as f:
+            return json.load(f)
+    except (OSError, ValueError):
+        return None
+
+
+def max_baudrate(host, default=None, mode=None, path=LIMITS_FILE):
+    """Highest measured error-free clock for a host (and mode like (0, 0)), else default"""
+    saved = load_limits(path)
+    entry = saved and saved["hosts"].get(str(host))
+    if not entry or not entry["max_baud"]:
+        return default
+    if mode is not None:
+        return entry["modes"].get(f"{mode[0]}{mode[1]}") or default
+    return entry["max_baud"]
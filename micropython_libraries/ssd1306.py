@@ -25,15 +25,58 @@ SET_VCOM_DESEL = const(0xDB)
 SET_CHARGE_PUMP = const(0x8D)
 
 
+class ImageFile:
+    """Frames from a packed image file (made by image_converter.py on the host)
+
+    Every frame is read into the same preallocated buffer, so playing an
+    animation allocates nothing after the file is opened.
+    """
+
+    def __init__(self, path):
+        import struct
+
+        self.file = open(path, "rb")
+        header = self.file.read(10)
+        if header[:4] != b"MPI1":
+            self.file.close()
+            raise ValueError("not a packed image file: %s" % path)
+        self.width, self.height, self.frames = struct.unpack_from("<HHH", header, 4)
+        self.delays = struct.unpack("<%dH" % self.frames, self.file.read(2 * self.frames))
+        self.frame_size = self.width * ((self.height + 7) // 8)
+        self.data_start = 10 + 2 * self.frames
+        self.buffer = bytearray(self.frame_size)
+        self.framebuf = framebuf.FrameBuffer(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
+
+    def read_into(self, index, buf):
+        self.file.seek(self.data_start + index * self.frame_size)
+        self.file.readinto(buf)
+
+    def read(self, index):
+        """The frame as a FrameBuffer (the shared one: valid until the next read)"""
+        self.read_into(index, self.buffer)
+        return self.framebuf
+
+    def close(self):
+        self.file.close()
+
+
 # Subclassing FrameBuffer provides support for graphics primitives
 # http://docs.micropython.org/en/latest/pyboard/library/framebuf.html
 class SSD1306(framebuf.FrameBuffer):
-    def __init__(self, width, height, external_vcc):
+    def __init__(self, width, height, external_vcc, buffer=None):
         self.width = width
         self.height = height
         self.external_vcc = external_vcc
         self.pages = self.height // 8
-        self.buffer = bytearray(self.pages * self.width)
+        # Pass buffer= to draw into an existing bytearray (e.g. one shared by several panels)
+        if buffer is None:
+            buffer = bytearray(self.pages * self.width)
+        elif len(buffer) < self.pages * self.width:
+            raise ValueError("buffer too small for %dx%d" % (width, height))
+        self.buffer = buffer
+        # One view per page, made now: slicing in show() would allocate every call
+        view = memoryview(buffer)
+        self.page_views = [view[p * width:(p + 1) * width] for p in range(self.pages)]
         super().__init__(self.buffer, self.width, self.height, framebuf.MONO_VLSB)
         self.init_display()
 
@@ -93,7 +136,10 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(SET_COM_OUT_DIR | ((rotate & 1) << 3))
         self.write_cmd(SET_SEG_REMAP | (rotate & 1))
 
-    def show(self):
+    def show(self, first_page=0, last_page=None):
+        # A page is 8 pixel rows; pass a range to send only the rows that changed
+        if last_page is None:
+            last_page = self.pages - 1
         x0 = 0
         x1 = self.width - 1
         if self.width != 128:
@@ -105,18 +151,51 @@ class SSD1306(framebuf.FrameBuffer):
         self.write_cmd(x0)
         self.write_cmd(x1)
         self.write_cmd(SET_PAGE_ADDR)
-        self.write_cmd(0)
-        self.write_cmd(self.pages - 1)
-        self.write_data(self.buffer)
+        self.write_cmd(first_page)
+        self.write_cmd(last_page)
+        if first_page == 0 and last_page == self.pages - 1:
+            self.write_data(self.buffer)
+        else:
+            # The column/page pointer carries on from one write to the next
+            for page in range(first_page, last_page + 1):
+                self.write_data(self.page_views[page])
+
+
+    def draw_frame(self, image, index=0, x=0, y=0, key=-1):
+        """Put one frame of an ImageFile into the buffer; a full-screen frame is read straight in"""
+        if image.width == self.width and image.height == self.height and x == 0 and y == 0 and key == -1:
+            image.read_into(index, self.buffer)
+        else:
+            self.blit(image.read(index), x, y, key)
+
+    def play(self, image, loops=1, x=0, y=0, key=-1, delay_ms=None):
+        """Show every frame of an ImageFile, loops times (0: forever)
+
+        Frames keep their stored delays unless delay_ms is given; 0 runs at
+        the panel's full refresh rate.
+        """
+        import time
+
+        done = 0
+        while not loops or done < loops:
+            for i in range(image.frames):
+                start = time.ticks_ms()
+                self.draw_frame(image, i, x, y, key)
+                self.show()
+                wait = image.delays[i] if delay_ms is None else delay_ms
+                left = wait - time.ticks_diff(time.ticks_ms(), start)
+                if left > 0:
+                    time.sleep_ms(left)
+            done += 1
 
 
 class SSD1306_I2C(SSD1306):
-    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False):
+    def __init__(self, width, height, i2c, addr=0x3C, external_vcc=False, buffer=None):
         self.i2c = i2c
         self.addr = addr
         self.temp = bytearray(2)
         self.write_list = [b"\x40", None]  # Co=0, D/C#=1
-        super().__init__(width, height, external_vcc)
+        super().__init__(width, height, external_vcc, buffer)
 
     def write_cmd(self, cmd):
         self.temp[0] = 0x80  # Co=1, D/C#=0
@@ -129,8 +208,9 @@ class SSD1306_I2C(SSD1306):
 
 
 class SSD1306_SPI(SSD1306):
-    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False):
-        self.rate = 10 * 1024 * 1024
+    def __init__(self, width, height, spi, dc, res, cs, external_vcc=False, baudrate=None, buffer=None):
+        # Pass a measured limit (spi_characterise.max_baudrate) to go below the default
+        self.rate = baudrate or 10 * 1024 * 1024
         dc.init(dc.OUT, value=0)
         res.init(res.OUT, value=0)
         cs.init(cs.OUT, value=1)
@@ -138,6 +218,7 @@ class SSD1306_SPI(SSD1306):
         self.dc = dc
         self.res = res
         self.cs = cs
+        self.cmd = bytearray(1)
         import time
 
         self.res(1)
@@ -145,14 +226,15 @@ class SSD1306_SPI(SSD1306):
         self.res(0)
         time.sleep_ms(10)
         self.res(1)
-        super().__init__(width, height, external_vcc)
+        super().__init__(width, height, external_vcc, buffer)
 
     def write_cmd(self, cmd):
         self.spi.init(baudrate=self.rate, polarity=0, phase=0)
         self.cs(1)
         self.dc(0)
         self.cs(0)
-        self.spi.write(bytearray([cmd]))
+        self.cmd[0] = cmd
+        self.spi.write(self.cmd)
         self.cs(1)
 
     def write_data(self, buf):
@@ -5,10 +5,28 @@ import time
 import math
 import random
 
+try:
+    import fast_loops as _fast
+except (ImportError, SyntaxError, ValueError):
+    _fast = None  # not installed, or firmware without the native emitter
+
 def map_value(x, in_min, in_max, out_min, out_max):
     """Map a value from one range to another"""
     return (x - in_min) * (out_max - out_min) // (in_max - in_min) + out_min
 
+def _map_values_py(src, dst, in_min, in_max, out_min, out_max):
+    scale = out_max - out_min
+    span = in_max - in_min
+    for i in range(len(src)):
+        dst[i] = (src[i] - in_min) * scale // span + out_min
+    return dst
+
+def map_values(src, dst, in_min, in_max, out_min, out_max):
+    """map_value over a whole buffer of readings (e.g. array('H') from ADC), into dst"""
+    return _map_values(src, dst, in_min, in_max, out_min, out_max)
+
+_map_values = _fast.map_values if _fast else _map_values_py
+
 def constrain(value, min_val, max_val):
     """Constrain a value between min and max"""
     return max(min_val, min(value, max_val))
@@ -0,0 +1,123 @@
+# MicroPython simulator for CPython
+# Installs fake machine, micropython, framebuf and time modules backed by a
+# virtual ESP32 so device scripts and libraries can run on the host:
+#
+#     import mpsim
+#     mpsim.install()
+#     import ssd1306            # now talks to mpsim.BOARD
+#
+# or from a shell:  python -m mpsim tests/main_test_runner.py
+#                    python -m mpsim --virtual tests/main_test_runner.py
+
+import sys
+import types
+
+from . import board as _board
+from . import devices
+from .board import BOARD, Board
+from .clock import RealClock, VirtualClock
+from .devices import (Constant, DHTDevice, DS18B20Device, I2CDevice, Noise, PCA9685Device,
+                      Ramp, RegisterDevice, Sine, Square, SSD1306Device, TCA9548ADevice)
+
+# u-prefixed MicroPython names that map straight onto CPython modules
+ALIASES = {
+    "ustruct": "struct",
+    "ubinascii": "binascii",
+    "ujson": "json",
+    "uos": "os",
+    "urandom": "random",
+    "ucollections": "collections",
+    "uhashlib": "hashlib",
+    "uerrno": "errno",
+    "uio": "io",
+    "ure": "re",
+    "uselect": "select",
+    "uzlib": "zlib",
+}
+
+_saved = {}
+
+
+def _gc_module():
+    import gc as host_gc
+    mod = types.ModuleType("gc")
+    mod.collect = host_gc.collect
+    mod.enable = host_gc.enable
+    mod.disable = host_gc.disable
+    mod.isenabled = host_gc.isenabled
+    mod.mem_free = lambda: 111168
+    mod.mem_alloc = lambda: 0
+    mod.threshold = lambda amount=None: -1 if amount is None else None
+    return mod
+
+
+def _esp_module():
+    from . import machine
+    mod = types.ModuleType("esp")
+    mod.dht_readinto = machine.dht_readinto
+    mod.osdebug = lambda level: None
+    mod.flash_size = lambda: 4 * 1024 * 1024
+    return mod
+
+
+def attach_defaults(board=None):
+    """Wire up the lab kit: OLED at 0x3C, PCA9685 at 0x40, a pot on GPIO34
+
+    With the virtual clock a DS18B20 sits on GPIO4 too: 1-Wire slots are a
+    few microseconds long, which host sleeps on the real clock can't keep.
+    """
+    board = board or BOARD
+    board.attach_i2c(SSD1306Device(0x3C))
+    board.attach_i2c(PCA9685Device(0x40))
+    board.attach_adc(34, Ramp())
+    board.attach_adc(35, Sine())
+    board.attach_adc(36, Constant(1.65))
+    board.attach_dht(4, DHTDevice())
+    if isinstance(board.clock, VirtualClock):
+        board.attach_onewire(4, DS18B20Device())
+    return board
+
+
+def install(defaults=True, virtual_time=False):
+    """Register the simulated modules in sys.modules
+
+    With virtual_time=True sleeps return immediately and advance a
+    simulated clock instead, so sleep-heavy suites finish in milliseconds.
+    """
+    from . import deflate, framebuf, machine, micropython, utime
+    if virtual_time and not isinstance(BOARD.clock, VirtualClock):
+        BOARD.clock = VirtualClock()
+    if defaults and not BOARD.i2c:
+        attach_defaults()
+    time_mod = utime.build(BOARD)
+    modules = {
+        "machine": machine,
+        "micropython": micropython,
+        "framebuf": framebuf,
+        "deflate": deflate,
+        "time": time_mod,
+        "utime": time_mod,
+        "gc": _gc_module(),
+        "esp": _esp_module(),
+    }
+    for alias, target in ALIASES.items():
+        try:
+            modules[alias] = __import__(target)
+        except ImportError:
+            pass
+    for name, module in modules.items():
+        if name not in _saved:
+            _saved[name] = sys.modules.get(name)
+        sys.modules[name] = module
+    micropython.install_viper_builtins()
+    return BOARD
+
+
+def uninstall():
+    """Put back whatever install() replaced"""
+    for name, module in _saved.items():
+        if module is None:
+            sys.modules.pop(name, None)
+        else:
+            sys.modules[name] = module
+    _saved.clear()
@@ -0,0 +1,54 @@
+#!/usr/bin/env python3
+"""
+Run a MicroPython script on the host against the simulated board
+Usage: python -m mpsim [--bare] [--virtual] script.py [args...]
+"""
+
+import os
+import runpy
+import sys
+import time
+
+import mpsim
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+LIBRARY_DIR = os.path.join(REPO_ROOT, "micropython_libraries")
+TESTS_DIR = os.path.join(REPO_ROOT, "tests")
+
+
+def main():
+    args = sys.argv[1:]
+    bare = "--bare" in args
+    virtual = "--virtual" in args
+    args = [a for a in args if a not in ("--bare", "--virtual")]
+    if not args:
+        print("Usage: python -m mpsim [--bare] [--virtual] script.py [args...]")
+        print("  --bare      start with no devices attached to the board")
+        print("  --virtual   sleeps advance a virtual clock instead of waiting")
+        sys.exit(1)
+
+    script = os.path.abspath(args[0])
+    if not os.path.exists(script):
+        print(f"❌ Script not found: {script}")
+        sys.exit(1)
+
+    board = mpsim.install(defaults=not bare, virtual_time=virtual)
+    # Same import path the board has: its own folder plus /lib (our libraries),
+    # and /tests for the category modules (they import registry from there)
+    path = [os.path.dirname(script), LIBRARY_DIR]
+    if os.path.commonpath([script, TESTS_DIR]) == TESTS_DIR:
+        path.append(TESTS_DIR)
+    sys.path[:0] = path
+    sys.argv = args
+    wall_start = time.perf_counter()
+    try:
+        runpy.run_path(script, run_name="__main__")
+    finally:
+        if virtual:
+            wall = time.perf_counter() - wall_start
+            simulated = board.clock.now_us() / 1_000_000
+            print(f"⏱️  Simulated {simulated:.3f}s of board time in {wall * 1000:.0f} ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+# Simulated ESP32 board state
+# Holds everything the fake machine module talks to: pin levels and jumpers,
+# ADC signal sources, I2C devices, DHT sensors, 1-Wire probes and the clock
+
+import collections
+
+from .clock import RealClock
+
+# Default pins of the ESP32 hardware buses (MicroPython port defaults)
+I2C_DEFAULT_PINS = {0: (19, 18), 1: (26, 25)}        # id: (sda, scl)
+SPI_DEFAULT_PINS = {1: (14, 13, 12), 2: (18, 23, 19)}  # id: (sck, mosi, miso)
+UART_DEFAULT_PINS = {0: (1, 3), 1: (10, 9), 2: (17, 16)}  # id: (tx, rx)
+
+PIN_HISTORY = 256  # transitions kept per pin
+
+
+class PinState:
+    """What the board knows about one GPIO"""
+
+    def __init__(self):
+        self.mode = None
+        self.pull = None
+        self.value = 0
+        self.irq_handler = None
+        self.irq_trigger = 0
+        self.irq_pin = None
+        self.history = collections.deque(maxlen=PIN_HISTORY)
+
+
+class Board:
+    """A virtual ESP32 with pluggable devices"""
+
+    def __init__(self, clock=None):
+        self.clock = clock or RealClock()
+        self.reset()
+
+    def reset(self):
+        """Forget all pin state and detach every device"""
+        self.pins = collections.defaultdict(PinState)
+        self.links = collections.defaultdict(set)
+        self.levels = {}
+        self.adc_sources = {}
+        self.i2c = []
+        self.dht = {}
+        self.onewire = collections.defaultdict(list)
+        self.pwm = {}
+        self.bitstreams = []
+
+    # ---- wiring ----
+
+    def connect(self, pin_a, pin_b):
+        """Add a jumper wire between two pins (loopback)"""
+        self.links[pin_a].add(pin_b)
+        self.links[pin_b].add(pin_a)
+
+    def drive(self, pin, level):
+        """Drive a pin from outside the board (button, sensor output); None releases it"""
+        old = self.level(pin)
+        if level is None:
+            self.levels.pop(pin, None)
+        else:
+            self.levels[pin] = 1 if level else 0
+        self._fire_irq(pin, old, self.level(pin))
+
+    def attach_adc(self, pin, source):
+        """Feed an ADC pin from a signal source: source(t_seconds) -> volts"""
+        self.adc_sources[pin] = source
+
+    def attach_i2c(self, device, sda=None, scl=None):
+        """Put an I2C device on the bus using these pins (None: every bus)"""
+        self.i2c.append((device, sda, scl))
+        return device
+
+    def attach_dht(self, pin, device):
+        """Connect a DHT11/DHT22 sensor to a pin"""
+        self.dht[pin] = device
+        return device
+
+    def attach_onewire(self, pin, device):
+        """Put a 1-Wire device (DS18B20Device) on a pin; several can share one"""
+        self.onewire[pin].append(device)
+        return device
+
+    # ---- queries used by the machine module ----
+
+    def i2c_devices(self, sda, scl):
+        """Devices reachable on a bus, keyed by address"""
+        found = {}
+        for device, dev_sda, dev_scl in self.i2c:
+            if dev_sda in (None, sda) and dev_scl in (None, scl):
+                found.setdefault(device.addr, device)
+        # Devices behind an I2C switch answer while their channel is on
+        for device in list(found.values()):
+            if hasattr(device, "downstream"):
+                for behind in device.downstream():
+                    found.setdefault(behind.addr, behind)
+        return found
+
+    def adc_volts(self, pin):
+        source = self.adc_sources.get(pin)
+        if source is None:
+            return 0.0
+        return float(source(self.clock.now_us() / 1_000_000))
+
+    def level(self, pin):
+        """Logic level seen on a pin by an input"""
+        state = self.pins[pin]
+        if state.mode == "out" and pin not in self.levels:
+            return state.value
+        if state.mode == "open_drain" and state.value == 0:
+            return 0
+        if pin in self.onewire:
+            now = self.clock.now_us()
+            if any(device.pulling_low(now) for device in self.onewire[pin]):
+                return 0
+        for other in self.links[pin]:
+            other_state = self.pins[other]
+            if other_state.mode == "out":
+                return other_state.value
+            if other_state.mode == "open_drain" and other_state.value == 0:
+                return 0
+        if pin in self.levels:
+            return self.levels[pin]
+        if state.pull == "up" or state.mode == "open_drain":
+            return 1
+        return 0
+
+    def set_output(self, pin, value):
+        """Record an output change and wake any IRQs on the pins it drives"""
+        state = self.pins[pin]
+        value = 1 if value else 0
+        if value == state.value and state.history:
+            return
+        before = {p: self.level(p) for p in self.links[pin]}
+        state.value = value
+        state.history.append((self.clock.now_us(), value))
+        for device in self.onewire.get(pin, ()):
+            device.edge(self.clock.now_us(), value)
+        for other, old in before.items():
+            self._fire_irq(other, old, self.level(other))
+
+    def _fire_irq(self, pin, old, new):
+        state = self.pins[pin]
+        if state.irq_handler is None or old == new:
+            return
+        rising = 1 if new else 2  # Pin.IRQ_RISING / Pin.IRQ_FALLING
+        if state.irq_trigger & rising:
+            state.irq_handler(state.irq_pin)
+
+    def transitions(self, pin):
+        """[(ticks_us, value)] of recent output changes on a pin"""
+        return list(self.pins[pin].history)
+
+
+BOARD = Board()
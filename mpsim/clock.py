@@ -0,0 +1,134 @@
+# Clocks for the MicroPython simulator
+# Provide ticks_us/sleep_us and run machine.Timer callbacks in due order
+
+import heapq
+import itertools
+import time as _host_time
+
+# MicroPython's ticks_* values wrap at 2**30 on the ESP32
+TICKS_PERIOD = 1 << 30
+TICKS_MAX = TICKS_PERIOD - 1
+TICKS_HALFPERIOD = TICKS_PERIOD // 2
+
+
+def ticks_add(ticks, delta):
+    """Offset a ticks value, wrapping like MicroPython"""
+    return (ticks + delta) & TICKS_MAX
+
+
+def ticks_diff(end, start):
+    """Signed difference between two ticks values, wrapping like MicroPython"""
+    return ((end - start + TICKS_HALFPERIOD) & TICKS_MAX) - TICKS_HALFPERIOD
+
+
+class Clock:
+    """Base clock: a microsecond counter plus a queue of timer callbacks
+
+    Timer callbacks are cooperative: they run from inside sleep_*() calls
+    (and machine.idle()), in due-time order, which is when MicroPython
+    code on a board would normally give them a chance to run.
+    """
+
+    def __init__(self):
+        self._timers = []
+        self._sequence = itertools.count()
+        self._in_callback = False
+
+    def now_us(self):
+        raise NotImplementedError
+
+    def _wait_until(self, deadline_us):
+        raise NotImplementedError
+
+    def spend_us(self, us):
+        """Account for time a peripheral transfer would take on hardware"""
+
+    def time(self):
+        """Seconds since the epoch"""
+        return _host_time.time()
+
+    def schedule(self, due_us, callback):
+        """Run callback() once the clock reaches due_us; returns a cancel handle"""
+        entry = [due_us, next(self._sequence), callback]
+        heapq.heappush(self._timers, entry)
+        return entry
+
+    def cancel(self, entry):
+        entry[2] = None
+
+    def run_due(self):
+        """Run every timer callback that is due now"""
+        if self._in_callback:
+            return
+        while self._timers and self._timers[0][0] <= self.now_us():
+            _, _, callback = heapq.heappop(self._timers)
+            if callback is not None:
+                self._in_callback = True
+                try:
+                    callback()
+                finally:
+                    self._in_callback = False
+
+    def sleep_us(self, us):
+        """Sleep, running timer callbacks that fall due along the way"""
+        deadline = self.now_us() + max(0, int(us))
+        while True:
+            self.run_due()
+            pending = [t for t in self._timers if t[2] is not None]
+            next_due = min((t[0] for t in pending), default=None)
+            if next_due is None or next_due > deadline or self._in_callback:
+                break
+            self._wait_until(next_due)
+        self._wait_until(deadline)
+        self.run_due()
+
+
+class RealClock(Clock):
+    """Clock that follows the host's monotonic time"""
+
+    def __init__(self):
+        super().__init__()
+        self._origin = _host_time.perf_counter()
+
+    def now_us(self):
+        return int((_host_time.perf_counter() - self._origin) * 1_000_000)
+
+    def _wait_until(self, deadline_us):
+        # Short slices, so an interrupt raised in this thread (Ctrl-C on the
+        # fake board) is delivered promptly
+        remaining = deadline_us - self.now_us()
+        while remaining > 0:
+            _host_time.sleep(min(remaining, 50_000) / 1_000_000)
+            remaining = deadline_us - self.now_us()
+
+
+class VirtualClock(Clock):
+    """Simulated time: sleeps return at once and just move the clock forward
+
+    Timer callbacks still fire in due order while the clock jumps, and
+    peripheral transfers (spend_us) cost their bus time, so ticks-based
+    timing checks see the durations real hardware would.
+    """
+
+    def __init__(self, start_us=0, epoch=None):
+        super().__init__()
+        self._now = int(start_us)
+        self._epoch = _host_time.time() if epoch is None else epoch
+
+    def now_us(self):
+        return self._now
+
+    def _wait_until(self, deadline_us):
+        if deadline_us > self._now:
+            self._now = int(deadline_us)
+
+    def spend_us(self, us):
+        self._now += max(0, int(us))
+
+    def advance_us(self, us):
+        """Move time forward from outside the script, running due timers"""
+        self.spend_us(us)
+        self.run_due()
+
+    def time(self):
+        return self._epoch + self._now / 1_000_000
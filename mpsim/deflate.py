@@ -0,0 +1,98 @@
+# Simulated MicroPython deflate module (firmware v1.21+)
+# DeflateIO wraps a stream and decompresses on read / compresses on write,
+# implemented with CPython's zlib
+
+import zlib
+
+AUTO = 0
+RAW = 1
+ZLIB = 2
+GZIP = 3
+
+_CHUNK = 256
+
+
+def _wbits(format, wbits, compress):
+    bits = wbits or (8 if compress else 15)
+    if format == RAW:
+        return -bits
+    if format == GZIP:
+        return 16 + bits
+    if format == AUTO and not compress:
+        return 32 + 15  # zlib or gzip header, detected automatically
+    return bits
+
+
+class DeflateIO:
+    def __init__(self, stream, format=AUTO, wbits=0, close=False):
+        self.stream = stream
+        self.format = format
+        self.wbits = wbits
+        self.close_stream = close
+        self._decomp = None
+        self._comp = None
+        self._pending = b""
+        self._eof = False
+
+    # ---- reading (decompression) ----
+
+    def _fill(self, want):
+        if self._decomp is None:
+            self._decomp = zlib.decompressobj(_wbits(self.format, self.wbits, False))
+        while len(self._pending) < want and not self._eof:
+            raw = self.stream.read(_CHUNK)
+            if not raw:
+                self._pending += self._decomp.flush()
+                self._eof = True
+                break
+            try:
+                self._pending += self._decomp.decompress(raw)
+            except zlib.error:
+                raise OSError(22, "EINVAL")
+            if self._decomp.eof:
+                self._eof = True
+
+    def read(self, n=-1):
+        if n is None or n < 0:
+            self._fill(float("inf"))
+            n = len(self._pending)
+        else:
+            self._fill(n)
+        data, self._pending = self._pending[:n], self._pending[n:]
+        return data
+
+    def readinto(self, buf):
+        data = self.read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+    def readline(self):
+        line = b""
+        while not line.endswith(b"\n"):
+            ch = self.read(1)
+            if not ch:
+                break
+            line += ch
+        return line
+
+    # ---- writing (compression) ----
+
+    def write(self, data):
+        if self._comp is None:
+            format = ZLIB if self.format == AUTO else self.format
+            self._comp = zlib.compressobj(9, zlib.DEFLATED, _wbits(format, self.wbits, True))
+        self.stream.write(self._comp.compress(bytes(data)))
+        return len(data)
+
+    def close(self):
+        if self._comp is not None:
+            self.stream.write(self._comp.flush())
+            self._comp = None
+        if self.close_stream:
+            self.stream.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
@@ -0,0 +1,445 @@
+# Virtual devices for the MicroPython simulator
+# I2C peripherals (SSD1306 OLED, PCA9685 PWM), DHT sensors, 1-Wire DS18B20
+# probes and ADC signal generators that can be attached to mpsim.BOARD
+
+import math
+import random
+
+
+class I2CDevice:
+    """Base I2C target: one write() per write transaction, one read() per read"""
+
+    # Highest SCL frequency this part still answers reliably at
+    max_freq = 1_000_000
+
+    def __init__(self, addr):
+        self.addr = addr
+
+    def write(self, data):
+        pass
+
+    def read(self, n):
+        return bytes(n)
+
+
+class RegisterDevice(I2CDevice):
+    """8-bit register file; the first byte written sets the register pointer"""
+
+    def __init__(self, addr, size=256, reset=None):
+        super().__init__(addr)
+        self.size = size
+        self.reset_values = dict(reset or {})
+        self.reset()
+
+    def reset(self):
+        self.regs = bytearray(self.size)
+        for reg, value in self.reset_values.items():
+            self.regs[reg] = value
+        self.pointer = 0
+
+    @property
+    def auto_increment(self):
+        return True
+
+    def write(self, data):
+        if not data:
+            return
+        self.pointer = data[0] % self.size
+        for value in data[1:]:
+            self.write_register(self.pointer, value)
+            self._advance()
+
+    def read(self, n):
+        out = bytearray()
+        for _ in range(n):
+            out.append(self.read_register(self.pointer))
+            self._advance()
+        return bytes(out)
+
+    def write_register(self, reg, value):
+        self.regs[reg] = value
+
+    def read_register(self, reg):
+        return self.regs[reg]
+
+    def _advance(self):
+        if self.auto_increment:
+            self.pointer = (self.pointer + 1) % self.size
+
+
+class PCA9685Device(RegisterDevice):
+    """NXP PCA9685 16-channel PWM controller"""
+
+    MODE1 = 0x00
+    MODE2 = 0x01
+    LED0_ON_L = 0x06
+    PRESCALE = 0xFE
+    OSC_HZ = 25_000_000
+
+    def __init__(self, addr=0x40):
+        super().__init__(addr, reset={self.MODE1: 0x11, self.MODE2: 0x04, self.PRESCALE: 0x1E})
+
+    @property
+    def auto_increment(self):
+        return bool(self.regs[self.MODE1] & 0x20)
+
+    def write_register(self, reg, value):
+        # The prescaler can only be changed while the oscillator is asleep
+        if reg == self.PRESCALE and not self.regs[self.MODE1] & 0x10:
+            return
+        self.regs[reg] = value
+
+    def channel(self, index):
+        """(on, off) counts of a channel, as pca9685.pwm() would read them"""
+        base = self.LED0_ON_L + 4 * index
+        r = self.regs
+        return (r[base] | r[base + 1] << 8, r[base + 2] | r[base + 3] << 8)
+
+    def frequency(self):
+        return self.OSC_HZ / (4096 * (self.regs[self.PRESCALE] + 1))
+
+
+class SSD1306Device(I2CDevice):
+    """Solomon SSD1306 OLED controller with its 128x64 display RAM"""
+
+    max_freq = 400_000  # fast-mode part
+
+    # Number of parameter bytes following each multi-byte command
+    _ARGS = {
+        0x20: 1, 0x21: 2, 0x22: 2, 0x26: 6, 0x27: 6, 0x29: 5, 0x2A: 5,
+        0x81: 1, 0x8D: 1, 0xA3: 2, 0xA8: 1, 0xAD: 1, 0xD3: 1, 0xD5: 1,
+        0xD9: 1, 0xDA: 1, 0xDB: 1,
+    }
+
+    def __init__(self, addr=0x3C, width=128, height=64):
+        super().__init__(addr)
+        self.width = width
+        self.height = height
+        self.pages = height // 8
+        self.ram = bytearray(128 * 8)
+        self.display_on = False
+        self.inverted = False
+        self.contrast = 0x7F
+        self.start_line = 0
+        self.mode = 0x02  # page addressing after reset
+        self.col_start, self.col_end = 0, 127
+        self.page_start, self.page_end = 0, 7
+        self.col, self.page = 0, 0
+        self.data_bytes = 0
+        self._command = []
+
+    # ---- bus interface ----
+
+    def write(self, data):
+        i = 0
+        while i < len(data):
+            control = data[i]
+            i += 1
+            continuation = control & 0x80
+            is_data = control & 0x40
+            end = i + 1 if continuation else len(data)
+            for byte in data[i:end]:
+                if is_data:
+                    self._data(byte)
+                else:
+                    self._cmd(byte)
+            i = end
+
+    def read(self, n):
+        # Status byte: bit 6 set while the display is off
+        status = 0x03 | (0x00 if self.display_on else 0x40)
+        return bytes([status] * n)
+
+    # ---- controller behaviour ----
+
+    def _cmd(self, byte):
+        if self._command:
+            self._command.append(byte)
+        elif byte in self._ARGS:
+            self._command = [byte]
+        else:
+            self._simple_cmd(byte)
+            return
+        op = self._command[0]
+        if len(self._command) - 1 < self._ARGS[op]:
+            return
+        args, self._command = self._command[1:], []
+        if op == 0x20:
+            self.mode = args[0] & 0x03
+        elif op == 0x21:
+            self.col_start, self.col_end = args[0] & 0x7F, args[1] & 0x7F
+            self.col = self.col_start
+        elif op == 0x22:
+            self.page_start, self.page_end = args[0] & 0x07, args[1] & 0x07
+            self.page = self.page_start
+        elif op == 0x81:
+            self.contrast = args[0]
+
+    def _simple_cmd(self, byte):
+        if byte in (0xAE, 0xAF):
+            self.display_on = byte == 0xAF
+        elif byte in (0xA6, 0xA7):
+            self.inverted = byte == 0xA7
+        elif 0x40 <= byte <= 0x7F:
+            self.start_line = byte & 0x3F
+        elif 0xB0 <= byte <= 0xB7:
+            self.page = byte & 0x07
+        elif byte <= 0x0F:
+            self.col = (self.col & 0xF0) | byte
+        elif byte <= 0x1F:
+            self.col = (self.col & 0x0F) | ((byte & 0x0F) << 4)
+
+    def _data(self, byte):
+        self.ram[self.page * 128 + self.col] = byte
+        self.data_bytes += 1
+        if self.mode == 0x00:  # horizontal
+            if self.col >= self.col_end:
+                self.col = self.col_start
+                self.page = self.page_start if self.page >= self.page_end else self.page + 1
+            else:
+                self.col += 1
+        elif self.mode == 0x01:  # vertical
+            if self.page >= self.page_end:
+                self.page = self.page_start
+                self.col = self.col_start if self.col >= self.col_end else self.col + 1
+            else:
+                self.page += 1
+        else:  # page
+            self.col = min(self.col + 1, 127)
+
+    # ---- inspection helpers for tests ----
+
+    def pixel(self, x, y):
+        """Pixel as the panel shows it (column remap ignored, start line applied)"""
+        y = (y + self.start_line) % 64
+        return (self.ram[(y // 8) * 128 + x] >> (y % 8)) & 1
+
+    def render(self, on="#", off="."):
+        """Display contents as text, one row per pixel line"""
+        return "\n".join(
+            "".join(on if self.pixel(x, y) else off for x in range(self.width))
+            for y in range(self.height)
+        )
+
+
+class TCA9548ADevice(I2CDevice):
+    """TI TCA9548A 8-channel I2C switch; bit n of the control byte connects channel n"""
+
+    def __init__(self, addr=0x70):
+        super().__init__(addr)
+        self.control = 0
+        self.channels = [[] for _ in range(8)]
+        self.selects = 0  # control writes, for tests counting bus traffic
+
+    def attach(self, channel, device):
+        """Put a device behind one channel"""
+        self.channels[channel].append(device)
+        return device
+
+    def write(self, data):
+        if data:
+            self.control = data[-1]
+            self.selects += 1
+
+    def read(self, n):
+        return bytes([self.control]) * n
+
+    def downstream(self):
+        """Devices on the channels that are switched on"""
+        for channel in range(8):
+            if self.control >> channel & 1:
+                yield from self.channels[channel]
+
+
+class DHTDevice:
+    """DHT11 or DHT22 temperature/humidity sensor"""
+
+    def __init__(self, kind="DHT22", temperature=21.5, humidity=45.0):
+        self.kind = kind
+        self.temperature = temperature
+        self.humidity = humidity
+
+    def frame(self):
+        """The 5 bytes the sensor sends, including the checksum"""
+        if self.kind == "DHT11":
+            data = [int(self.humidity), 0, int(self.temperature), 0]
+        else:
+            h = int(round(self.humidity * 10))
+            t = int(round(abs(self.temperature) * 10))
+            data = [h >> 8, h & 0xFF, (t >> 8) | (0x80 if self.temperature < 0 else 0), t & 0xFF]
+        return bytes(data + [sum(data) & 0xFF])
+
+
+class DS18B20Device:
+    """DS18B20 on a 1-Wire pin, decoding the bus master's slots from pin timing
+
+    The board reports each edge the master drives (edge()) and asks whether
+    the probe is pulling the line low (pulling_low()). A low of 400 us or more
+    is a reset; a shorter one is a write-1 (under 30 us) or write-0 slot, or
+    a read slot when the probe has a bit to send.
+    """
+
+    RESET_US = 400
+    WRITE_ONE_US = 30   # a write slot held low longer than this is a 0
+    HOLD_US = 30        # how long a 0 bit is held low in a read slot
+
+    def __init__(self, serial=1, temperature=21.5):
+        rom = bytes([0x28]) + serial.to_bytes(6, "little")
+        self.rom = rom + bytes([crc8(rom)])
+        self.temperature = temperature
+        self.alarm = [0x4B, 0x46, 0x7F]  # TH, TL, config
+        self.scratchpad = self._scratchpad()
+        self.conversions = 0
+        self._fell = None
+        self._reading = False   # the current slot is one the probe answers
+        self._hold_until = -1
+        self._presence = (-1, -1)
+        self._session = None
+        self._want = None
+
+    def _scratchpad(self):
+        raw = int(round(self.temperature * 16)) & 0xFFFF
+        data = bytes([raw & 0xFF, raw >> 8] + self.alarm + [0xFF, 0x0C, 0x10])
+        return data + bytes([crc8(data)])
+
+    # ---- line level ----
+
+    def edge(self, now, level):
+        """The master drove the line to level at time now (us)"""
+        if not level:
+            self._fell = now
+            self._reading = self._want is not None and self._want[0] == "tx"
+            if self._reading:
+                if not self._want[1]:
+                    self._hold_until = now + self.HOLD_US
+                self._advance(None)
+            return
+        if self._fell is None:
+            return
+        low = now - self._fell
+        self._fell = None
+        if low >= self.RESET_US:
+            self._presence = (now + 15, now + 135)
+            self._session = self._protocol()
+            self._want = next(self._session)
+        elif not self._reading and self._want is not None and self._want[0] == "rx":
+            self._advance(1 if low < self.WRITE_ONE_US else 0)
+
+    def pulling_low(self, now):
+        return now < self._hold_until or self._presence[0] <= now < self._presence[1]
+
+    def _advance(self, bit):
+        try:
+            self._want = self._session.send(bit)
+        except StopIteration:
+            self._want = None
+
+    # ---- protocol ----
+
+    def _rx_byte(self):
+        value = 0
+        for i in range(8):
+            value |= (yield ("rx",)) << i
+        return value
+
+    def _tx_bytes(self, data):
+        for byte in data:
+            for i in range(8):
+                yield ("tx", byte >> i & 1)
+
+    def _protocol(self):
+        command = yield from self._rx_byte()
+        if command == 0x33:       # READ ROM
+            yield from self._tx_bytes(self.rom)
+        elif command == 0x55:     # MATCH ROM
+            rom = bytearray()
+            for _ in range(8):
+                rom.append((yield from self._rx_byte()))
+            if bytes(rom) != self.rom:
+                return
+        elif command == 0xF0:     # SEARCH ROM: bit, complement, then the master's choice
+            for byte in self.rom:
+                for i in range(8):
+                    bit = byte >> i & 1
+                    yield ("tx", bit)
+                    yield ("tx", bit ^ 1)
+                    if (yield ("rx",)) != bit:
+                        return
+            return
+        elif command != 0xCC:     # anything but SKIP ROM
+            return
+        function = yield from self._rx_byte()
+        if function == 0x44:      # CONVERT T (finishes at once)
+            self.conversions += 1
+            self.scratchpad = self._scratchpad()
+        elif function == 0xBE:    # READ SCRATCHPAD
+            yield from self._tx_bytes(self.scratchpad)
+        elif function == 0x4E:    # WRITE SCRATCHPAD: TH, TL, config
+            for i in range(3):
+                self.alarm[i] = yield from self._rx_byte()
+
+
+def crc8(data):
+    """Dallas/Maxim CRC-8, as the 1-Wire parts compute it"""
+    crc = 0
+    for byte in data:
+        crc ^= byte
+        for _ in range(8):
+            crc = (crc >> 1) ^ 0x8C if crc & 1 else crc >> 1
+    return crc
+
+
+# ---- ADC signal generators: source(t_seconds) -> volts ----
+
+class Constant:
+    def __init__(self, volts):
+        self.volts = volts
+
+    def __call__(self, t):
+        return self.volts
+
+
+class Sine:
+    def __init__(self, freq_hz=1.0, amplitude=1.5, offset=1.65, phase=0.0):
+        self.freq_hz = freq_hz
+        self.amplitude = amplitude
+        self.offset = offset
+        self.phase = phase
+
+    def __call__(self, t):
+        return self.offset + self.amplitude * math.sin(2 * math.pi * self.freq_hz * t + self.phase)
+
+
+class Ramp:
+    """Sawtooth from low to high once per period (like turning a potentiometer)"""
+
+    def __init__(self, period_s=10.0, low=0.0, high=3.3):
+        self.period_s = period_s
+        self.low = low
+        self.high = high
+
+    def __call__(self, t):
+        return self.low + (self.high - self.low) * ((t % self.period_s) / self.period_s)
+
+
+class Square:
+    def __init__(self, freq_hz=1.0, low=0.0, high=3.3, duty=0.5):
+        self.freq_hz = freq_hz
+        self.low = low
+        self.high = high
+        self.duty = duty
+
+    def __call__(self, t):
+        return self.high if (t * self.freq_hz) % 1.0 < self.duty else self.low
+
+
+class Noise:
+    """Gaussian noise around a level, reproducible with a seed"""
+
+    def __init__(self, mean=1.65, sd=0.05, seed=None):
+        self.mean = mean
+        self.sd = sd
+        self.rng = random.Random(seed)
+
+    def __call__(self, t):
+        return self.rng.gauss(self.mean, self.sd)
@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Fake MicroPython Board on a Pseudo-Terminal
+Speaks the friendly REPL, raw REPL and raw-paste protocols on a pty, runs
+submitted code against the simulated machine module and keeps files in an
+in-memory filesystem. Point mpremote, raw_repl.py, transfer.py or
+library_manager.py at the printed port to exercise them without hardware.
+
+Usage: python -m mpsim.fakeboard [--baud 115200] [--latency-ms 0] [--window 128]
+                                 [--lib micropython_libraries] [--virtual]
+"""
+
+import builtins
+import ctypes
+import errno
+import importlib.util
+import os
+import queue
+import select
+import struct
+import sys
+import threading
+import time
+import traceback
+import tty
+import types
+
+from . import memfs, micropython
+
+BANNER = ('MicroPython v1.26.0 on 2025-08-09; Generic ESP32 module with ESP32\r\n'
+          'Type "help()" for more information.\r\n')
+RAW_BANNER = b"raw REPL; CTRL-B to exit\r\n>"
+IMPLEMENTATION = types.SimpleNamespace(name="micropython", version=(1, 26, 0, ""), _mpy=0xA06)
+
+
+class _RawOutput:
+    """sys.stdout.buffer: bytes go out unchanged"""
+
+    def __init__(self, board):
+        self.board = board
+
+    def write(self, data):
+        self.board.send(bytes(data))
+        return len(data)
+
+
+class _PacedOutput:
+    """stdout for code on the board: \\n -> \\r\\n, paced at the line rate"""
+
+    def __init__(self, board):
+        self.board = board
+        self.buffer = _RawOutput(board)
+
+    def write(self, text):
+        self.board.send(text.replace("\n", "\r\n").encode())
+        return len(text)
+
+    def flush(self):
+        pass
+
+
+class _RawInput:
+    """sys.stdin.buffer: blocking binary reads"""
+
+    def __init__(self, queue):
+        self.queue = queue
+
+    def read(self, n=1):
+        return b"".join(self.queue.get() for _ in range(n))
+
+    def readinto(self, buf):
+        data = self.read(len(buf))
+        buf[:len(data)] = data
+        return len(data)
+
+
+class _BoardInput:
+    """stdin for code on the board, fed by bytes arriving while it runs"""
+
+    def __init__(self):
+        self.queue = queue.Queue()
+        self.buffer = _RawInput(self.queue)
+
+    def read(self, n=1):
+        return self.buffer.read(n).decode(errors="replace")
+
+    def readline(self):
+        line = ""
+        while not line.endswith("\n"):
+            ch = self.read(1)
+            line += "\n" if ch == "\r" else ch
+        return line
+
+
+class _MemFSFinder:
+    """Import hook: load .py modules from the board's filesystem (sys.path '' and /lib)"""
+
+    def __init__(self, board):
+        self.board = board
+
+    def _locate(self, fullname):
+        rel = fullname.replace(".", "/")
+        roots = [self.board.fs.cwd, "/lib"] + [p for p in sys.path if p.startswith("/") and self.board.fs.isdir(p)]
+        for root in roots:
+            base = root.rstrip("/") + "/" + rel
+            if base + ".py" in self.board.fs.files:
+                return base + ".py", False
+            if self.board.fs.isdir(base):
+                return base, True
+        return None, False
+
+    def find_spec(self, fullname, path=None, target=None):
+        if not self.board.executing:
+            return None
+        location, is_package = self._locate(fullname)
+        if location is None:
+            return None
+        spec = importlib.util.spec_from_loader(fullname, self, is_package=is_package)
+        spec.origin = location
+        if is_package:
+            spec.submodule_search_locations = [location]
+        return spec
+
+    def create_module(self, spec):
+        return None
+
+    def exec_module(self, module):
+        self.board.loaded_modules.add(module.__name__)
+        module.__dict__["__builtins__"] = self.board.builtins
+        if module.__spec__.submodule_search_locations:
+            module.__file__ = module.__spec__.origin
+            init = module.__spec__.origin + "/__init__.py"
+            if init not in self.board.fs.files:
+                return
+            source, filename = self.board.fs.files[init], init
+        else:
+            source, filename = self.board.fs.files[module.__spec__.origin], module.__spec__.origin
+        module.__file__ = filename
+        exec(compile(source, filename, "exec"), module.__dict__)
+
+
+class FakeBoard:
+    def __init__(self, baud=115200, latency_ms=0, window=128, virtual_time=False):
+        self.byte_time = 10.0 / baud if baud else 0.0  # 8N1: 10 bits per byte
+        self.latency = latency_ms / 1000.0
+        self.window = window
+        self.fs = memfs.MemFS()
+        self.fs.mkdir("/lib")
+        self.fs.files["/boot.py"] = b"# This file is executed on every boot (including wake-boot from deepsleep)\n"
+        self.executing = False
+        self.loaded_modules = set()
+        self._tx_free_at = 0.0
+        self._tx_lock = threading.Lock()
+        self._worker = None
+        self._stop = threading.Event()
+        self.stdin = _BoardInput()
+
+        import mpsim
+        self.board = mpsim.install(virtual_time=virtual_time)
+        self.os_module = memfs.build_os(self.fs)
+        self.sys_module = self._build_sys()
+        self.builtins = dict(vars(builtins))
+        self.builtins["open"] = self.fs.open
+        self.builtins["__import__"] = self._import
+        self.builtins["input"] = self._input
+        self.finder = _MemFSFinder(self)
+        sys.meta_path.insert(0, self.finder)
+        self._host_path = list(sys.path)
+        self._new_globals()
+
+        self.master, slave = os.openpty()
+        tty.setraw(slave)
+        self.port = os.ttyname(slave)
+        self._slave = slave  # keep the pty alive while no client is connected
+
+    # ---- code execution environment ----
+
+    def _new_globals(self):
+        self.globals = {"__name__": "__main__", "__builtins__": self.builtins}
+
+    def _build_sys(self):
+        """`sys` as board code sees it: MicroPython on esp32, everything else from the host"""
+        mod = types.ModuleType("sys")
+        mod.implementation = IMPLEMENTATION
+        mod.platform = "esp32"
+        mod.__getattr__ = lambda name: getattr(sys, name)  # stdout, path, modules...
+        return mod
+
+    def _import(self, name, globals=None, locals=None, fromlist=(), level=0):
+        if name in ("os", "uos"):
+            return self.os_module
+        if name in ("sys", "usys"):
+            return self.sys_module
+        return builtins.__import__(name, globals, locals, fromlist, level)
+
+    def _input(self, prompt=""):
+        sys.stdout.write(prompt)
+        return self.stdin.readline().rstrip("\n")
+
+    def soft_reset(self):
+        """Forget globals and modules loaded from flash; pins go back to their reset state"""
+        for name in self.loaded_modules:
+            sys.modules.pop(name, None)
+        self.loaded_modules.clear()
+        sys.path[:] = self._host_path
+        micropython.kbd_intr(3)
+        self._new_globals()
+        self.board.pins.clear()
+        self.board.pwm.clear()
+        self.fs.cwd = "/"
+
+    def _format_exception(self, exc):
+        lines = ["Traceback (most recent call last):"]
+        for frame in traceback.extract_tb(exc.__traceback__):
+            if frame.filename == "<stdin>" or self.fs.exists(frame.filename):
+                lines.append(f'  File "{frame.filename}", line {frame.lineno}, in {frame.name}')
+        name = type(exc).__name__
+        text = str(exc)
+        if isinstance(exc, OSError):
+            # MicroPython has no OSError subclasses and names the errno
+            # (mpremote looks for "OSError" to report ENOENT and friends)
+            name = "OSError"
+            if exc.errno is not None:
+                text = f"[Errno {exc.errno}] {errno.errorcode.get(exc.errno, exc.strerror)}"
+        lines.append(f"{name}: {text}" if text else name)
+        return "\n".join(lines) + "\n"
+
+    def run_code(self, source, filename="<stdin>"):
+        """Execute code like the board would; returns the traceback text or ''"""
+        saved = sys.stdout, sys.stdin
+        sys.stdout, sys.stdin = _PacedOutput(self), self.stdin
+        self.executing = True
+        try:
+            exec(compile(source, filename, "exec"), self.globals)
+            return ""
+        except SystemExit:
+            return ""
+        except BaseException as e:
+            return self._format_exception(e)
+        finally:
+            self.executing = False
+            sys.stdout, sys.stdin = saved
+
+    # ---- serial line ----
+
+    def send(self, data):
+        """Write to the host, taking as long as the line rate requires"""
+        with self._tx_lock:
+            if self.byte_time:
+                now = time.monotonic()
+                start = max(now, self._tx_free_at)
+                self._tx_free_at = start + len(data) * self.byte_time
+                if self._tx_free_at > now:
+                    time.sleep(self._tx_free_at - now)
+            view = memoryview(data)
+            while view:
+                try:
+                    written = os.write(self.master, view)
+                except BlockingIOError:
+                    time.sleep(0.001)
+                    continue
+                view = view[written:]
+
+    def _respond(self, data):
+        if self.latency:
+            time.sleep(self.latency)
+        self.send(data)
+
+    def _read(self, timeout=0.05):
+        ready, _, _ = select.select([self.master], [], [], timeout)
+        if not ready:
+            return b""
+        try:
+            data = os.read(self.master, 4096)
+        except OSError:
+            return b""
+        if self.byte_time:
+            time.sleep(len(data) * self.byte_time)
+        return data
+
+    def _bytes(self):
+        """Incoming bytes, one at a time, until stop()"""
+        while not self._stop.is_set():
+            for b in self._read():
+                yield bytes([b])
+
+    # ---- running code in the background so Ctrl-C can interrupt it ----
+
+    def _start(self, source, raw):
+        self.stdin.queue.queue.clear()  # nothing typed earlier reaches the new program
+        def work():
+            err = self.run_code(source)
+            # Finished before the prompt goes out: the host's next command may
+            # arrive before this thread exits, and must not land in stdin
+            self._worker = None
+            if raw:
+                self.send(b"\x04" + err.replace("\n", "\r\n").encode() + b"\x04>")
+            else:
+                self.send(err.replace("\n", "\r\n").encode() + b">>> ")
+        self._worker = threading.Thread(target=work, daemon=True)
+        self._worker.start()
+
+    def _boot(self):
+        """Like a real soft reboot: run boot.py then main.py, then show the banner"""
+        def work():
+            for script in ("/boot.py", "/main.py"):
+                if script in self.fs.files:
+                    err = self.run_code(self.fs.files[script], script)
+                    self.send(err.replace("\n", "\r\n").encode())
+            self._worker = None
+            self.send(BANNER.encode() + b">>> ")
+        self._worker = threading.Thread(target=work, daemon=True)
+        self._worker.start()
+
+    def _busy(self):
+        return self._worker is not None and self._worker.is_alive()
+
+    def _interrupt(self):
+        ctypes.pythonapi.PyThreadState_SetAsyncExc(ctypes.c_ulong(self._worker.ident),
+                                                   ctypes.py_object(KeyboardInterrupt))
+
+    # ---- protocol ----
+
+    def serve(self):
+        """Run the REPL state machine until stop()"""
+        self._respond(BANNER.encode() + b">>> ")
+        mode = "friendly"
+        line = b""
+        paste = None
+        received = 0
+        for ch in self._bytes():
+            if self._busy():
+                if ch == b"\x03" and micropython._kbd_intr_char == 3:
+                    self._interrupt()
+                else:
+                    self.stdin.queue.put(ch)
+                continue
+
+            if paste is not None:  # raw-paste: windowed upload ending with Ctrl-D
+                if ch == b"\x04":
+                    self._respond(b"\x04")
+                    source, paste = paste, None
+                    self._start(source, raw=True)
+                    continue
+                paste += ch
+                received += 1
+                if received >= self.window:
+                    received = 0
+                    self.send(b"\x01")
+                continue
+
+            if mode == "raw":
+                if ch == b"\x01":
+                    if line.endswith(b"\x05A"):
+                        self._respond(b"R\x01" + struct.pack("<H", self.window))
+                        paste, received = b"", 0
+                    else:
+                        self._respond(b"\r\n" + RAW_BANNER)
+                    line = b""
+                elif ch == b"\x02":
+                    mode, line = "friendly", b""
+                    self._respond(b"\r\n" + BANNER.encode() + b">>> ")
+                elif ch == b"\x03":
+                    line = b""
+                elif ch == b"\x04":
+                    if line:
+                        self._respond(b"OK")
+                        self._start(line, raw=True)
+                    else:
+                        self.soft_reset()
+                        self._respond(b"OK\r\nMPY: soft reboot\r\n" + RAW_BANNER)
+                    line = b""
+                else:
+                    line += ch
+                continue
+
+            # friendly REPL
+            if ch == b"\x01":
+                mode, line = "raw", b""
+                self._respond(b"\r\n" + RAW_BANNER)
+            elif ch == b"\x03":
+                line = b""
+                self._respond(b"\r\n>>> ")
+            elif ch == b"\x04":
+                self.soft_reset()
+                self._respond(b"\r\nMPY: soft reboot\r\n")
+                self._boot()
+            elif ch in (b"\x08", b"\x7f"):
+                if line:
+                    line = line[:-1]
+                    self.send(b"\x08 \x08")
+            elif ch == b"\r":
+                self.send(b"\r\n")
+                source, line = line.decode(errors="replace"), b""
+                if source.strip():
+                    try:
+                        compile(source, "<stdin>", "eval")
+                        source = f"_ = {source}\nif _ is not None: print(repr(_))"
+                    except SyntaxError:
+                        pass
+                    self._start(source, raw=False)
+                else:
+                    self.send(b">>> ")
+            elif ch != b"\n":
+                line += ch
+                self.send(ch)  # echo
+
+    def start(self):
+        """Serve in a background thread; returns self (use .port)"""
+        self._thread = threading.Thread(target=self.serve, daemon=True)
+        self._thread.start()
+        return self
+
+    def stop(self):
+        self._stop.set()
+        if getattr(self, "_thread", None):
+            self._thread.join(1)
+        sys.meta_path.remove(self.finder)
+        os.close(self.master)
+        os.close(self._slave)
+
+
+def main():
+    args = sys.argv[1:]
+    options = {"--baud": "115200", "--latency-ms": "0", "--window": "128", "--lib": None}
+    virtual = "--virtual" in args
+    args = [a for a in args if a != "--virtual"]
+    while args:
+        key = args.pop(0)
+        if key not in options or not args:
+            print(__doc__.strip().splitlines()[-2])
+            sys.exit(1)
+        options[key] = args.pop(0)
+
+    board = FakeBoard(baud=int(options["--baud"]), latency_ms=float(options["--latency-ms"]),
+                      window=int(options["--window"]), virtual_time=virtual)
+    if options["--lib"]:
+        board.fs.load_dir(options["--lib"], "/lib")
+    print(f"🔌 Fake ESP32 on {board.port} ({options['--baud']} baud, {options['--latency-ms']} ms latency)")
+    print(f"   Try: python -m mpremote connect {board.port} exec \"print('hello')\"")
+    print("   Ctrl-C to stop")
+    try:
+        board.serve()
+    except KeyboardInterrupt:
+        print("\n👋 Fake board stopped")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+# Simulated MicroPython framebuf module
+# Pure-Python FrameBuffer with the same pixel formats, drawing methods and
+# memory layout as the C implementation, so drivers can share buffers with it
+
+from . import font
+
+MONO_VLSB = 0
+MONO_VERT = MONO_VLSB
+RGB565 = 1
+GS4_HMSB = 2
+MONO_HLSB = 3
+MONO_HMSB = 4
+GS2_HMSB = 5
+GS8 = 6
+
+# Stride alignment (in pixels) needed by each format
+_STRIDE_ALIGN = {MONO_HLSB: 8, MONO_HMSB: 8, GS2_HMSB: 4, GS4_HMSB: 2}
+
+
+class FrameBuffer:
+    def __init__(self, buffer, width, height, format, stride=None):
+        if format not in (MONO_VLSB, RGB565, GS4_HMSB, MONO_HLSB, MONO_HMSB, GS2_HMSB, GS8):
+            raise ValueError("invalid format")
+        self.buffer = buffer
+        self._buf = memoryview(buffer).cast("B") if not isinstance(buffer, bytearray) else buffer
+        self.width = width
+        self.height = height
+        self.format = format
+        stride = width if stride is None else stride
+        align = _STRIDE_ALIGN.get(format, 1)
+        self.stride = (stride + align - 1) // align * align
+        if len(self._buf) < self._required_size():
+            raise ValueError("buffer too small")
+
+    def _required_size(self):
+        f, w, h, s = self.format, self.width, self.height, self.stride
+        if f == MONO_VLSB:
+            return ((h + 7) // 8) * s if h else 0
+        if f == RGB565:
+            return 2 * s * h
+        if f in (MONO_HLSB, MONO_HMSB):
+            return s * h // 8
+        if f == GS2_HMSB:
+            return s * h // 4
+        if f == GS4_HMSB:
+            return s * h // 2
+        return s * h
+
+    # ---- raw pixel access ----
+
+    def _get(self, x, y):
+        f, b, s = self.format, self._buf, self.stride
+        if f == MONO_VLSB:
+            return (b[(y >> 3) * s + x] >> (y & 7)) & 1
+        if f == MONO_HLSB:
+            return (b[(x + y * s) >> 3] >> (7 - (x & 7))) & 1
+        if f == MONO_HMSB:
+            return (b[(x + y * s) >> 3] >> (x & 7)) & 1
+        if f == RGB565:
+            i = 2 * (x + y * s)
+            return b[i] | b[i + 1] << 8
+        if f == GS2_HMSB:
+            return (b[(x + y * s) >> 2] >> ((x & 3) * 2)) & 0x3
+        if f == GS4_HMSB:
+            byte = b[(x + y * s) >> 1]
+            return byte & 0x0F if x & 1 else byte >> 4
+        return b[x + y * s]
+
+    def _set(self, x, y, c):
+        f, b, s = self.format, self._buf, self.stride
+        if f == MONO_VLSB:
+            i, bit = (y >> 3) * s + x, 1 << (y & 7)
+            b[i] = (b[i] | bit) if c & 1 else (b[i] & ~bit)
+        elif f in (MONO_HLSB, MONO_HMSB):
+            i = (x + y * s) >> 3
+            bit = 1 << (7 - (x & 7) if f == MONO_HLSB else x & 7)
+            b[i] = (b[i] | bit) if c & 1 else (b[i] & ~bit)
+        elif f == RGB565:
+            i = 2 * (x + y * s)
+            b[i] = c & 0xFF
+            b[i + 1] = (c >> 8) & 0xFF
+        elif f == GS2_HMSB:
+            i, shift = (x + y * s) >> 2, (x & 3) * 2
+            b[i] = (b[i] & ~(0x3 << shift)) | ((c & 0x3) << shift)
+        elif f == GS4_HMSB:
+            i = (x + y * s) >> 1
+            if x & 1:
+                b[i] = (b[i] & 0xF0) | (c & 0x0F)
+            else:
+                b[i] = (b[i] & 0x0F) | ((c & 0x0F) << 4)
+        else:
+            b[x + y * s] = c & 0xFF
+
+    # ---- drawing ----
+
+    def pixel(self, x, y, c=None):
+        if not (0 <= x < self.width and 0 <= y < self.height):
+            return None
+        if c is None:
+            return self._get(x, y)
+        self._set(x, y, c)
+
+    def fill(self, c):
+        self.fill_rect(0, 0, self.width, self.height, c)
+
+    def fill_rect(self, x, y, w, h, c):
+        x0, y0 = max(x, 0), max(y, 0)
+        x1, y1 = min(x + w, self.width), min(y + h, self.height)
+        for yy in range(y0, y1):
+            for xx in range(x0, x1):
+                self._set(xx, yy, c)
+
+    def hline(self, x, y, w, c):
+        self.fill_rect(x, y, w, 1, c)
+
+    def vline(self, x, y, h, c):
+        self.fill_rect(x, y, 1, h, c)
+
+    def rect(self, x, y, w, h, c, f=False):
+        if f:
+            self.fill_rect(x, y, w, h, c)
+            return
+        self.fill_rect(x, y, w, 1, c)
+        self.fill_rect(x, y + h - 1, w, 1, c)
+        self.fill_rect(x, y, 1, h, c)
+        self.fill_rect(x + w - 1, y, 1, h, c)
+
+    def line(self, x1, y1, x2, y2, c):
+        dx, dy = abs(x2 - x1), -abs(y2 - y1)
+        sx = 1 if x1 < x2 else -1
+        sy = 1 if y1 < y2 else -1
+        err = dx + dy
+        while True:
+            self.pixel(x1, y1, c)
+            if x1 == x2 and y1 == y2:
+                break
+            e2 = 2 * err
+            if e2 >= dy:
+                err += dy
+                x1 += sx
+            if e2 <= dx:
+                err += dx
+                y1 += sy
+
+    def ellipse(self, x, y, xr, yr, c, f=False, m=0xF):
+        # m selects quadrants: bit 0 = Q1 (top right), then counter-clockwise
+        quads = ((1, -1, 0x1), (-1, -1, 0x2), (-1, 1, 0x4), (1, 1, 0x8))
+        points = set()
+        if xr == 0 and yr == 0:
+            points.add((0, 0))
+        for dy in range(0, yr + 1):
+            span = xr * (1 - (dy / yr) ** 2) ** 0.5 if yr else xr
+            points.add((int(round(span)), dy))
+        for dx in range(0, xr + 1):
+            span = yr * (1 - (dx / xr) ** 2) ** 0.5 if xr else yr
+            points.add((dx, int(round(span))))
+        for dx, dy in points:
+            for sx, sy, bit in quads:
+                if not m & bit:
+                    continue
+                if f:
+                    self.hline(x if sx > 0 else x - dx, y + sy * dy, dx + 1, c)
+                else:
+                    self.pixel(x + sx * dx, y + sy * dy, c)
+
+    def poly(self, x, y, coords, c, f=False):
+        pts = [(x + coords[i], y + coords[i + 1]) for i in range(0, len(coords) - 1, 2)]
+        if not pts:
+            return
+        if not f:
+            for i, (px, py) in enumerate(pts):
+                qx, qy = pts[(i + 1) % len(pts)]
+                self.line(px, py, qx, qy, c)
+            return
+        ys = [p[1] for p in pts]
+        for row in range(min(ys), max(ys) + 1):
+            nodes = []
+            for i, (px, py) in enumerate(pts):
+                qx, qy = pts[(i + 1) % len(pts)]
+                if (py <= row < qy) or (qy <= row < py):
+                    nodes.append(px + (row - py) * (qx - px) / (qy - py))
+            nodes.sort()
+            for a, b in zip(nodes[::2], nodes[1::2]):
+                self.hline(int(round(a)), row, int(round(b)) - int(round(a)) + 1, c)
+
+    def text(self, s, x, y, c=1):
+        for ch in s:
+            columns = font.glyph(ord(ch))
+            for col, bits in enumerate(columns):
+                for row in range(8):
+                    if bits >> row & 1:
+                        self.pixel(x + col, y + row, c)
+            x += 8
+
+    def scroll(self, xstep, ystep):
+        # Like MicroPython, the area left behind keeps its old contents
+        w, h = self.width, self.height
+        xs = range(w - 1, xstep - 1, -1) if xstep > 0 else range(0, w + xstep)
+        ys = range(h - 1, ystep - 1, -1) if ystep > 0 else range(0, h + ystep)
+        for yy in ys:
+            for xx in xs:
+                self._set(xx, yy, self._get(xx - xstep, yy - ystep))
+
+    def blit(self, fbuf, x, y, key=-1, palette=None):
+        if not isinstance(fbuf, FrameBuffer):
+            fbuf = FrameBuffer(*fbuf)
+        for sy in range(fbuf.height):
+            dy = y + sy
+            if not 0 <= dy < self.height:
+                continue
+            for sx in range(fbuf.width):
+                dx = x + sx
+                if not 0 <= dx < self.width:
+                    continue
+                c = fbuf._get(sx, sy)
+                if palette is not None:
+                    c = palette._get(c, 0)
+                if c != key:
+                    self._set(dx, dy, c)
+
+
+def FrameBuffer1(buffer, width, height, stride=None):
+    """Legacy constructor for MONO_VLSB buffers"""
+    return FrameBuffer(buffer, width, height, MONO_VLSB, stride)
@@ -0,0 +1,529 @@
+# Simulated MicroPython machine module
+# Same classes and methods as the ESP32 port, backed by mpsim.board.BOARD
+
+import errno
+
+from . import board as _board
+from .board import I2C_DEFAULT_PINS, SPI_DEFAULT_PINS, UART_DEFAULT_PINS
+
+_UNIQUE_ID = b"\x24\x0a\xc4\x5e\x11\x08"
+
+
+def _pin_id(pin):
+    if pin is None:
+        return None
+    return pin.id if isinstance(pin, Pin) else int(pin)
+
+
+def freq(hz=None):
+    if hz is None:
+        return 240_000_000
+
+
+def unique_id():
+    return _UNIQUE_ID
+
+
+def reset():
+    raise SystemExit("machine.reset()")
+
+
+def soft_reset():
+    raise SystemExit("machine.soft_reset()")
+
+
+def reset_cause():
+    return 1  # PWRON_RESET
+
+
+def idle():
+    _board.BOARD.clock.run_due()
+
+
+def lightsleep(ms=None):
+    if ms:
+        _board.BOARD.clock.sleep_us(ms * 1000)
+
+
+deepsleep = lightsleep
+
+
+def disable_irq():
+    return 0
+
+
+def enable_irq(state=0):
+    pass
+
+
+def time_pulse_us(pin, pulse_level, timeout_us=1_000_000):
+    return -1  # no pulse seen
+
+
+def bitstream(pin, encoding, timing, buf):
+    _board.BOARD.bitstreams.append((_pin_id(pin), bytes(buf)))
+
+
+def dht_readinto(pin, buf):
+    sensor = _board.BOARD.dht.get(_pin_id(pin))
+    if sensor is None:
+        raise OSError(errno.ETIMEDOUT, "ETIMEDOUT")
+    buf[:5] = sensor.frame()
+
+
+PWRON_RESET = 1
+HARD_RESET = 2
+WDT_RESET = 3
+DEEPSLEEP_RESET = 4
+SOFT_RESET = 5
+
+
+class Pin:
+    IN = 1
+    OUT = 3
+    OPEN_DRAIN = 7
+    PULL_UP = 2
+    PULL_DOWN = 1
+    IRQ_RISING = 1
+    IRQ_FALLING = 2
+    DRIVE_0 = 0
+    DRIVE_1 = 1
+    DRIVE_2 = 2
+    DRIVE_3 = 3
+
+    _MODES = {IN: "in", OUT: "out", OPEN_DRAIN: "open_drain"}
+    _PULLS = {PULL_UP: "up", PULL_DOWN: "down"}
+
+    def __init__(self, id, mode=-1, pull=-1, *, value=None, drive=None, hold=None):
+        self.id = int(id)
+        if not 0 <= self.id <= 39:
+            raise ValueError("invalid pin")
+        self.init(mode, pull, value=value)
+
+    def init(self, mode=-1, pull=-1, *, value=None, drive=None, hold=None):
+        state = _board.BOARD.pins[self.id]
+        if mode != -1 and mode is not None:
+            if mode in (self.OUT, self.OPEN_DRAIN) and self.id >= 34:
+                raise ValueError("pin can only be input")
+            state.mode = self._MODES.get(mode, "in")
+        if pull != -1:
+            state.pull = self._PULLS.get(pull)
+        if value is not None:
+            self.value(value)
+
+    def value(self, x=None):
+        if x is None:
+            return _board.BOARD.level(self.id)
+        _board.BOARD.set_output(self.id, x)
+
+    def __call__(self, x=None):
+        return self.value(x)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+    high = on
+    low = off
+
+    def irq(self, handler=None, trigger=IRQ_FALLING | IRQ_RISING, **kwargs):
+        state = _board.BOARD.pins[self.id]
+        state.irq_handler = handler
+        state.irq_trigger = trigger
+        state.irq_pin = self
+        return self
+
+    def __repr__(self):
+        return f"Pin({self.id})"
+
+
+class Signal:
+    def __init__(self, pin, invert=False):
+        self.pin = pin if isinstance(pin, Pin) else Pin(pin)
+        self.invert = invert
+
+    def value(self, x=None):
+        if x is None:
+            return self.pin.value() ^ self.invert
+        self.pin.value((1 if x else 0) ^ self.invert)
+
+    def __call__(self, x=None):
+        return self.value(x)
+
+    def on(self):
+        self.value(1)
+
+    def off(self):
+        self.value(0)
+
+
+class ADC:
+    ATTN_0DB = 0
+    ATTN_2_5DB = 1
+    ATTN_6DB = 2
+    ATTN_11DB = 3
+    WIDTH_9BIT = 0
+    WIDTH_10BIT = 1
+    WIDTH_11BIT = 2
+    WIDTH_12BIT = 3
+
+    # Approximate full-scale input voltage for each attenuation
+    _FULL_SCALE = {ATTN_0DB: 1.1, ATTN_2_5DB: 1.5, ATTN_6DB: 2.2, ATTN_11DB: 3.3}
+
+    def __init__(self, pin, *, atten=None):
+        self.pin = _pin_id(pin)
+        if not (32 <= self.pin <= 39 or self.pin in (0, 2, 4, 12, 13, 14, 15, 25, 26, 27)):
+            raise ValueError("invalid pin")
+        self._atten = self.ATTN_0DB if atten is None else atten
+        self._bits = 12
+
+    def atten(self, atten):
+        self._atten = atten
+
+    def width(self, width):
+        self._bits = 9 + width
+
+    def _fraction(self):
+        volts = _board.BOARD.adc_volts(self.pin)
+        return min(max(volts / self._FULL_SCALE[self._atten], 0.0), 1.0)
+
+    def read(self):
+        return int(round(self._fraction() * ((1 << self._bits) - 1)))
+
+    def read_u16(self):
+        return int(round(self._fraction() * 65535))
+
+    def read_uv(self):
+        return int(self._fraction() * self._FULL_SCALE[self._atten] * 1_000_000)
+
+
+class PWM:
+    def __init__(self, dest, *, freq=None, duty=None, duty_u16=None, duty_ns=None, invert=False):
+        self.pin = _pin_id(dest)
+        self._freq = 5000
+        self._duty_u16 = 32768
+        self.init(freq=freq, duty=duty, duty_u16=duty_u16, duty_ns=duty_ns)
+
+    def init(self, *, freq=None, duty=None, duty_u16=None, duty_ns=None, invert=False):
+        if freq is not None:
+            self.freq(freq)
+        if duty is not None:
+            self.duty(duty)
+        if duty_u16 is not None:
+            self.duty_u16(duty_u16)
+        if duty_ns is not None:
+            self.duty_ns(duty_ns)
+        self._publish()
+
+    def _publish(self):
+        _board.BOARD.pwm[self.pin] = (self._freq, self._duty_u16)
+
+    def freq(self, value=None):
+        if value is None:
+            return self._freq
+        self._freq = int(value)
+        self._publish()
+
+    def duty(self, value=None):
+        if value is None:
+            return self._duty_u16 >> 6
+        self._duty_u16 = min(max(int(value), 0), 1023) * 65535 // 1023
+        self._publish()
+
+    def duty_u16(self, value=None):
+        if value is None:
+            return self._duty_u16
+        self._duty_u16 = min(max(int(value), 0), 65535)
+        self._publish()
+
+    def duty_ns(self, value=None):
+        period_ns = 1_000_000_000 // self._freq
+        if value is None:
+            return self._duty_u16 * period_ns // 65535
+        self._duty_u16 = min(int(value) * 65535 // period_ns, 65535)
+        self._publish()
+
+    def deinit(self):
+        _board.BOARD.pwm.pop(self.pin, None)
+
+
+class I2C:
+    """Hardware I2C; SoftI2C shares the same behaviour on the simulator"""
+
+    def __init__(self, id=0, *, scl=None, sda=None, freq=400_000, timeout=50_000):
+        default_sda, default_scl = I2C_DEFAULT_PINS.get(id, (None, None))
+        self.id = id
+        self.sda = _pin_id(sda) if sda is not None else default_sda
+        self.scl = _pin_id(scl) if scl is not None else default_scl
+        if self.sda == self.scl:
+            raise ValueError("SDA and SCL must be different pins")
+        self.freq = freq
+
+    def init(self, *, scl=None, sda=None, freq=None, timeout=None):
+        if sda is not None:
+            self.sda = _pin_id(sda)
+        if scl is not None:
+            self.scl = _pin_id(scl)
+        if freq is not None:
+            self.freq = freq
+
+    def deinit(self):
+        pass
+
+    def _device(self, addr):
+        device = _board.BOARD.i2c_devices(self.sda, self.scl).get(addr)
+        if device is None:
+            raise OSError(errno.ENODEV, "ENODEV")
+        return device
+
+    def _spend(self, nbytes):
+        # Address byte + data bytes, 9 clocks each
+        _board.BOARD.clock.spend_us((nbytes + 1) * 9 * 1_000_000 // self.freq)
+
+    def _read(self, device, n):
+        data = device.read(n)
+        if self.freq > device.max_freq:
+            # Past the part's limit the bits sampled on SDA are garbage
+            data = bytes(b ^ 0x5A for b in data)
+        self._spend(n)
+        return data
+
+    def scan(self):
+        devices = _board.BOARD.i2c_devices(self.sda, self.scl)
+        # One address byte for each of 0x08..0x77
+        _board.BOARD.clock.spend_us(0x70 * 9 * 1_000_000 // self.freq)
+        return sorted(addr for addr in devices if 0x08 <= addr <= 0x77)
+
+    def writeto(self, addr, buf, stop=True):
+        device = self._device(addr)
+        device.write(bytes(buf))
+        self._spend(len(buf))
+        return len(buf)
+
+    def writevto(self, addr, vector, stop=True):
+        data = b"".join(bytes(b) for b in vector)
+        return self.writeto(addr, data, stop)
+
+    def readfrom(self, addr, nbytes, stop=True):
+        return self._read(self._device(addr), nbytes)
+
+    def readfrom_into(self, addr, buf, stop=True):
+        buf[:] = self.readfrom(addr, len(buf))
+
+    def writeto_mem(self, addr, memaddr, buf, *, addrsize=8):
+        device = self._device(addr)
+        device.write(memaddr.to_bytes(addrsize // 8, "big") + bytes(buf))
+        self._spend(addrsize // 8 + len(buf))
+
+    def readfrom_mem(self, addr, memaddr, nbytes, *, addrsize=8):
+        device = self._device(addr)
+        device.write(memaddr.to_bytes(addrsize // 8, "big"))
+        self._spend(addrsize // 8)
+        return self._read(device, nbytes)
+
+    def readfrom_mem_into(self, addr, memaddr, buf, *, addrsize=8):
+        buf[:] = self.readfrom_mem(addr, memaddr, len(buf), addrsize=addrsize)
+
+    def __repr__(self):
+        return f"{type(self).__name__}(scl={self.scl}, sda={self.sda}, freq={self.freq})"
+
+
+class SoftI2C(I2C):
+    def __init__(self, scl, sda, *, freq=400_000, timeout=50_000):
+        self.id = -1
+        self.scl = _pin_id(scl)
+        self.sda = _pin_id(sda)
+        if self.sda == self.scl:
+            raise ValueError("SDA and SCL must be different pins")
+        self.freq = freq
+
+
+class SPI:
+    MSB = 0
+    LSB = 1
+
+    def __init__(self, id=1, baudrate=1_000_000, *, polarity=0, phase=0, bits=8,
+                 firstbit=MSB, sck=None, mosi=None, miso=None):
+        if id not in SPI_DEFAULT_PINS and id != -1:
+            raise ValueError("SPI(%d) doesn't exist" % id)
+        self.id = id
+        self.sck, self.mosi, self.miso = SPI_DEFAULT_PINS.get(id, (None, None, None))
+        self.init(baudrate=baudrate, polarity=polarity, phase=phase, sck=sck, mosi=mosi, miso=miso)
+
+    def init(self, baudrate=None, *, polarity=None, phase=None, bits=None, firstbit=None,
+             sck=None, mosi=None, miso=None):
+        if baudrate is not None:
+            self.baudrate = baudrate
+        if polarity is not None:
+            self.polarity = polarity
+        if phase is not None:
+            self.phase = phase
+        if sck is not None:
+            self.sck = _pin_id(sck)
+        if mosi is not None:
+            self.mosi = _pin_id(mosi)
+        if miso is not None:
+            self.miso = _pin_id(miso)
+
+    def deinit(self):
+        pass
+
+    def _loopback_limit(self):
+        """Fastest clock a MOSI-MISO jumper reads back cleanly at"""
+        if (self.sck, self.mosi, self.miso) == SPI_DEFAULT_PINS.get(self.id):
+            return 40_000_000  # IO_MUX pins
+        return 26_666_666  # through the GPIO matrix, which delays MISO
+
+    def _transfer(self, out):
+        _board.BOARD.clock.spend_us(len(out) * 8 * 1_000_000 // self.baudrate)
+        if self.miso in _board.BOARD.links[self.mosi]:
+            if self.baudrate > self._loopback_limit():
+                # MISO is sampled one bit late
+                return (int.from_bytes(out, "big") >> 1).to_bytes(len(out), "big")
+            return bytes(out)  # MOSI jumpered to MISO
+        return bytes(len(out))
+
+    def read(self, nbytes, write=0x00):
+        return self._transfer(bytes([write]) * nbytes)
+
+    def readinto(self, buf, write=0x00):
+        buf[:] = self._transfer(bytes([write]) * len(buf))
+
+    def write(self, buf):
+        self._transfer(bytes(buf))
+
+    def write_readinto(self, write_buf, read_buf):
+        read_buf[:] = self._transfer(bytes(write_buf))
+
+
+class SoftSPI(SPI):
+    def __init__(self, baudrate=500_000, *, polarity=0, phase=0, bits=8, firstbit=SPI.MSB,
+                 sck=None, mosi=None, miso=None):
+        self.id = -1
+        self.sck = self.mosi = self.miso = None
+        self.init(baudrate=baudrate, polarity=polarity, phase=phase, sck=sck, mosi=mosi, miso=miso)
+
+    def _loopback_limit(self):
+        return float("inf")  # bit-banged: MISO is read in step with the clock
+
+
+class UART:
+    def __init__(self, id, baudrate=115200, *, tx=None, rx=None, **kwargs):
+        self.id = id
+        self.tx, self.rx = UART_DEFAULT_PINS.get(id, (None, None))
+        self._rx_buf = bytearray()
+        self.init(baudrate, tx=tx, rx=rx)
+
+    def init(self, baudrate=None, *, tx=None, rx=None, **kwargs):
+        if baudrate is not None:
+            self.baudrate = baudrate
+        if tx is not None:
+            self.tx = _pin_id(tx)
+        if rx is not None:
+            self.rx = _pin_id(rx)
+
+    def deinit(self):
+        pass
+
+    def any(self):
+        return len(self._rx_buf)
+
+    def write(self, buf):
+        data = bytes(buf)
+        _board.BOARD.clock.spend_us(len(data) * 10 * 1_000_000 // self.baudrate)
+        if self.rx in _board.BOARD.links[self.tx]:
+            self._rx_buf.extend(data)  # TX jumpered to RX
+        return len(data)
+
+    def read(self, nbytes=None):
+        if not self._rx_buf:
+            return None
+        nbytes = len(self._rx_buf) if nbytes is None else nbytes
+        data = bytes(self._rx_buf[:nbytes])
+        del self._rx_buf[:nbytes]
+        return data
+
+    def readinto(self, buf, nbytes=None):
+        data = self.read(len(buf) if nbytes is None else nbytes)
+        if data is None:
+            return None
+        buf[:len(data)] = data
+        return len(data)
+
+    def readline(self):
+        end = self._rx_buf.find(b"\n")
+        return self.read(None if end < 0 else end + 1)
+
+    def flush(self):
+        pass
+
+    def txdone(self):
+        return True
+
+
+class Timer:
+    ONE_SHOT = 0
+    PERIODIC = 1
+
+    def __init__(self, id=-1, **kwargs):
+        self.id = id
+        self._entry = None
+        if kwargs:
+            self.init(**kwargs)
+
+    def init(self, *, mode=PERIODIC, period=-1, freq=-1, callback=None):
+        self.deinit()
+        if freq != -1:
+            period_us = int(1_000_000 / freq)
+        else:
+            period_us = int(period) * 1000
+        self._mode = mode
+        self._period_us = max(period_us, 1)
+        self._callback = callback
+        clock = _board.BOARD.clock
+        self._entry = clock.schedule(clock.now_us() + self._period_us, self._fire)
+
+    def _fire(self):
+        clock = _board.BOARD.clock
+        due = self._entry[0]
+        if self._mode == self.PERIODIC:
+            # Schedule from the due time so periodic timers don't drift
+            self._entry = clock.schedule(due + self._period_us, self._fire)
+        else:
+            self._entry = None
+        if self._callback:
+            self._callback(self)
+
+    def deinit(self):
+        if self._entry is not None:
+            _board.BOARD.clock.cancel(self._entry)
+            self._entry = None
+
+    def value(self):
+        return 0
+
+
+class RTC:
+    def __init__(self, id=0):
+        self._offset = 0
+
+    def datetime(self, datetimetuple=None):
+        import time as _t
+        if datetimetuple is None:
+            now = _t.localtime(_board.BOARD.clock.time() + self._offset)
+            return (now[0], now[1], now[2], now[6], now[3], now[4], now[5], 0)
+        y, mo, d, _wd, h, mi, s, _sub = datetimetuple
+        target = _t.mktime((y, mo, d, h, mi, s, 0, 0, -1))
+        self._offset = target - _board.BOARD.clock.time()
+
+    init = datetime
+
+
+class WDT:
+    def __init__(self, id=0, timeout=5000):
+        self.timeout = timeout
+
+    def feed(self):
+        pass
@@ -0,0 +1,219 @@
+# In-memory filesystem for the fake board
+# Provides open() and an `os` module with the MicroPython VFS calls
+# (listdir/ilistdir/stat/statvfs/mkdir/remove/rename/uname...) so host
+# tools see a board with flash storage
+
+import errno
+import io
+import os as _host_os
+import types
+
+S_IFDIR = 0x4000
+S_IFREG = 0x8000
+BLOCK_SIZE = 4096
+
+
+def _oserror(code):
+    return OSError(code, errno.errorcode[code])
+
+
+class _MemFile(io.BytesIO):
+    """Binary file whose contents are written back to the filesystem on flush/close"""
+
+    def __init__(self, fs, path, data, writable):
+        super().__init__(data)
+        self._fs = fs
+        self._path = path
+        self._writable = writable
+
+    def flush(self):
+        super().flush()
+        if self._writable and not self.closed:
+            self._fs.files[self._path] = self.getvalue()
+
+    def close(self):
+        if not self.closed:
+            self.flush()
+        super().close()
+
+
+class MemFS:
+    def __init__(self, capacity=2 * 1024 * 1024):
+        self.capacity = capacity
+        self.files = {}
+        self.dirs = {"/"}
+        self.cwd = "/"
+
+    # ---- paths ----
+
+    def abspath(self, path):
+        path = str(path)
+        if not path.startswith("/"):
+            path = self.cwd.rstrip("/") + "/" + path
+        parts = []
+        for part in path.split("/"):
+            if part in ("", "."):
+                continue
+            if part == "..":
+                if parts:
+                    parts.pop()
+            else:
+                parts.append(part)
+        return "/" + "/".join(parts)
+
+    def _parent(self, path):
+        return path.rsplit("/", 1)[0] or "/"
+
+    def exists(self, path):
+        path = self.abspath(path)
+        return path in self.files or path in self.dirs
+
+    def isdir(self, path):
+        return self.abspath(path) in self.dirs
+
+    # ---- file access ----
+
+    def open(self, path, mode="r", buffering=-1, encoding=None, **kwargs):
+        path = self.abspath(path)
+        if path in self.dirs:
+            raise _oserror(errno.EISDIR)
+        if self._parent(path) not in self.dirs:
+            raise _oserror(errno.ENOENT)
+        if "r" in mode and "+" not in mode:
+            if path not in self.files:
+                raise _oserror(errno.ENOENT)
+            handle = _MemFile(self, path, self.files[path], False)
+        elif "r" in mode:
+            if path not in self.files:
+                raise _oserror(errno.ENOENT)
+            handle = _MemFile(self, path, self.files[path], True)
+        elif "w" in mode:
+            self.files[path] = b""
+            handle = _MemFile(self, path, b"", True)
+        elif "a" in mode:
+            handle = _MemFile(self, path, self.files.get(path, b""), True)
+            handle.seek(0, io.SEEK_END)
+        else:
+            raise ValueError("invalid mode")
+        if "b" in mode:
+            return handle
+        return io.TextIOWrapper(handle, encoding=encoding or "utf-8", newline="")
+
+    def used(self):
+        blocks = sum((len(d) + BLOCK_SIZE - 1) // BLOCK_SIZE or 1 for d in self.files.values())
+        return (blocks + len(self.dirs)) * BLOCK_SIZE
+
+    # ---- os module ----
+
+    def ilistdir(self, path="."):
+        path = self.abspath(path)
+        if path not in self.dirs:
+            raise _oserror(errno.ENOENT)
+        prefix = path.rstrip("/") + "/"
+        for d in sorted(self.dirs):
+            if d != "/" and self._parent(d) == path:
+                yield (d[len(prefix):], S_IFDIR, 0, 0)
+        for f, data in sorted(self.files.items()):
+            if self._parent(f) == path:
+                yield (f[len(prefix):], S_IFREG, 0, len(data))
+
+    def listdir(self, path="."):
+        return [entry[0] for entry in self.ilistdir(path)]
+
+    def stat(self, path):
+        path = self.abspath(path)
+        if path in self.dirs:
+            return (S_IFDIR, 0, 0, 0, 0, 0, 0, 0, 0, 0)
+        if path in self.files:
+            return (S_IFREG, 0, 0, 0, 0, 0, len(self.files[path]), 0, 0, 0)
+        raise _oserror(errno.ENOENT)
+
+    def statvfs(self, path="/"):
+        total = self.capacity // BLOCK_SIZE
+        free = max(total - self.used() // BLOCK_SIZE, 0)
+        return (BLOCK_SIZE, BLOCK_SIZE, total, free, free, 0, 0, 0, 0, 255)
+
+    def mkdir(self, path):
+        path = self.abspath(path)
+        if self.exists(path):
+            raise _oserror(errno.EEXIST)
+        if self._parent(path) not in self.dirs:
+            raise _oserror(errno.ENOENT)
+        self.dirs.add(path)
+
+    def rmdir(self, path):
+        path = self.abspath(path)
+        if path not in self.dirs or path == "/":
+            raise _oserror(errno.ENOENT)
+        if any(True for _ in self.ilistdir(path)):
+            raise _oserror(errno.EACCES)
+        self.dirs.remove(path)
+
+    def remove(self, path):
+        path = self.abspath(path)
+        if path not in self.files:
+            raise _oserror(errno.ENOENT)
+        del self.files[path]
+
+    def rename(self, old, new):
+        old, new = self.abspath(old), self.abspath(new)
+        if old in self.files:
+            if new in self.dirs:
+                raise _oserror(errno.EISDIR)
+            self.files[new] = self.files.pop(old)
+        elif old in self.dirs:
+            prefix = old + "/"
+            self.dirs = {new + d[len(old):] if d == old or d.startswith(prefix) else d for d in self.dirs}
+            self.files = {new + f[len(old):] if f.startswith(prefix) else f: v for f, v in self.files.items()}
+        else:
+            raise _oserror(errno.ENOENT)
+
+    def chdir(self, path):
+        path = self.abspath(path)
+        if path not in self.dirs:
+            raise _oserror(errno.ENOENT)
+        self.cwd = path
+
+    def getcwd(self):
+        return self.cwd
+
+    def load_dir(self, host_dir, target="/"):
+        """Copy a host folder into the filesystem (e.g. micropython_libraries -> /lib)"""
+        target = self.abspath(target)
+        if target not in self.dirs:
+            self.mkdir(target)
+        for name in sorted(_host_os.listdir(host_dir)):
+            host_path = _host_os.path.join(host_dir, name)
+            dest = target.rstrip("/") + "/" + name
+            if _host_os.path.isdir(host_path):
+                self.load_dir(host_path, dest)
+            elif _host_os.path.isfile(host_path):
+                with open(host_path, "rb") as f:
+                    self.files[dest] = f.read()
+
+
+class _Uname(tuple):
+    sysname = property(lambda self: self[0])
+    nodename = property(lambda self: self[1])
+    release = property(lambda self: self[2])
+    version = property(lambda self: self[3])
+    machine = property(lambda self: self[4])
+
+
+UNAME = _Uname(("esp32", "esp32", "1.26.0", "v1.26.0 on 2025-08-09", "Generic ESP32 module with ESP32"))
+
+
+def build_os(fs):
+    """An `os` module for code running on the fake board"""
+    mod = types.ModuleType("os")
+    mod.__doc__ = "MicroPython os module (simulated, in-memory VFS)"
+    mod.sep = "/"
+    for name in ("ilistdir", "listdir", "stat", "statvfs", "mkdir", "rmdir", "remove",
+                 "rename", "chdir", "getcwd"):
+        setattr(mod, name, getattr(fs, name))
+    mod.unlink = fs.remove
+    mod.uname = lambda: UNAME
+    mod.urandom = _host_os.urandom
+    mod.sync = lambda: None
+    mod.dupterm = lambda stream=None, index=0: None
+    return mod
@@ -0,0 +1,180 @@
+# Simulated micropython module
+# const() and the code-emitter decorators are no-ops on CPython; memory and
+# scheduler helpers behave closely enough for host runs. While the heap is
+# locked, calls to the allocating builtins (bytearray, bytes, memoryview,
+# list, tuple, dict, float, struct.pack/unpack) from code outside the
+# simulator raise MemoryError as they would on the board. Allocations CPython
+# makes implicitly (float arithmetic, slicing) are not caught.
+
+import builtins
+import os
+import struct
+import sys
+
+_heap_locked = 0
+_opt_level = 0
+_kbd_intr_char = 3
+
+
+def const(value):
+    return value
+
+
+def native(func):
+    return func
+
+
+def viper(func):
+    return func
+
+
+def asm_xtensa(func):
+    return func
+
+
+def mem_info(verbose=None):
+    print("stack: 0 out of 15360")
+    print("GC: total: 111168, used: 0, free: 111168")
+
+
+def qstr_info(verbose=None):
+    print("qstr pool: n_pool=0, n_qstr=0, n_str_data_bytes=0, n_total_bytes=0")
+
+
+def stack_use():
+    return 0
+
+
+_SIM_DIR = os.path.dirname(os.path.abspath(__file__))
+_STDLIB_DIR = os.path.dirname(os.path.abspath(os.__file__))  # the host's own library code
+_saved_builtins = {}
+
+
+def _check_heap(depth=2):
+    """MemoryError if the heap is locked and the caller is not simulator code"""
+    if _heap_locked:
+        caller = os.path.abspath(sys._getframe(depth).f_code.co_filename)
+        if not caller.startswith((_SIM_DIR, _STDLIB_DIR)):
+            raise MemoryError("memory allocation failed, heap is locked")
+
+
+class _GuardedType(type):
+    """Stands in for a builtin type: isinstance() still works, calls are checked"""
+
+    def __call__(cls, *args, **kwargs):
+        _check_heap()
+        return cls.real(*args, **kwargs)
+
+    def __instancecheck__(cls, obj):
+        return isinstance(obj, cls.real)
+
+    def __subclasscheck__(cls, sub):
+        return issubclass(sub, cls.real)
+
+    def __getattr__(cls, name):
+        return getattr(cls.real, name)
+
+
+def _guard_function(func):
+    def guarded(*args, **kwargs):
+        _check_heap()
+        return func(*args, **kwargs)
+    return guarded
+
+
+def _install_guards():
+    for name in ("bytearray", "bytes", "memoryview", "list", "tuple", "dict", "float"):
+        real = getattr(builtins, name)
+        _saved_builtins[(builtins, name)] = real
+        setattr(builtins, name, _GuardedType(name, (), {"real": real}))
+    for name in ("pack", "unpack"):
+        real = getattr(struct, name)
+        _saved_builtins[(struct, name)] = real
+        setattr(struct, name, _guard_function(real))
+
+
+def _remove_guards():
+    for (module, name), real in _saved_builtins.items():
+        setattr(module, name, real)
+    _saved_builtins.clear()
+
+
+def heap_lock():
+    global _heap_locked
+    _heap_locked += 1
+    if _heap_locked == 1:
+        _install_guards()
+    return _heap_locked - 1
+
+
+def heap_unlock():
+    global _heap_locked
+    _heap_locked = max(0, _heap_locked - 1)
+    if not _heap_locked:
+        _remove_guards()
+    return _heap_locked
+
+
+def heap_locked():
+    return _heap_locked
+
+
+def alloc_emergency_exception_buf(size):
+    pass
+
+
+def opt_level(level=None):
+    global _opt_level
+    if level is None:
+        return _opt_level
+    _opt_level = level
+
+
+def kbd_intr(chr):
+    """Set the byte that raises KeyboardInterrupt (-1: none); the fake board honours it"""
+    global _kbd_intr_char
+    _kbd_intr_char = chr
+
+
+def schedule(func, arg):
+    func(arg)
+
+
+# Viper code uses these as casts; make them resolvable on CPython too
+class _Pointer:
+    def __init__(self, buf, size):
+        self._buf = memoryview(buf).cast("B")
+        self._size = size
+
+    def __getitem__(self, i):
+        off = i * self._size
+        return int.from_bytes(self._buf[off:off + self._size], "little")
+
+    def __setitem__(self, i, value):
+        off = i * self._size
+        self._buf[off:off + self._size] = (value & ((1 << 8 * self._size) - 1)).to_bytes(self._size, "little")
+
+
+def ptr8(buf):
+    return _Pointer(buf, 1)
+
+
+def ptr16(buf):
+    return _Pointer(buf, 2)
+
+
+def ptr32(buf):
+    return _Pointer(buf, 4)
+
+
+def uint(value):
+    return int(value) & 0xFFFFFFFF
+
+
+VIPER_BUILTINS = {"ptr8": ptr8, "ptr16": ptr16, "ptr32": ptr32, "uint": uint}
+
+
+def install_viper_builtins():
+    for name, func in VIPER_BUILTINS.items():
+        if not hasattr(builtins, name):
+            setattr(builtins, name, func)
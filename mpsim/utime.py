@@ -0,0 +1,51 @@
+# MicroPython-style time module for the simulator
+# Host time functions plus sleep_ms/sleep_us and the ticks_* family, all
+# driven by the simulated board's clock
+
+import time as _host_time
+import types
+
+from .clock import TICKS_MAX, ticks_add, ticks_diff
+
+
+def build(board):
+    """Create a `time` module bound to board.clock"""
+    mod = types.ModuleType("time")
+    mod.__doc__ = "MicroPython time module (simulated)"
+    for name in dir(_host_time):
+        if not name.startswith("__"):
+            setattr(mod, name, getattr(_host_time, name))
+
+    def sleep(seconds):
+        board.clock.sleep_us(seconds * 1_000_000)
+
+    def sleep_ms(ms):
+        board.clock.sleep_us(ms * 1000)
+
+    def sleep_us(us):
+        board.clock.sleep_us(us)
+
+    def ticks_us():
+        return board.clock.now_us() & TICKS_MAX
+
+    def ticks_ms():
+        return (board.clock.now_us() // 1000) & TICKS_MAX
+
+    def time():
+        # MicroPython on the ESP32 returns whole seconds
+        return int(board.clock.time())
+
+    def time_ns():
+        return int(board.clock.time() * 1_000_000_000)
+
+    mod.sleep = sleep
+    mod.sleep_ms = sleep_ms
+    mod.sleep_us = sleep_us
+    mod.ticks_us = ticks_us
+    mod.ticks_ms = ticks_ms
+    mod.ticks_cpu = ticks_us
+    mod.ticks_add = ticks_add
+    mod.ticks_diff = ticks_diff
+    mod.time = time
+    mod.time_ns = time_ns
+    return mod
@@ -8,7 +8,13 @@ import time
 print("Starting OLED Test...")
 
 # I2C setup - CORRECTED PINS
-i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
+# bus_factory picks hardware I2C at the fastest clock the OLED handles
+try:
+    import bus_factory
+    i2c = bus_factory.get_i2c(4, 5)
+    print(f"I2C: {bus_factory.describe(4, 5)}")
+except ImportError:
+    i2c = SoftI2C(sda=Pin(4), scl=Pin(5))
 
 # OLED setup (128x64)
 oled = ssd1306.SSD1306_I2C(128, 64, i2c)
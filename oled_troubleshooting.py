@@ -7,22 +7,43 @@ import time
 print("🔍 OLED Display Troubleshooting")
 print("=" * 50)
 
+try:
+    # Reuses bus and display objects between tries instead of a new 1 KB buffer each time
+    import driver_pool
+except ImportError:
+    driver_pool = None
+
+def get_bus(sda_pin, scl_pin, hw_id=None):
+    """The bus on these pins (pooled when driver_pool is installed)"""
+    if driver_pool:
+        return driver_pool.i2c(sda_pin, scl_pin, hw_id=hw_id)
+    if hw_id is None:
+        return SoftI2C(sda=Pin(sda_pin), scl=Pin(scl_pin))
+    return I2C(hw_id, sda=Pin(sda_pin), scl=Pin(scl_pin))
+
+def get_oled(i2c):
+    import ssd1306
+    if driver_pool:
+        return driver_pool.display(128, 64, i2c)
+    return ssd1306.SSD1306_I2C(128, 64, i2c)
+
 def test_i2c_scan():
     """Scan for I2C devices to see what's connected"""
     print("\n📡 Scanning for I2C devices...")
     
-    # Try different I2C configurations
+    # Try different I2C configurations; each bus is set up just before its scan,
+    # since both hardware entries use controller 0
     i2c_configs = [
-        ("SoftI2C - Pins 13,15", SoftI2C(sda=Pin(13), scl=Pin(15))),
-        ("SoftI2C - Pins 21,22", SoftI2C(sda=Pin(21), scl=Pin(22))),
-        ("Hardware I2C - Pins 21,22", I2C(0, sda=Pin(21), scl=Pin(22))),
-        ("Hardware I2C - Pins 22,21", I2C(0, sda=Pin(22), scl=Pin(21)))
+        ("SoftI2C - Pins 13,15", 13, 15, None),
+        ("SoftI2C - Pins 21,22", 21, 22, None),
+        ("Hardware I2C - Pins 21,22", 21, 22, 0),
+        ("Hardware I2C - Pins 22,21", 22, 21, 0)
     ]
     
-    for config_name, i2c in i2c_configs:
+    for config_name, sda_pin, scl_pin, hw_id in i2c_configs:
         try:
             print(f"\n🔍 Testing {config_name}:")
-            devices = i2c.scan()
+            devices = get_bus(sda_pin, scl_pin, hw_id).scan()
             if devices:
                 print(f"  ✅ Found {len(devices)} device(s):")
                 for device in devices:
@@ -42,9 +63,6 @@ def test_oled_connection():
     print("\n📺 Testing OLED Display Connection")
     
     try:
-        from machine import Pin, SoftI2C
-        import ssd1306
-        
         # Try different pin combinations
         pin_combinations = [
             (13, 15),  # Original pins
@@ -57,8 +75,7 @@ def test_oled_connection():
         for sda_pin, scl_pin in pin_combinations:
             print(f"\n🔍 Testing OLED with SDA={sda_pin}, SCL={scl_pin}:")
             try:
-                i2c = SoftI2C(sda=Pin(sda_pin), scl=Pin(scl_pin))
-                oled = ssd1306.SSD1306_I2C(128, 64, i2c)
+                oled = get_oled(get_bus(sda_pin, scl_pin))
                 
                 # Test basic functionality
                 oled.fill(0)
@@ -74,6 +91,8 @@ def test_oled_connection():
                 oled.show()
                 return True
                 
+            except ImportError:
+                raise  # no ssd1306.py: no point trying other pins
             except Exception as e:
                 print(f"  ❌ Failed: {e}")
         
@@ -127,6 +146,10 @@ def run_diagnostic():
     # Step 3: Check hardware
     check_hardware_connections()
     
+    if driver_pool:
+        print()
+        driver_pool.report()
+    
     # Summary
     print("\n" + "=" * 50)
     print("📊 DIAGNOSTIC SUMMARY")
@@ -7,6 +7,21 @@ import time
 print("🔍 ESP32 Pin Finder for OLED Display")
 print("=" * 50)
 
+try:
+    # Reuses bus and display objects between tries instead of a new 1 KB buffer each time
+    import driver_pool
+except ImportError:
+    driver_pool = None
+
+def get_bus(sda_pin, scl_pin, i2c_type="SoftI2C"):
+    """The bus on these pins (pooled when driver_pool is installed)"""
+    hw_id = None if i2c_type == "SoftI2C" else 0
+    if driver_pool:
+        return driver_pool.i2c(sda_pin, scl_pin, hw_id=hw_id)
+    if hw_id is None:
+        return SoftI2C(sda=Pin(sda_pin), scl=Pin(scl_pin))
+    return I2C(hw_id, sda=Pin(sda_pin), scl=Pin(scl_pin))
+
 def test_pin_availability():
     """Test which pins are available on your ESP32"""
     print("\n📌 Testing Pin Availability...")
@@ -29,6 +44,16 @@ def test_pin_availability():
     
     return available_pins
 
+OLED_PARTS = ("SSD1306", "SH1106", "OLED?")
+
+def identify_devices(i2c, devices):
+    """{address: part name}, read from chip registers when i2c_fingerprint is installed"""
+    try:
+        import i2c_fingerprint
+    except ImportError:
+        return {addr: "OLED?" for addr in devices if addr in (0x3C, 0x3D)}
+    return {e["addr"]: e["part"] for e in i2c_fingerprint.identify(i2c, devices) if e["part"] != "unknown"}
+
 def test_i2c_combinations():
     """Test different I2C pin combinations"""
     print("\n📡 Testing I2C Pin Combinations...")
@@ -55,38 +80,40 @@ def test_i2c_combinations():
         print(f"\n🔍 Testing SDA={sda_pin}, SCL={scl_pin}:")
         try:
             # Try SoftI2C first
-            i2c = SoftI2C(sda=Pin(sda_pin), scl=Pin(scl_pin))
+            i2c = get_bus(sda_pin, scl_pin)
             devices = i2c.scan()
             
             if devices:
                 print(f"  ✅ SoftI2C: Found {len(devices)} device(s)")
+                parts = identify_devices(i2c, devices)
                 for addr in devices:
                     print(f"    Address: 0x{addr:02X}")
-                    if addr in [0x3C, 0x3D, 0x78, 0x7A]:
-                        print(f"    ⭐ This looks like an OLED display!")
-                working_combinations.append(("SoftI2C", sda_pin, scl_pin, devices))
+                    if addr in parts:
+                        print(f"    ⭐ {parts[addr]}")
+                working_combinations.append(("SoftI2C", sda_pin, scl_pin, devices, parts))
             else:
                 print(f"  ⚠️ SoftI2C: No devices found (but pins work)")
-                working_combinations.append(("SoftI2C", sda_pin, scl_pin, []))
+                working_combinations.append(("SoftI2C", sda_pin, scl_pin, [], {}))
                 
         except Exception as e:
             print(f"  ❌ SoftI2C: Failed - {e}")
         
         try:
             # Try Hardware I2C
-            i2c = I2C(0, sda=Pin(sda_pin), scl=Pin(scl_pin))
+            i2c = get_bus(sda_pin, scl_pin, "Hardware I2C")
             devices = i2c.scan()
             
             if devices:
                 print(f"  ✅ Hardware I2C: Found {len(devices)} device(s)")
+                parts = identify_devices(i2c, devices)
                 for addr in devices:
                     print(f"    Address: 0x{addr:02X}")
-                    if addr in [0x3C, 0x3D, 0x78, 0x7A]:
-                        print(f"    ⭐ This looks like an OLED display!")
-                working_combinations.append(("Hardware I2C", sda_pin, scl_pin, devices))
+                    if addr in parts:
+                        print(f"    ⭐ {parts[addr]}")
+                working_combinations.append(("Hardware I2C", sda_pin, scl_pin, devices, parts))
             else:
                 print(f"  ⚠️ Hardware I2C: No devices found (but pins work)")
-                working_combinations.append(("Hardware I2C", sda_pin, scl_pin, []))
+                working_combinations.append(("Hardware I2C", sda_pin, scl_pin, [], {}))
                 
         except Exception as e:
             print(f"  ❌ Hardware I2C: Failed - {e}")
@@ -98,17 +125,16 @@ def test_oled_with_pins(sda_pin, scl_pin, i2c_type="SoftI2C"):
     print(f"\n📺 Testing OLED with {i2c_type} - SDA={sda_pin}, SCL={scl_pin}")
     
     try:
-        from machine import Pin, SoftI2C, I2C
         import ssd1306
         
-        # Create I2C object
-        if i2c_type == "SoftI2C":
-            i2c = SoftI2C(sda=Pin(sda_pin), scl=Pin(scl_pin))
-        else:
-            i2c = I2C(0, sda=Pin(sda_pin), scl=Pin(scl_pin))
+        # The same bus object the scan used
+        i2c = get_bus(sda_pin, scl_pin, i2c_type)
         
-        # Try to create OLED object
-        oled = ssd1306.SSD1306_I2C(128, 64, i2c)
+        # Try to create OLED object (the pooled one is re-initialised, not rebuilt)
+        if driver_pool:
+            oled = driver_pool.display(128, 64, i2c)
+        else:
+            oled = ssd1306.SSD1306_I2C(128, 64, i2c)
         
         # Test basic functionality
         oled.fill(0)
@@ -135,6 +161,16 @@ def test_oled_with_pins(sda_pin, scl_pin, i2c_type="SoftI2C"):
         print(f"  ❌ OLED test failed: {e}")
         return False
 
+def save_discovered_bus(sda_pin, scl_pin, devices):
+    """Save the working pins where i2c_discovery (and scripts using it) look first"""
+    try:
+        import i2c_discovery
+    except ImportError:
+        return
+    config = {"sda": sda_pin, "scl": scl_pin, "freq": i2c_discovery.PROBE_FREQ, "devices": devices}
+    if i2c_discovery.save_cache(config):
+        print(f"  💾 Saved to {i2c_discovery.CACHE_FILE}")
+
 def find_best_pins():
     """Find the best available pins for OLED"""
     print("🚀 Finding Best Pins for OLED Display")
@@ -152,10 +188,14 @@ def find_best_pins():
     oled_working = False
     best_config = None
     
-    for i2c_type, sda_pin, scl_pin, devices in working_combinations:
+    for i2c_type, sda_pin, scl_pin, devices, parts in working_combinations:
+        # Only initialise the driver where a display was identified
+        if not any(part in OLED_PARTS for part in parts.values()):
+            continue
         if test_oled_with_pins(sda_pin, scl_pin, i2c_type):
             oled_working = True
             best_config = (i2c_type, sda_pin, scl_pin)
+            save_discovered_bus(sda_pin, scl_pin, devices)
             break
     
     # Summary
@@ -167,7 +207,7 @@ def find_best_pins():
     print(f"   {available_pins}")
     
     print(f"\n📡 Working I2C combinations: {len(working_combinations)}")
-    for i2c_type, sda_pin, scl_pin, devices in working_combinations:
+    for i2c_type, sda_pin, scl_pin, devices, parts in working_combinations:
         print(f"   {i2c_type}: SDA={sda_pin}, SCL={scl_pin}")
         if devices:
             print(f"     Found devices: {[hex(d) for d in devices]}")
@@ -194,6 +234,10 @@ def find_best_pins():
         print(f"   2. Wrong voltage (needs 3.3V)")
         print(f"   3. Missing ssd1306 library")
         print(f"   4. OLED display is faulty")
+    
+    if driver_pool:
+        print()
+        driver_pool.report()
 
 # Run the pin finder
 if __name__ == "__main__":
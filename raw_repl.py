@@ -0,0 +1,8 @@
+#!/usr/bin/env python3
+"""
+MicroPython Raw REPL Session
+The session class lives in the boardlink package (boardlink/raw_repl.py);
+this module keeps `from raw_repl import RawREPL` working for the host scripts.
+"""
+
+from boardlink.raw_repl import RawREPL, RawREPLError, RawREPLTimeout  # noqa: F401
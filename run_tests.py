@@ -0,0 +1,336 @@
+#!/usr/bin/env python3
+"""
+Unified Test Runner
+Finds every test registered with @test(...) under tests/, selects them by
+tag, name or free pins, and runs them in one raw REPL session. Only the
+modules the selection needs are packed into the upload bundle, and only
+files whose hash differs from the copy on the board are sent at all.
+"""
+
+import ast
+import base64
+import json
+import os
+import shutil
+import subprocess
+import sys
+import tempfile
+
+from collect_results import parse_results, print_summary, write_results
+from raw_repl import RawREPL, RawREPLTimeout
+from transfer import compress, sha256_hex
+
+TESTS_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "tests")
+SUPPORT_MODULES = ["result_log.py", "registry.py"]
+DEVICE_ROOT = "/tests"
+BUNDLE_FILE = "/tests.bundle"
+CHUNK_SIZE = 3072  # raw bytes per write while uploading the bundle
+TIMEOUT_MARGIN_S = 30
+
+
+def discover(tests_dir=TESTS_DIR):
+    """Read test declarations from the @test(...) decorators without running them"""
+    found = []
+    for folder, _dirs, files in sorted(os.walk(tests_dir)):
+        for filename in sorted(files):
+            if not filename.endswith(".py"):
+                continue
+            path = os.path.join(folder, filename)
+            with open(path, encoding="utf-8") as f:
+                tree = ast.parse(f.read(), path)
+            for node in tree.body:
+                if not isinstance(node, ast.FunctionDef):
+                    continue
+                for deco in node.decorator_list:
+                    if not (isinstance(deco, ast.Call) and getattr(deco.func, "id", None) == "test"):
+                        continue
+                    kwargs = {kw.arg: ast.literal_eval(kw.value) for kw in deco.keywords}
+                    found.append({
+                        "name": ast.literal_eval(deco.args[0]),
+                        "tags": tuple(kwargs.get("tags", ())),
+                        "pins": tuple(kwargs.get("pins", ())),
+                        "duration_ms": kwargs.get("duration_ms", 0),
+                        "file": os.path.relpath(path, tests_dir).replace(os.sep, "/"),
+                    })
+    return found
+
+
+def select(tests, tags=None, names=None, exclude=None, avoid_pins=None):
+    """Same rules as registry.select() on the board, plus a pin filter"""
+    chosen = []
+    for entry in tests:
+        if names and entry["name"] not in names:
+            continue
+        if tags and not any(t in entry["tags"] for t in tags):
+            continue
+        if exclude and any(t in entry["tags"] for t in exclude):
+            continue
+        if avoid_pins and any(p in avoid_pins for p in entry["pins"]):
+            continue
+        chosen.append(entry)
+    return chosen
+
+
+def bundle_files(selection):
+    """Relative paths of the modules a selection needs"""
+    files = list(SUPPORT_MODULES)
+    for entry in selection:
+        if entry["file"] not in files:
+            files.append(entry["file"])
+    return files
+
+
+def pack(files, tests_dir=TESTS_DIR):
+    """Bundle format: '<path>\\n<size>\\n<bytes>' for each file"""
+    out = bytearray()
+    for rel in files:
+        with open(os.path.join(tests_dir, rel), "rb") as f:
+            data = f.read()
+        out += f"{rel}\n{len(data)}\n".encode() + data
+    return bytes(out)
+
+
+HASH_SCRIPT = """
+import json
+try:
+    import hashlib, binascii
+except ImportError:
+    hashlib = None
+def _hash(path):
+    try:
+        h = hashlib.sha256()
+        with open(path, 'rb') as f:
+            while True:
+                block = f.read(512)
+                if not block:
+                    break
+                h.update(block)
+        return binascii.hexlify(h.digest()).decode()
+    except Exception:
+        return None
+try:
+    import deflate
+    _deflate = True
+except ImportError:
+    _deflate = False
+print(json.dumps({'deflate': _deflate, 'files': {p: _hash(%(root)r + '/' + p) for p in %(files)r}}))
+"""
+
+WRITE_SCRIPT = """
+import binascii
+with open(%(bundle)r, %(mode)r) as f:
+    f.write(binascii.a2b_base64(%(chunk)r))
+"""
+
+UNPACK_SCRIPT = """
+import os
+def _makedirs(path):
+    part = ''
+    for name in path.split('/'):
+        if not name:
+            continue
+        part += '/' + name if part or path.startswith('/') else name
+        try:
+            os.mkdir(part)
+        except OSError:
+            pass
+with open(%(bundle)r, 'rb') as raw:
+    src = raw
+    if %(compressed)r:
+        import deflate
+        src = deflate.DeflateIO(raw, deflate.ZLIB)
+    while True:
+        name = src.readline()
+        if not name:
+            break
+        name = name.decode().strip()
+        size = int(src.readline())
+        path = %(root)r + '/' + name
+        _makedirs(path.rsplit('/', 1)[0])
+        with open(path, 'wb') as out:
+            while size:
+                block = src.read(min(size, 512))
+                out.write(block)
+                size -= len(block)
+os.remove(%(bundle)r)
+"""
+
+RUN_SCRIPT = """
+import sys
+if %(root)r not in sys.path:
+    sys.path.insert(0, %(root)r)
+for _name in list(sys.modules):
+    if _name in %(modules)r or _name == 'registry':
+        del sys.modules[_name]
+import registry
+for _module in %(modules)r:
+    __import__(_module)
+registry.run(registry.select(names=%(names)r), %(suite)r)
+"""
+
+
+def module_names(files):
+    return [f[:-3].replace("/", ".") for f in files if f not in SUPPORT_MODULES]
+
+
+def run_script(root, selection, files, suite):
+    return RUN_SCRIPT % {
+        "root": root,
+        "modules": module_names(files),
+        "names": [entry["name"] for entry in selection],
+        "suite": suite,
+    }
+
+
+def _exec(repl, code, timeout):
+    repl.send(code)
+    stdout, stderr = repl.follow(timeout)
+    if stderr.strip():
+        raise RuntimeError(stderr.strip().splitlines()[-1])
+    return stdout
+
+
+def upload_changed(repl, files):
+    """Send the files whose hash differs from the board's copy as one bundle"""
+    stdout = _exec(repl, HASH_SCRIPT % {"root": DEVICE_ROOT, "files": files}, 20)
+    state = json.loads(stdout.strip().splitlines()[-1])
+    changed = []
+    for rel in files:
+        with open(os.path.join(TESTS_DIR, rel), "rb") as f:
+            if sha256_hex(f.read()) != state["files"].get(rel):
+                changed.append(rel)
+    if not changed:
+        print(f"📦 All {len(files)} modules already on the board")
+        return
+    bundle = pack(changed)
+    payload = compress(bundle) if state["deflate"] else bundle
+    print(f"📦 Uploading {len(changed)}/{len(files)} modules: {len(bundle)} bytes"
+          + (f" ({len(payload)} compressed)" if state["deflate"] else ""))
+    for offset in range(0, len(payload), CHUNK_SIZE):
+        chunk = base64.b64encode(payload[offset:offset + CHUNK_SIZE]).decode()
+        mode = "wb" if offset == 0 else "ab"
+        _exec(repl, WRITE_SCRIPT % {"bundle": BUNDLE_FILE, "mode": mode, "chunk": chunk}, 10)
+    _exec(repl, UNPACK_SCRIPT % {"bundle": BUNDLE_FILE, "root": DEVICE_ROOT,
+                                 "compressed": bool(state["deflate"])}, 30)
+
+
+def run_on_board(port, selection, suite, timeout):
+    """Upload what changed and run the selection, all in one raw REPL session"""
+    files = bundle_files(selection)
+    with RawREPL(port) as repl:
+        upload_changed(repl, files)
+        repl.send(run_script(DEVICE_ROOT, selection, files, suite))
+        try:
+            stdout, stderr = repl.follow(timeout)
+        except RawREPLTimeout as e:
+            stdout, stderr = repl.interrupt()
+            stdout = e.partial.decode(errors="replace") + stdout
+            stderr += f"\nTimed out after {timeout:.0f}s"
+    print(stdout)
+    if stderr.strip():
+        print(stderr.strip())
+    return stdout
+
+
+def run_in_simulator(selection, suite, timeout):
+    """Unpack the same bundle into a temp folder and run it under mpsim"""
+    files = bundle_files(selection)
+    workdir = tempfile.mkdtemp(prefix="esp32_tests_")
+    try:
+        bundle_path = os.path.join(workdir, "tests.bundle")
+        with open(bundle_path, "wb") as f:
+            f.write(pack(files))
+        root = os.path.join(workdir, "tests").replace(os.sep, "/")
+        script = os.path.join(workdir, "session.py")
+        with open(script, "w") as f:
+            f.write(UNPACK_SCRIPT % {"bundle": bundle_path, "root": root, "compressed": False})
+            f.write(run_script(root, selection, files, suite))
+        result = subprocess.run(
+            [sys.executable, "-m", "mpsim", "--virtual", script],
+            capture_output=True, text=True, timeout=timeout,
+            cwd=os.path.dirname(TESTS_DIR),
+        )
+        print(result.stdout)
+        if result.returncode != 0:
+            print(result.stderr.strip())
+        return result.stdout
+    finally:
+        shutil.rmtree(workdir, ignore_errors=True)
+
+
+def print_selection(selection):
+    print(f"{'Test':<28} {'Tags':<38} {'Pins':<20} {'Time':>7}")
+    print("-" * 96)
+    for entry in selection:
+        pins = ",".join(str(p) for p in entry["pins"]) or "-"
+        print(f"{entry['name']:<28} {','.join(entry['tags']):<38} {pins:<20} {entry['duration_ms'] / 1000:6.1f}s")
+    total = sum(e["duration_ms"] for e in selection) / 1000
+    print(f"📋 {len(selection)} tests in {len(bundle_files(selection)) - len(SUPPORT_MODULES)} modules, ~{total:.0f}s expected")
+
+
+def _parse_list(value, convert=str, sep=","):
+    return [convert(v.strip()) for v in value.split(sep) if v.strip()]
+
+
+def main():
+    args = sys.argv[1:]
+    if not args or args[0] not in ("list", "run"):
+        print("Usage:")
+        print("  run_tests.py list [options]")
+        print("  run_tests.py run <port|sim> [options]")
+        print("Options:")
+        print("  --tags a,b          tests with any of these tags (e.g. core, adc, i2c)")
+        print("  --names 'A;B'       tests with these exact names (semicolon separated)")
+        print("  --exclude a,b       drop tests with these tags (e.g. interactive)")
+        print("  --avoid-pins 13,15  drop tests that need these pins")
+        print("  --out file.jsonl    where to save the results")
+        sys.exit(1)
+
+    command = args.pop(0)
+    target = args.pop(0) if command == "run" and args and not args[0].startswith("--") else None
+    options = {}
+    while args:
+        key = args.pop(0)
+        if not key.startswith("--") or not args:
+            print(f"❌ Bad option: {key}")
+            sys.exit(1)
+        options[key[2:]] = args.pop(0)
+
+    selection = select(
+        discover(),
+        tags=_parse_list(options["tags"]) if "tags" in options else None,
+        names=_parse_list(options["names"], sep=";") if "names" in options else None,
+        exclude=_parse_list(options["exclude"]) if "exclude" in options else None,
+        avoid_pins=_parse_list(options["avoid-pins"], int) if "avoid-pins" in options else None,
+    )
+    if not selection:
+        print("❌ No tests match that selection")
+        sys.exit(1)
+
+    print_selection(selection)
+    if command == "list":
+        return
+    if target is None:
+        print("❌ run needs a port (or 'sim')")
+        sys.exit(1)
+
+    suite = options.get("tags", "selection").replace(",", "+")
+    timeout = sum(e["duration_ms"] for e in selection) / 1000 * 1.5 + TIMEOUT_MARGIN_S
+    if target == "sim":
+        output = run_in_simulator(selection, suite, timeout)
+    else:
+        output = run_on_board(target, selection, suite, timeout)
+
+    records = parse_results(output)
+    print_summary(records)
+    if records:
+        safe_target = target.replace("/", "_").replace("\\", "_").strip("_")
+        out = options.get("out", f"test_results_{suite}_{safe_target}.jsonl")
+        write_results(records, out, target)
+        print(f"📄 Results written to {out}")
+    tests = [r for r in records if r.get("event") == "test"]
+    sys.exit(0 if tests and all(r["status"] == "pass" for r in tests) else 1)
+
+
+if __name__ == "__main__":
+    main()
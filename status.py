@@ -1,11 +1,30 @@
 import serial.tools.list_ports
 import subprocess
 import sys
+from concurrent.futures import ThreadPoolExecutor
+
+# USB VID/PID of the serial bridges and native USB stacks found on
+# MicroPython boards
+KNOWN_USB_IDS = {
+    (0x10C4, 0xEA60): "CP210x (ESP32 DevKit)",
+    (0x1A86, 0x7523): "CH340 (ESP32/ESP8266)",
+    (0x1A86, 0x55D4): "CH9102 (ESP32)",
+    (0x0403, 0x6001): "FTDI FT232R",
+    (0x0403, 0x6015): "FTDI FT231X",
+    (0x303A, 0x1001): "ESP32-S2/S3/C3 USB-JTAG",
+    (0x303A, 0x4001): "ESP32-S2 native USB",
+    (0x2E8A, 0x0005): "Raspberry Pi Pico (MicroPython)",
+    (0xF055, 0x9800): "Pyboard (MicroPython)",
+}
 
 def is_board_connected():
     """Check if a development board is connected via serial port"""
     ports = serial.tools.list_ports.comports()
     
+    # Boards are recognised by their USB VID/PID first; no need to open the port
+    if any(identify_port(port) for port in ports):
+        return True
+    
     # Common board identifiers
     board_identifiers = [
         'USB', 'UART', 'COM', 'Serial', 'ESP32', 'ESP8266', 
@@ -21,16 +40,40 @@ def is_board_connected():
             if identifier.lower() in description or identifier.lower() in manufacturer:
                 return True
     
-    # Also check if mpremote can find any devices
+    return False
+
+def identify_port(port):
+    """Return a board description for a port from its USB VID/PID, or None"""
+    if port.vid is None:
+        return None
+    return KNOWN_USB_IDS.get((port.vid, port.pid))
+
+def is_micropython(port_device, timeout=8):
+    """Check that the board on a port answers a raw REPL exec as MicroPython"""
     try:
-        result = subprocess.run(['mpremote', 'list'], 
-                              capture_output=True, text=True, timeout=5)
-        if result.returncode == 0 and result.stdout.strip():
-            return True
+        result = subprocess.run(
+            [sys.executable, '-m', 'mpremote', 'connect', port_device,
+             'exec', 'import sys; print(sys.implementation.name)'],
+            capture_output=True, text=True, timeout=timeout)
+        return result.returncode == 0 and 'micropython' in result.stdout
     except (subprocess.TimeoutExpired, FileNotFoundError):
-        pass
+        return False
+
+def find_micropython_boards(verify=True):
+    """Return [(device, description)] for every attached MicroPython board"""
+    candidates = []
+    for port in serial.tools.list_ports.comports():
+        name = identify_port(port)
+        if name:
+            candidates.append((port.device, name))
     
-    return False
+    if not verify or not candidates:
+        return candidates
+    
+    # Probe all candidates at once rather than one timeout after another
+    with ThreadPoolExecutor(max_workers=len(candidates)) as pool:
+        answers = list(pool.map(lambda c: is_micropython(c[0]), candidates))
+    return [c for c, ok in zip(candidates, answers) if ok]
 
 def get_connected_ports():
     """Get list of connected serial ports"""
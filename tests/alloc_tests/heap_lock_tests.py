@@ -0,0 +1,256 @@
+# Allocation Tests - driver hot paths with the heap locked
+# Each driver method that control loops, timers or IRQ handlers call is run
+# once to warm up, then many times under micropython.heap_lock(). Any
+# allocation raises MemoryError on the board (and in the simulator for calls
+# to the allocating builtins), so a pass means the method is safe to call
+# where the GC must not run.
+
+import micropython
+from machine import Pin, SoftI2C
+from registry import test, select, run
+
+I2C_SDA = 13
+I2C_SCL = 15
+ONEWIRE_PIN = 4
+CALLS = 20
+
+
+def locked(label, func, calls=CALLS):
+    """True if func allocates nothing once warmed up; prints the outcome"""
+    func()  # first call may fill caches
+    failed = False
+    result = None
+    micropython.heap_lock()
+    try:
+        for _ in range(calls):
+            result = func()
+    except MemoryError:
+        failed = True
+    finally:
+        micropython.heap_unlock()
+    if failed:
+        print(f"  ❌ {label}: allocates")
+        return False
+    if isinstance(result, float):
+        print(f"  ❌ {label}: returns a float (a heap object on the board)")
+        return False
+    print(f"  ✅ {label}: {calls} calls with the heap locked")
+    return True
+
+
+def all_locked(checks):
+    """Run every (label, func) check; True only if all of them pass"""
+    ok = True
+    for label, func in checks:
+        ok = locked(label, func) and ok
+    return ok
+
+
+def _bus():
+    return SoftI2C(sda=Pin(I2C_SDA), scl=Pin(I2C_SCL), freq=400000)
+
+
+@test("Heap Lock: PCA9685", tags=("alloc", "drivers"), pins=(13, 15), duration_ms=200)
+def test_pca9685_locked():
+    """Duty and PWM updates without allocation"""
+    print("🔒 PCA9685 hot paths")
+    try:
+        import pca9685
+        pca = pca9685.PCA9685(_bus())
+        return all_locked([
+            ("duty(0, 2048)", lambda: pca.duty(0, 2048)),
+            ("duty(0, 4095)", lambda: pca.duty(0, 4095)),
+            ("pwm(1, 0, 1024)", lambda: pca.pwm(1, 0, 1024)),
+            ("duty(0) read", lambda: pca.duty(0)),
+        ])
+    except Exception as e:
+        print(f"❌ PCA9685 heap lock test FAILED: {e}")
+        return False
+
+
+@test("Heap Lock: SSD1306", tags=("alloc", "drivers", "oled"), pins=(13, 15), duration_ms=2000)
+def test_ssd1306_locked():
+    """Drawing and full/partial refreshes without allocation"""
+    print("🔒 SSD1306 hot paths")
+    try:
+        import ssd1306
+        oled = ssd1306.SSD1306_I2C(128, 64, _bus())
+
+        def draw():
+            oled.fill_rect(0, 0, 128, 8, 0)
+            oled.text("locked", 0, 0)
+
+        return all_locked([
+            ("fill_rect + text", draw),
+            ("show()", oled.show),
+            ("show(2, 3)", lambda: oled.show(2, 3)),
+            ("contrast(128)", lambda: oled.contrast(128)),
+        ])
+    except Exception as e:
+        print(f"❌ SSD1306 heap lock test FAILED: {e}")
+        return False
+
+
+@test("Heap Lock: OLED Widgets", tags=("alloc", "drivers", "oled"), pins=(13, 15), duration_ms=3000)
+def test_oled_widgets_locked():
+    """Strip chart, bar meter and display manager updates without allocation"""
+    print("🔒 OLED widget hot paths")
+    try:
+        import ssd1306
+        import oled_charts
+        import display_manager
+        i2c = _bus()
+        oled = ssd1306.SSD1306_I2C(128, 64, i2c)
+        chart = oled_charts.StripChart(oled, 0, 16, 128, 48, lo=0, hi=4095)
+        meter = oled_charts.BarMeter(oled, 0, 8, 128, 8, lo=0, hi=4095)
+        displays = display_manager.DisplayManager(i2c)
+        displays.add("main", oled)
+        state = [0]
+
+        def sample():
+            state[0] = (state[0] + 97) & 4095
+            return state[0]
+
+        def update():
+            displays.mark_rows("main", 8, 56)
+            displays.tick()
+
+        return all_locked([
+            ("StripChart.push", lambda: chart.push(sample())),
+            ("BarMeter.set", lambda: meter.set(sample())),
+            ("StripChart.show", chart.show),
+            ("DisplayManager mark + tick", update),
+        ])
+    except Exception as e:
+        print(f"❌ OLED widget heap lock test FAILED: {e}")
+        return False
+
+
+@test("Heap Lock: OLED Font", tags=("alloc", "drivers", "oled"), duration_ms=100)
+def test_oled_font_locked():
+    """Cached glyphs draw without allocation (needs font.fnt on the board)"""
+    print("🔒 OLED font hot path")
+    try:
+        import framebuf
+        import oled_font
+        try:
+            font = oled_font.Font("font.fnt")
+        except OSError:
+            print("  ⚠️ No font.fnt (make one with font_converter.py): skipped")
+            return True
+        fb = framebuf.FrameBuffer(bytearray(128 * 64 // 8), 128, 64, framebuf.MONO_VLSB)
+        ok = all_locked([
+            ("Font.text", lambda: font.text(fb, "21.5 C", 0, 0)),
+            ("Font.measure", lambda: font.measure("21.5 C")),
+        ])
+        font.close()
+        return ok
+    except Exception as e:
+        print(f"❌ OLED font heap lock test FAILED: {e}")
+        return False
+
+
+@test("Heap Lock: DS18B20", tags=("alloc", "drivers", "onewire"), pins=(4,), duration_ms=1000)
+def test_ds18x20_locked():
+    """Conversions and integer readings over the library's own OneWire without allocation"""
+    print("🔒 DS18B20 hot paths")
+    try:
+        import ds18x20
+        import onewire
+        probe = ds18x20.DS18X20(onewire.OneWire(Pin(ONEWIRE_PIN)))
+        roms = probe.scan()
+        if not roms:
+            print(f"  ⚠️ No DS18B20 on GPIO{ONEWIRE_PIN}: skipped")
+            return True
+        rom = roms[0]
+        print(f"  Probe {bytes(rom).hex()}: {probe.read_temp_raw(rom) / 16} C")
+        return all_locked([
+            ("DS18X20.convert_temp", probe.convert_temp),
+            ("DS18X20.read_temp_raw", lambda: probe.read_temp_raw(rom)),
+        ])
+    except Exception as e:
+        print(f"❌ DS18B20 heap lock test FAILED: {e}")
+        return False
+
+
+@test("Heap Lock: Sensors and Outputs", tags=("alloc", "drivers"), pins=(2, 4, 5), duration_ms=3000)
+def test_sensors_outputs_locked():
+    """DHT22 integer readings, servo and NeoPixel updates without allocation"""
+    print("🔒 Sensor and output hot paths")
+    try:
+        import dht
+        import neopixel
+        import servo
+        sensor = dht.DHT22(Pin(4))
+        sensor.measure()
+        arm = servo.Servo(2)
+        strip = neopixel.NeoPixel(5, 8)
+        color = (10, 20, 30)
+
+        def pixels():
+            strip[0] = color
+            strip.write()
+
+        ok = all_locked([
+            ("DHT22.temperature_raw", sensor.temperature_raw),
+            ("DHT22.humidity_raw", sensor.humidity_raw),
+            ("Servo.write(90)", lambda: arm.write(90)),
+            ("NeoPixel set + write", pixels),
+        ])
+        arm.detach()
+        return ok
+    except Exception as e:
+        print(f"❌ Sensor/output heap lock test FAILED: {e}")
+        return False
+
+
+@test("Heap Lock: Fast Loops", tags=("alloc", "drivers"), duration_ms=500)
+def test_fast_loops_locked():
+    """Native CRC, pixel fill, column shift and batch map: no allocation, same results as Python"""
+    print("🔒 fast_loops hot paths")
+    try:
+        import fast_loops
+    except (ImportError, SyntaxError, ValueError) as e:
+        print(f"  ⚠️ fast_loops not usable here ({e}): libraries use their Python loops; skipped")
+        return True
+    try:
+        from array import array
+        import onewire
+        import utils
+        scratchpad = bytearray(b"\x91\x01\x4b\x46\x7f\xff\x0f\x10\x00")
+        scratchpad[8] = onewire._crc8_py(scratchpad[:8])
+        pixels = bytearray(8 * 3)
+        screen = bytearray(128 * 64 // 8)
+        readings = array("H", range(0, 4096, 64))
+        mapped = array("H", bytes(2 * len(readings)))
+        expected = array("H", bytes(2 * len(readings)))
+        utils._map_values_py(readings, expected, 0, 4095, 0, 100)
+
+        ok = all_locked([
+            ("crc8", lambda: fast_loops.crc8(scratchpad)),
+            ("fill_grb", lambda: fast_loops.fill_grb(pixels, 8, 10, 20, 30)),
+            ("shift_columns", lambda: fast_loops.shift_columns(screen, 256, 128, 128, 6)),
+            ("map_values", lambda: fast_loops.map_values(readings, mapped, 0, 4095, 0, 100)),
+        ])
+        if fast_loops.crc8(scratchpad) != 0:
+            print("  ❌ crc8 of a scratchpad with its CRC is not 0")
+            ok = False
+        if pixels[:3] != b"\x14\x0a\x1e":
+            print(f"  ❌ fill_grb wrote {bytes(pixels[:3])}, expected GRB order")
+            ok = False
+        if mapped != expected:
+            print("  ❌ map_values differs from utils.map_value")
+            ok = False
+        return ok
+    except Exception as e:
+        print(f"❌ fast_loops heap lock test FAILED: {e}")
+        return False
+
+
+def run_alloc_tests():
+    """Run every heap-lock test"""
+    return run(select(tags=("alloc",)), "heap_lock_tests")
+
+
+if __name__ == "__main__":
+    run_alloc_tests()
@@ -0,0 +1,295 @@
+# Driver Benchmarks - hot path timings for the lab libraries
+# Times each driver hot path with ticks_us over many calls and prints one
+# "@@BENCH {...}" JSON line per benchmark (median/p95 in us, bytes allocated
+# per call). benchmark.py on the host stores and compares the results.
+
+import gc
+import json
+import time
+from array import array
+from machine import ADC, Pin, SoftI2C
+
+MARKER = "@@BENCH "
+
+# Wiring used by the benchmarks (same as the test suite)
+I2C_SDA = 13
+I2C_SCL = 15
+ADC_PIN = 35
+ONEWIRE_PIN = 4
+NEOPIXEL_PIN = 5
+NEOPIXEL_COUNT = 8
+OLED_ADDR = 0x3C
+PCA9685_ADDR = 0x40
+FONT_FILE = "font.fnt"  # made by font_converter.py and copied to the board
+
+
+def _library_hash(module):
+    """Short hash of the installed driver file, so results track driver changes"""
+    try:
+        import hashlib, binascii
+        h = hashlib.sha256()
+        with open(module.__file__, "rb") as f:
+            while True:
+                block = f.read(512)
+                if not block:
+                    break
+                h.update(block)
+        return binascii.hexlify(h.digest()).decode()[:12]
+    except Exception:
+        return None
+
+
+def measure(func, iterations=100, warmup=5):
+    """Per-call ticks_us median/p95 and bytes allocated per call"""
+    for _ in range(warmup):
+        func()
+    times = array("I", bytes(4 * iterations))
+    gc.collect()
+    gc.disable()
+    try:
+        alloc_start = gc.mem_alloc()
+        for i in range(iterations):
+            start = time.ticks_us()
+            func()
+            times[i] = time.ticks_diff(time.ticks_us(), start)
+        alloc = gc.mem_alloc() - alloc_start
+    finally:
+        gc.enable()
+    ordered = sorted(times)
+    return {
+        "iterations": iterations,
+        "median_us": ordered[iterations // 2],
+        "p95_us": ordered[min(iterations - 1, iterations * 95 // 100)],
+        "min_us": ordered[0],
+        "alloc_per_call": alloc // iterations,
+    }
+
+
+def report(name, library, stats=None, error=None, **extra):
+    record = {"bench": name, "library": library.__name__ if library else None,
+              "lib_hash": _library_hash(library) if library else None}
+    if stats:
+        record.update(stats)
+        record.update(extra)
+    else:
+        record["error"] = error
+    print(MARKER + json.dumps(record))
+
+
+# ---- benchmarks ----
+
+def bench_oled_show(i2c):
+    import ssd1306
+    oled = ssd1306.SSD1306_I2C(128, 64, i2c, addr=OLED_ADDR)
+    oled.fill(0)
+    oled.text("bench", 0, 0)
+    stats = measure(oled.show, iterations=20)
+    report("oled_show", ssd1306, stats, fps=1_000_000 // max(stats["median_us"], 1))
+
+
+def bench_oled_frames(i2c):
+    import os
+    import ssd1306
+    oled = ssd1306.SSD1306_I2C(128, 64, i2c, addr=OLED_ADDR)
+    # Two full-screen frames in the image_converter.py format
+    path = "bench_frames.img"
+    with open(path, "wb") as f:
+        f.write(b"MPI1\x80\x00\x40\x00\x02\x00" + bytes(4))
+        f.write(b"\xaa" * 1024)
+        f.write(b"\x55" * 1024)
+    image = ssd1306.ImageFile(path)
+    state = [0]
+
+    def frame():
+        state[0] ^= 1
+        oled.draw_frame(image, state[0])
+        oled.show()
+
+    try:
+        stats = measure(frame, iterations=20)
+    finally:
+        image.close()
+        os.remove(path)
+    report("oled_frame_stream", ssd1306, stats, fps=1_000_000 // max(stats["median_us"], 1))
+
+
+def bench_strip_chart(i2c):
+    import ssd1306
+    import oled_charts
+    oled = ssd1306.SSD1306_I2C(128, 64, i2c, addr=OLED_ADDR)
+    chart = oled_charts.StripChart(oled, 0, 16, 128, 48, lo=0, hi=100)
+    state = [0]
+
+    def push():
+        state[0] = (state[0] + 7) % 100
+        chart.push(state[0])
+        chart.show()
+
+    def redraw():
+        chart.redraw()
+        chart.show()
+
+    stats = measure(push, iterations=50)
+    report("strip_chart_push", oled_charts, stats, fps=1_000_000 // max(stats["median_us"], 1))
+    stats = measure(redraw, iterations=20)
+    report("strip_chart_redraw", oled_charts, stats, fps=1_000_000 // max(stats["median_us"], 1))
+
+
+def bench_i2c_throughput(i2c):
+    payload = bytearray(129)
+    payload[0] = 0x40  # SSD1306 data write: lands in display RAM
+    stats = measure(lambda: i2c.writeto(OLED_ADDR, payload), iterations=50)
+    report("i2c_write_128B", None, stats,
+           bytes_per_s=len(payload) * 1_000_000 // max(stats["median_us"], 1))
+
+
+def bench_adc_read():
+    adc = ADC(Pin(ADC_PIN))
+    adc.atten(ADC.ATTN_11DB)
+    stats = measure(adc.read_u16, iterations=500)
+    report("adc_read_u16", None, stats,
+           samples_per_s=1_000_000 // max(stats["median_us"], 1))
+
+
+def bench_onewire():
+    import onewire
+    ow = onewire.OneWire(Pin(ONEWIRE_PIN))
+
+    def transaction():
+        ow.reset()
+        ow.writebyte(0xCC)  # SKIP ROM
+        ow.writebyte(0xBE)  # READ SCRATCHPAD
+        ow.readbyte()
+
+    report("onewire_transaction", onewire, measure(transaction, iterations=20))
+
+
+def bench_pca9685(i2c):
+    import pca9685
+    pca = pca9685.PCA9685(i2c, PCA9685_ADDR)
+    values = (0, 1024, 2048, 4095)
+    state = [0]
+
+    def update():
+        state[0] = (state[0] + 1) & 3
+        pca.duty(0, values[state[0]])
+
+    report("pca9685_duty", pca9685, measure(update, iterations=100))
+
+
+def bench_neopixel():
+    import neopixel
+    np = neopixel.NeoPixel(NEOPIXEL_PIN, NEOPIXEL_COUNT)
+    np.fill((10, 20, 30))
+    stats = measure(np.write, iterations=50)
+    report("neopixel_write_%d" % NEOPIXEL_COUNT, neopixel, stats)
+
+
+def bench_text():
+    import framebuf
+    fb = framebuf.FrameBuffer(bytearray(128 * 64 // 8), 128, 64, framebuf.MONO_VLSB)
+    line = "Temp 21.5C  RH 40%"
+    stats = measure(lambda: fb.text(line, 0, 0, 1), iterations=100)
+    report("text_builtin_8x8", None, stats, chars=len(line))
+
+    try:
+        import oled_font
+        font = oled_font.Font(FONT_FILE)
+    except (ImportError, OSError) as e:
+        report("text_font_cached", None, error="%s: %s" % (type(e).__name__, e))
+        return
+    stats = measure(lambda: font.text(fb, line, 0, 16), iterations=100)
+    report("text_font_cached", oled_font, stats, chars=len(line), font_height=font.height,
+           cache_misses=font.misses)
+    font.close()
+
+
+def _compare(name, library, python_path, fast_path, iterations):
+    """Time the pure-Python and fast_loops versions of one loop; report both"""
+    import fast_loops
+    slow = measure(python_path, iterations=iterations)
+    fast = measure(fast_path, iterations=iterations)
+    report(name + "_py", library, slow)
+    report(name + "_fast", fast_loops, fast,
+           speedup=round(slow["median_us"] / max(fast["median_us"], 1), 1))
+
+
+def bench_fast_loops():
+    # Only the board's numbers mean anything: the simulator runs the viper
+    # and native functions as plain Python
+    try:
+        import fast_loops
+    except (ImportError, SyntaxError, ValueError) as e:
+        report("fast_loops", None, error="%s: %s" % (type(e).__name__, e))
+        return
+    import framebuf
+    import neopixel
+    import oled_charts
+    import onewire
+    import utils
+
+    scratchpad = bytearray(b"\x91\x01\x4b\x46\x7f\xff\x0f\x10\x00")
+    scratchpad[8] = onewire._crc8_py(scratchpad[:8])
+    _compare("crc8_9B", onewire, lambda: onewire._crc8_py(scratchpad),
+             lambda: fast_loops.crc8(scratchpad), 100)
+
+    pin = Pin(ONEWIRE_PIN, Pin.OPEN_DRAIN, Pin.PULL_UP)
+    _compare("ow_writebyte", onewire, lambda: onewire._writebyte_py(pin, 0xBE),
+             lambda: fast_loops.ow_writebyte(pin, 0xBE), 20)
+
+    np = neopixel.NeoPixel(NEOPIXEL_PIN, 60)
+    color = (10, 20, 30)
+
+    def fill_py():
+        neopixel._fast = None
+        np.fill(color)
+        neopixel._fast = fast_loops
+
+    _compare("neopixel_fill_60", neopixel, fill_py, lambda: np.fill(color), 50)
+
+    fb = framebuf.FrameBuffer(bytearray(128 * 64 // 8), 128, 64, framebuf.MONO_VLSB)
+    chart = oled_charts.StripChart(fb, 0, 16, 128, 48, lo=0, hi=100)
+
+    def push_py():
+        oled_charts._fast = None
+        chart.push(50)
+        oled_charts._fast = fast_loops
+
+    _compare("chart_scroll", oled_charts, push_py, lambda: chart.push(50), 50)
+
+    readings = array("H", range(0, 4096, 16))
+    mapped = array("H", bytes(2 * len(readings)))
+    _compare("map_values_256", utils,
+             lambda: utils._map_values_py(readings, mapped, 0, 4095, 0, 100),
+             lambda: fast_loops.map_values(readings, mapped, 0, 4095, 0, 100), 20)
+
+
+def run_all():
+    """Run every benchmark; a missing device is reported, not fatal"""
+    i2c = SoftI2C(sda=Pin(I2C_SDA), scl=Pin(I2C_SCL), freq=400000)
+    found = i2c.scan()
+    benches = [
+        ("oled_show", lambda: bench_oled_show(i2c), OLED_ADDR),
+        ("oled_frame_stream", lambda: bench_oled_frames(i2c), OLED_ADDR),
+        ("strip_chart", lambda: bench_strip_chart(i2c), OLED_ADDR),
+        ("i2c_write_128B", lambda: bench_i2c_throughput(i2c), OLED_ADDR),
+        ("adc_read_u16", bench_adc_read, None),
+        ("onewire_transaction", bench_onewire, None),
+        ("pca9685_duty", lambda: bench_pca9685(i2c), PCA9685_ADDR),
+        ("neopixel_write_%d" % NEOPIXEL_COUNT, bench_neopixel, None),
+        ("text", bench_text, None),
+        ("fast_loops", bench_fast_loops, None),
+    ]
+    for name, func, needs_addr in benches:
+        if needs_addr is not None and needs_addr not in found:
+            report(name, None, error="no device at 0x%02X" % needs_addr)
+            continue
+        try:
+            func()
+        except Exception as e:
+            report(name, None, error="%s: %s" % (type(e).__name__, e))
+        gc.collect()
+
+
+if __name__ == "__main__":
+    run_all()
@@ -3,7 +3,9 @@
 
 import time
 import machine
+from registry import test, select, run
 
+@test("SPI Basic", tags=("communication", "spi", "core"), pins=(12, 13, 14), duration_ms=50)
 def test_spi_basic():
     """Test basic SPI functionality"""
     print("📡 Testing SPI Basic")
@@ -28,6 +30,7 @@ def test_spi_basic():
         print(f"❌ SPI Basic Test FAILED: {e}")
         return False
 
+@test("SPI Alternative", tags=("communication", "spi", "core"), pins=(12, 13, 14), duration_ms=50)
 def test_spi_alternative():
     """Test SPI with alternative configuration"""
     print("📡 Testing SPI Alternative Config")
@@ -51,6 +54,34 @@ def test_spi_alternative():
         print(f"❌ SPI Alternative Test FAILED: {e}")
         return False
 
+@test("SPI Loopback Sweep", tags=("communication", "spi", "jumper"), pins=(12, 13, 14), duration_ms=12000)
+def test_spi_loopback_sweep():
+    """Characterise SPI clocks with a MOSI(13) to MISO(12) jumper"""
+    print("📡 Testing SPI Loopback Sweep")
+    print("-" * 30)
+    
+    try:
+        import spi_characterise
+        
+        if not spi_characterise.jumper_present(sck=14, mosi=13, miso=12):
+            print("  No jumper from MOSI (13) to MISO (12) - sweep skipped")
+            print("  Note: Connect the jumper to measure the SPI limits")
+            print("✅ SPI Loopback Sweep Test PASSED")
+            return True
+        
+        found = spi_characterise.characterise(sck=14, mosi=13, miso=12)
+        for host, entry in found["hosts"].items():
+            assert entry["max_baud"] > 0, f"{spi_characterise.HOSTS[int(host)]} failed at its lowest clock"
+        print(f"  Limits saved to {spi_characterise.LIMITS_FILE}")
+        
+        print("✅ SPI Loopback Sweep Test PASSED")
+        return True
+    except Exception as e:
+        print(f"❌ SPI Loopback Sweep Test FAILED: {e}")
+        print("Note: This test needs spi_characterise.py from micropython_libraries")
+        return False
+
+@test("I2C Basic", tags=("communication", "i2c"), pins=(13, 15), duration_ms=100)
 def test_i2c_basic():
     """Test I2C basic functionality"""
     print("📡 Testing I2C Basic")
@@ -79,6 +110,7 @@ def test_i2c_basic():
         print(f"❌ I2C Basic Test FAILED: {e}")
         return False
 
+@test("I2C Alternative", tags=("communication", "i2c"), pins=(21, 22), duration_ms=100)
 def test_i2c_alternative():
     """Test I2C with alternative pins"""
     print("📡 Testing I2C Alternative Pins")
@@ -107,6 +139,33 @@ def test_i2c_alternative():
         print(f"❌ I2C Alternative Test FAILED: {e}")
         return False
 
+@test("I2C Bus Speed", tags=("communication", "i2c"), pins=(13, 15), duration_ms=300)
+def test_i2c_bus_speed():
+    """Test the fastest stable clock the bus factory picks"""
+    print("📡 Testing I2C Bus Speed")
+    print("-" * 30)
+    
+    try:
+        import bus_factory
+        
+        i2c = bus_factory.get_i2c(13, 15)
+        info = bus_factory.info(13, 15)
+        print(f"  {bus_factory.describe(13, 15)}")
+        
+        if info["verified"]:
+            assert info["bytes_per_s"] > 0, "no throughput measured"
+            assert bus_factory.get_i2c(13, 15) is i2c, "bus was not reused"
+        else:
+            print("  Note: No I2C device to check the clock against")
+        
+        print("✅ I2C Bus Speed Test PASSED")
+        return True
+    except Exception as e:
+        print(f"❌ I2C Bus Speed Test FAILED: {e}")
+        print("Note: This test needs bus_factory.py from micropython_libraries")
+        return False
+
+@test("OLED Display", tags=("communication", "i2c", "oled", "core"), pins=(13, 15), duration_ms=3200)
 def test_oled_display():
     """Test OLED display via I2C"""
     print("📡 Testing OLED Display")
@@ -142,6 +201,7 @@ def test_oled_display():
         print("Note: This test requires OLED display connected to pins 13,15")
         return False
 
+@test("SPI with Device", tags=("communication", "spi"), pins=(12, 13, 14, 18, 19, 23), duration_ms=100)
 def test_spi_with_device():
     """Test SPI with actual device (if connected)"""
     print("📡 Testing SPI with Device")
@@ -176,32 +236,7 @@ def test_spi_with_device():
 # Run all communication tests
 def run_communication_tests():
     """Run all communication-related tests"""
-    print("📡 COMMUNICATION TESTS")
-    print("=" * 50)
-    
-    tests = [
-        ("SPI Basic", test_spi_basic),
-        ("SPI Alternative", test_spi_alternative),
-        ("I2C Basic", test_i2c_basic),
-        ("I2C Alternative", test_i2c_alternative),
-        ("OLED Display", test_oled_display),
-        ("SPI with Device", test_spi_with_device)
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        print(f"\n🧪 Running: {test_name}")
-        if test_func():
-            passed += 1
-        print()
-    
-    print("=" * 50)
-    print(f"📡 Communication Tests: {passed}/{total} PASSED")
-    print("=" * 50)
-    
-    return passed == total
+    return run(select(tags=("communication",)), "spi_i2c_tests")
 
 if __name__ == "__main__":
     run_communication_tests()
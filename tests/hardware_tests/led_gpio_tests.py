@@ -3,7 +3,9 @@
 
 import time
 import machine
+from registry import test, select, run
 
+@test("LED Basic Control", tags=("hardware", "led", "core"), pins=(2,), duration_ms=4000)
 def test_led_basic():
     """Test basic LED ON/OFF functionality"""
     print("🔆 Testing LED Basic Control")
@@ -26,6 +28,7 @@ def test_led_basic():
         print(f"❌ LED Basic Test FAILED: {e}")
         return False
 
+@test("LED Blink Pattern", tags=("hardware", "led", "core"), pins=(2,), duration_ms=5000)
 def test_led_blink():
     """Test LED blinking pattern"""
     print("🔆 Testing LED Blink Pattern")
@@ -48,6 +51,7 @@ def test_led_blink():
         print(f"❌ LED Blink Test FAILED: {e}")
         return False
 
+@test("Button-LED Interaction", tags=("hardware", "button", "core", "interactive"), pins=(0, 2), duration_ms=10000)
 def test_button_led():
     """Test button interaction with LED"""
     print("🔘 Testing Button-LED Interaction")
@@ -75,6 +79,7 @@ def test_button_led():
         print(f"❌ Button-LED Test FAILED: {e}")
         return False
 
+@test("GPIO Pins", tags=("hardware", "gpio"), pins=(2, 4, 5, 18, 19), duration_ms=2000)
 def test_gpio_pins():
     """Test multiple GPIO pins"""
     print("🔌 Testing GPIO Pins")
@@ -111,30 +116,7 @@ def test_gpio_pins():
 # Run all hardware tests
 def run_hardware_tests():
     """Run all hardware-related tests"""
-    print("🔧 HARDWARE TESTS")
-    print("=" * 50)
-    
-    tests = [
-        ("LED Basic Control", test_led_basic),
-        ("LED Blink Pattern", test_led_blink),
-        ("Button-LED Interaction", test_button_led),
-        ("GPIO Pins", test_gpio_pins)
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        print(f"\n🧪 Running: {test_name}")
-        if test_func():
-            passed += 1
-        print()
-    
-    print("=" * 50)
-    print(f"📊 Hardware Tests: {passed}/{total} PASSED")
-    print("=" * 50)
-    
-    return passed == total
+    return run(select(tags=("hardware",)), "led_gpio_tests")
 
 if __name__ == "__main__":
     run_hardware_tests()
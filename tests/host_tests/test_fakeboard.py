@@ -0,0 +1,57 @@
+#!/usr/bin/env python3
+"""
+Host Tests for the Fake Board
+Starts mpsim.fakeboard on a pseudo-terminal and drives it with the real
+mpremote, the way host tools talk to a board.
+
+Usage: python -m pytest tests/host_tests
+"""
+
+import os
+import subprocess
+import sys
+
+import pytest
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+pytest.importorskip("mpremote")
+pytestmark = pytest.mark.skipif(not hasattr(os, "openpty"), reason="needs a pseudo-terminal")
+
+
+@pytest.fixture
+def port():
+    """A fresh fake board; yields its pty path"""
+    proc = subprocess.Popen([sys.executable, "-u", "-m", "mpsim.fakeboard", "--baud", "0"],
+                            cwd=REPO_ROOT, stdout=subprocess.PIPE, text=True)
+    try:
+        line = proc.stdout.readline()  # "🔌 Fake ESP32 on /dev/pts/N (...)"
+        yield line.split(" on ", 1)[1].split()[0]
+    finally:
+        proc.terminate()
+        proc.wait(5)
+
+
+def mpremote(port, *args):
+    return subprocess.run([sys.executable, "-m", "mpremote", "connect", port] + list(args),
+                          capture_output=True, text=True, timeout=30)
+
+
+def test_cp_to_new_file(port, tmp_path):
+    local = tmp_path / "hello.txt"
+    local.write_text("hello board\n")
+    result = mpremote(port, "fs", "cp", str(local), ":hello.txt")
+    assert result.returncode == 0, result.stdout + result.stderr
+    result = mpremote(port, "fs", "cat", ":hello.txt")
+    assert result.stdout == "hello board\n"
+
+
+def test_missing_file_is_oserror(port):
+    result = mpremote(port, "exec", "open('missing.txt')")
+    assert "OSError: [Errno 2] ENOENT" in result.stdout + result.stderr
+    assert "FileNotFoundError" not in result.stdout + result.stderr
+
+
+def test_reports_micropython(port):
+    result = mpremote(port, "exec", "import sys; print(sys.implementation.name, sys.platform)")
+    assert result.stdout.split() == ["micropython", "esp32"]
@@ -0,0 +1,78 @@
+# Test Registry - one list of every ESP32 test
+# Test modules declare their tests with @test(name, tags, pins, duration_ms);
+# runners select them by tag or name and run them through ResultLog.
+# run_tests.py on the host reads the same decorators to build upload bundles.
+
+from result_log import ResultLog
+
+TESTS = []
+
+
+def test(name, tags=(), pins=(), duration_ms=0):
+    """Register a test function; the first tag is its category"""
+    def register(func):
+        TESTS.append({
+            "name": name,
+            "func": func,
+            "tags": tuple(tags),
+            "pins": tuple(pins),
+            "duration_ms": duration_ms,
+        })
+        return func
+    return register
+
+
+def select(tags=None, names=None, exclude=None):
+    """Tests matching any of `tags` (or listed in `names`), minus `exclude` tags"""
+    chosen = []
+    for entry in TESTS:
+        if names is not None and entry["name"] not in names:
+            continue
+        if tags is not None and not any(t in entry["tags"] for t in tags):
+            continue
+        if exclude and any(t in entry["tags"] for t in exclude):
+            continue
+        chosen.append(entry)
+    return chosen
+
+
+def run(tests, suite="registry"):
+    """Run tests grouped by category; returns True when all of them pass"""
+    log = ResultLog(suite)
+    log.begin()
+
+    categories = []
+    for entry in tests:
+        category = entry["tags"][0] if entry["tags"] else "other"
+        if category not in categories:
+            categories.append(category)
+
+    for category in categories:
+        group = [e for e in tests if (e["tags"][0] if e["tags"] else "other") == category]
+        print(f"\n{'='*60}")
+        print(f"🧪 {category.upper()} TESTS")
+        print(f"{'='*60}")
+        passed = 0
+        for entry in group:
+            print(f"\n🔍 Running: {entry['name']}")
+            print("-" * 40)
+            status, error = log.run(entry["name"], entry["func"], category)
+            if status == "pass":
+                print(f"✅ PASS: {entry['name']}")
+                passed += 1
+            elif status == "fail":
+                print(f"❌ FAIL: {entry['name']}")
+            else:
+                print(f"❌ ERROR: {entry['name']} - {error}")
+        print(f"\n📊 {category}: {passed}/{len(group)} PASSED")
+
+    log.end()
+    print(f"\n{'='*60}")
+    print("📊 FINAL TEST SUMMARY")
+    print(f"{'='*60}")
+    print(f"Total Tests: {log.total}")
+    print(f"Passed: {log.passed}")
+    print(f"Failed: {log.total - log.passed}")
+    if log.total:
+        print(f"Success Rate: {(log.passed/log.total)*100:.1f}%")
+    return log.passed == log.total
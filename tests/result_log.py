@@ -0,0 +1,87 @@
+# Result Log - machine-readable test results
+# Prints one JSON line per test (status, ticks_us duration, free heap before
+# and after, exception text) so collect_results.py can pick them out of the
+# serial stream. Upload it next to the test runners.
+
+import gc
+import json
+import os
+import sys
+import time
+
+MARKER = "@@TEST "
+
+
+def emit(record):
+    """Print one result line for the host collector"""
+    print(MARKER + json.dumps(record))
+
+
+def board_info():
+    """Identify the board and firmware the results came from"""
+    uname = os.uname()
+    info = {
+        "platform": sys.platform,
+        "machine": uname.machine,
+        "release": uname.release,
+        "version": uname.version,
+    }
+    try:
+        import machine
+        info["freq"] = machine.freq()
+        info["uid"] = machine.unique_id().hex()
+    except Exception:
+        pass
+    return info
+
+
+class ResultLog:
+    def __init__(self, suite):
+        self.suite = suite
+        self.total = 0
+        self.passed = 0
+        self.start_us = time.ticks_us()
+
+    def begin(self):
+        record = {"event": "start", "suite": self.suite}
+        record.update(board_info())
+        emit(record)
+
+    def run(self, name, func, category=None):
+        """Run one test function; returns (status, error_text)"""
+        gc.collect()
+        mem_before = gc.mem_free()
+        error = None
+        start = time.ticks_us()
+        try:
+            status = "pass" if func() else "fail"
+        except Exception as e:
+            status = "error"
+            error = "%s: %s" % (type(e).__name__, e)
+        duration = time.ticks_diff(time.ticks_us(), start)
+        mem_after = gc.mem_free()
+
+        self.total += 1
+        if status == "pass":
+            self.passed += 1
+        emit({
+            "event": "test",
+            "suite": self.suite,
+            "category": category,
+            "test": name,
+            "status": status,
+            "us": duration,
+            "mem_before": mem_before,
+            "mem_after": mem_after,
+            "error": error,
+        })
+        return status, error
+
+    def end(self):
+        emit({
+            "event": "end",
+            "suite": self.suite,
+            "total": self.total,
+            "passed": self.passed,
+            "us": time.ticks_diff(time.ticks_us(), self.start_us),
+        })
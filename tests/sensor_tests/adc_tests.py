@@ -3,7 +3,9 @@
 
 import time
 import machine
+from registry import test, select, run
 
+@test("ADC Basic (Pin 35)", tags=("sensors", "adc", "core"), pins=(35,), duration_ms=2500)
 def test_adc_basic():
     """Test basic ADC functionality on pin 35"""
     print("📊 Testing ADC Basic (Pin 35)")
@@ -29,6 +31,7 @@ def test_adc_basic():
         print(f"❌ ADC Basic Test FAILED: {e}")
         return False
 
+@test("ADC Dual (Pins 34,35)", tags=("sensors", "adc", "core"), pins=(34, 35), duration_ms=5000)
 def test_adc_dual():
     """Test dual ADC pins (34 and 35)"""
     print("📊 Testing ADC Dual (Pins 34,35)")
@@ -62,6 +65,7 @@ def test_adc_dual():
         print(f"❌ ADC Dual Test FAILED: {e}")
         return False
 
+@test("ADC Multiple Pins", tags=("sensors", "adc"), pins=(32, 33, 34, 35, 36, 39), duration_ms=3000)
 def test_adc_multiple_pins():
     """Test multiple ADC pins"""
     print("📊 Testing ADC Multiple Pins")
@@ -100,6 +104,7 @@ def test_adc_multiple_pins():
         print(f"❌ ADC Multiple Pins Test FAILED: {e}")
         return False
 
+@test("ADC with Potentiometer", tags=("sensors", "adc", "interactive"), pins=(35, 13, 15), duration_ms=10000)
 def test_adc_with_potentiometer():
     """Test ADC with potentiometer (if connected)"""
     print("📊 Testing ADC with Potentiometer")
@@ -116,6 +121,23 @@ def test_adc_with_potentiometer():
         print("Turn it slowly and watch the values change!")
         print("Reading for 10 seconds...")
         
+        # Plot on the OLED as well, if one is on the bus (SDA=13, SCL=15)
+        oled = chart = meter = None
+        try:
+            from machine import SoftI2C
+            import ssd1306, oled_charts
+            i2c = SoftI2C(sda=Pin(13), scl=Pin(15))
+            if 0x3C in i2c.scan():
+                oled = ssd1306.SSD1306_I2C(128, 64, i2c)
+                oled.fill(0)
+                oled.text("Pot pin 35", 0, 0)
+                meter = oled_charts.BarMeter(oled, 0, 8, 128, 8, lo=0, hi=4095)
+                chart = oled_charts.StripChart(oled, 0, 16, 128, 48, lo=0, hi=4095)
+                oled.show()
+                print("Plotting on the OLED too")
+        except ImportError:
+            pass
+        
         for i in range(20):  # 10 seconds with 0.5s intervals
             raw_value = adc.read()
             voltage = raw_value * (3.3 / 4095)
@@ -125,6 +147,10 @@ def test_adc_with_potentiometer():
             bar = "█" * bar_length + "░" * (20 - bar_length)
             
             print(f"  {i+1:2d}: {raw_value:4d} -> {voltage:.3f}V [{bar}]")
+            if chart:
+                meter.set(raw_value)
+                chart.push(raw_value)
+                oled.show(1, 7)  # the meter and chart pages; the title stays put
             time.sleep(0.5)
         
         print("✅ ADC Potentiometer Test PASSED")
@@ -136,30 +162,7 @@ def test_adc_with_potentiometer():
 # Run all sensor tests
 def run_sensor_tests():
     """Run all sensor-related tests"""
-    print("📊 SENSOR TESTS")
-    print("=" * 50)
-    
-    tests = [
-        ("ADC Basic (Pin 35)", test_adc_basic),
-        ("ADC Dual (Pins 34,35)", test_adc_dual),
-        ("ADC Multiple Pins", test_adc_multiple_pins),
-        ("ADC with Potentiometer", test_adc_with_potentiometer)
-    ]
-    
-    passed = 0
-    total = len(tests)
-    
-    for test_name, test_func in tests:
-        print(f"\n🧪 Running: {test_name}")
-        if test_func():
-            passed += 1
-        print()
-    
-    print("=" * 50)
-    print(f"📊 Sensor Tests: {passed}/{total} PASSED")
-    print("=" * 50)
-    
-    return passed == total
+    return run(select(tags=("sensors",)), "adc_tests")
 
 if __name__ == "__main__":
     run_sensor_tests()
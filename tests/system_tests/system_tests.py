@@ -0,0 +1,45 @@
+# System Tests - board information and timing
+# Tests for firmware details and time measurement accuracy
+
+import time
+import os
+import machine
+from registry import test, select, run
+
+TIMING_TOLERANCE_MS = 50  # allowed sleep overshoot
+
+@test("System Information", tags=("system", "core"), duration_ms=50)
+def test_system_info():
+    """Test system information"""
+    print("Board name:", os.uname().machine)
+    print("Firmware version:", os.uname().version)
+    print("MicroPython version:", os.uname().release)
+    print("CPU Frequency:", machine.freq(), "Hz")
+    print("Unique ID:", machine.unique_id().hex())
+    return True
+
+@test("Timing Functions", tags=("system", "timing", "core"), duration_ms=2200)
+def test_timing():
+    """Test timing functions"""
+    start = time.ticks_ms()
+    time.sleep(2)
+    uptime = time.ticks_diff(time.ticks_ms(), start)
+    print(f"Measured 2 seconds: {uptime} ms")
+    
+    start_us = time.ticks_us()
+    time.sleep_ms(100)
+    short = time.ticks_diff(time.ticks_us(), start_us)
+    print(f"Measured 100 ms: {short} us")
+    
+    ok = 2000 <= uptime <= 2000 + TIMING_TOLERANCE_MS
+    ok = ok and 100_000 <= short <= (100 + TIMING_TOLERANCE_MS) * 1000
+    ok = ok and time.ticks_diff(time.ticks_add(start, 10), start) == 10
+    return ok
+
+# Run all system tests
+def run_system_tests():
+    """Run all system-related tests"""
+    return run(select(tags=("system",)), "system_tests")
+
+if __name__ == "__main__":
+    run_system_tests()
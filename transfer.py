@@ -0,0 +1,185 @@
+#!/usr/bin/env python3
+"""
+Compressed File Transfer for MicroPython Boards
+Sends files over mpremote as deflate streams, decompresses them on the board
+and verifies the result with a SHA-256 hash before replacing the target file.
+"""
+
+import hashlib
+import os
+import subprocess
+import sys
+import tempfile
+import zlib
+
+DEFAULT_PORT = "COM6"
+
+# A 1KB window keeps the decompressor's heap use small on the ESP32
+# (DeflateIO allocates 2**WINDOW_BITS bytes for the window).
+WINDOW_BITS = 10
+
+# Compression only pays off when the bytes saved on the wire outweigh the
+# extra decompression step on the board.
+COMPRESS_MIN_SIZE = 512
+COMPRESS_MIN_SAVING = 0.15
+
+# Runs on the board. The staged file is streamed through DeflateIO (when
+# compressed) into a temporary file, hashed on the way, and only renamed over
+# the target when the hash matches.
+DEVICE_SCRIPT = """
+import os, hashlib, binascii
+def _xfer(staged, part, target, digest, compressed):
+    src = open(staged, 'rb')
+    stream = src
+    if compressed:
+        try:
+            import deflate
+        except ImportError:
+            src.close()
+            os.remove(staged)
+            print('XFER NODEFLATE')
+            return
+        stream = deflate.DeflateIO(src, deflate.ZLIB)
+    h = hashlib.sha256()
+    buf = bytearray(512)
+    mv = memoryview(buf)
+    dst = open(part, 'wb')
+    while True:
+        n = stream.readinto(buf)
+        if not n:
+            break
+        dst.write(mv[:n])
+        h.update(mv[:n])
+    dst.close()
+    src.close()
+    os.remove(staged)
+    got = binascii.hexlify(h.digest()).decode()
+    if got != digest:
+        os.remove(part)
+        print('XFER BADHASH', got)
+        return
+    try:
+        os.remove(target)
+    except OSError:
+        pass
+    os.rename(part, target)
+    print('XFER OK', got)
+_xfer({staged!r}, {part!r}, {target!r}, {digest!r}, {compressed!r})
+del _xfer
+"""
+
+
+def sha256_hex(data):
+    """Return the SHA-256 hex digest of some bytes"""
+    return hashlib.sha256(data).hexdigest()
+
+
+def compress(data):
+    """Deflate data with a zlib header and a board-friendly window size"""
+    compressor = zlib.compressobj(9, zlib.DEFLATED, WINDOW_BITS)
+    return compressor.compress(data) + compressor.flush()
+
+
+def plan_transfer(data, allow_compression=True):
+    """Choose the payload for a file: (payload_bytes, is_compressed)"""
+    if not allow_compression or len(data) < COMPRESS_MIN_SIZE:
+        return data, False
+
+    packed = compress(data)
+    if len(packed) <= len(data) * (1 - COMPRESS_MIN_SAVING):
+        return packed, True
+    return data, False
+
+
+def build_device_script(remote_path, digest, compressed):
+    """Build the code executed on the board after the payload is staged"""
+    return DEVICE_SCRIPT.format(
+        staged=remote_path + ".xfer",
+        part=remote_path + ".part",
+        target=remote_path,
+        digest=digest,
+        compressed=compressed,
+    )
+
+
+def _run_transfer(port, payload, remote_path, digest, compressed, timeout):
+    """Stage a payload on the board and run the unpack/verify script"""
+    fd, staged_local = tempfile.mkstemp(suffix=".xfer")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(payload)
+
+        # One mpremote process: copy the payload, then unpack it in the same session
+        cmd = [
+            sys.executable, "-m", "mpremote", "connect", port,
+            "fs", "cp", staged_local, f":{remote_path}.xfer",
+            "+", "exec", build_device_script(remote_path, digest, compressed),
+        ]
+        result = subprocess.run(cmd, capture_output=True, text=True, timeout=timeout)
+    finally:
+        os.remove(staged_local)
+
+    if result.returncode != 0:
+        return "ERROR", result.stderr.strip() or result.stdout.strip()
+
+    for line in result.stdout.splitlines():
+        if line.startswith("XFER "):
+            parts = line.split()
+            return parts[1], " ".join(parts[2:])
+    return "ERROR", result.stdout.strip()
+
+
+def send_file(local_path, remote_path=None, port=DEFAULT_PORT, compress_ok=True, timeout=60):
+    """Upload a file to the board, compressed when it pays off, and verify it"""
+    if remote_path is None:
+        remote_path = os.path.basename(local_path)
+    remote_path = remote_path.lstrip(":")
+
+    with open(local_path, "rb") as f:
+        data = f.read()
+    digest = sha256_hex(data)
+
+    payload, compressed = plan_transfer(data, compress_ok)
+    if compressed:
+        print(f"📦 {remote_path}: {len(data)} -> {len(payload)} bytes (deflate)")
+
+    try:
+        status, detail = _run_transfer(port, payload, remote_path, digest, compressed, timeout)
+        if status == "NODEFLATE":
+            print("⚠️ Board firmware has no deflate module, sending uncompressed")
+            status, detail = _run_transfer(port, data, remote_path, digest, False, timeout)
+    except subprocess.TimeoutExpired:
+        print(f"❌ Transfer of {remote_path} timed out")
+        return False
+    except Exception as e:
+        print(f"❌ Transfer of {remote_path} failed: {e}")
+        return False
+
+    if status == "OK":
+        return True
+    if status == "BADHASH":
+        print(f"❌ Hash mismatch for {remote_path}: expected {digest}, got {detail}")
+    else:
+        print(f"❌ Transfer of {remote_path} failed: {detail}")
+    return False
+
+
+def main():
+    """Command line entry: transfer.py <port> <local_file> [remote_path] [--no-compress]"""
+    args = [a for a in sys.argv[1:] if not a.startswith("--")]
+    compress_ok = "--no-compress" not in sys.argv
+
+    if len(args) < 2:
+        print("Usage: python transfer.py <port> <local_file> [remote_path] [--no-compress]")
+        sys.exit(2)
+
+    port, local_path = args[0], args[1]
+    remote_path = args[2] if len(args) > 2 else None
+
+    if not send_file(local_path, remote_path, port, compress_ok):
+        sys.exit(1)
+    print(f"✅ Transferred {local_path}")
+
+
+if __name__ == "__main__":
+    main()
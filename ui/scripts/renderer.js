@@ -745,6 +745,13 @@ function setupBoardStatusCheck() {
       }
     });
   }
+  
+  // Live updates pushed by the board monitor on attach/detach
+  if (statusIndicator && window.electronAPI.onBoardStatus) {
+    window.electronAPI.onBoardStatus(({ status }) => {
+      statusIndicator.style.backgroundColor = status === 'connected' ? 'green' : 'red';
+    });
+  }
 }
 
 // ESP32 connection test